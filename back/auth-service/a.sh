@@ -18,6 +18,9 @@ echo "Running Alembic migrations..."
 # ALEMBIC_ASYNC=1 alembic upgrade head
 alembic upgrade head
 
+echo "Indexing task labels written before task_labels existed..."
+python -m app.maintenance backfill-task-labels
+
 echo "Starting FastAPI application..."
 # Start the FastAPI app
 exec uvicorn app.main:app --host 0.0.0.0 --port 8000
\ No newline at end of file
@@ -0,0 +1,234 @@
+import hashlib
+import logging
+import random
+import re
+import time
+import uuid
+import tracemalloc
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.db import collect_query_stats, SessionLocal
+from app.core.security import get_user_id_from_token
+from app.core.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT, HTTP_RESPONSES, HTTP_REQUEST_PEAK_ALLOCATION
+from app.core.profiling import sampler
+from app.core.logging_config import request_id_var
+from app.core.tracing import tracer
+from app.services.idempotency_service import IdempotencyService
+
+logger = logging.getLogger("app.requests")
+
+
+def route_template(request: Request, default: str = None) -> str:
+    """Path template of the matched route, e.g. /tasks/workspace/{workspace_id}"""
+    route = request.scope.get("route")
+    return getattr(route, "path", default or request.url.path)
+
+
+async def metrics_middleware(request: Request, call_next):
+    """Record latency, in-flight requests and status codes per route template"""
+    start = time.perf_counter()
+    status_code = 500
+    with HTTP_REQUESTS_IN_FLIGHT.track_inprogress():
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+        finally:
+            # Unmatched paths share one label value to keep cardinality bounded
+            route = route_template(request, default="<unmatched>")
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start, method=request.method, route=route)
+            HTTP_RESPONSES.inc(method=request.method, route=route, status=status_code)
+    return response
+
+
+async def sql_timing_middleware(request: Request, call_next):
+    """Record query count and DB time per request as Server-Timing and log fields"""
+    with collect_query_stats(strict=settings.SQL_STRICT_MODE, scope=request.scope) as stats:
+        response = await call_next(request)
+
+    response.headers["Server-Timing"] = stats.server_timing()
+    logger.info(
+        "%s %s %s", request.method, route_template(request), response.status_code,
+        extra={
+            "route": route_template(request),
+            "method": request.method,
+            "status_code": response.status_code,
+            "db_queries": stats.count,
+            "db_time_ms": round(stats.total_time * 1000, 2),
+            "db_slowest_ms": round(stats.slowest_time * 1000, 2),
+            "db_slowest_statement": (stats.slowest_statement or "")[:500],
+        }
+    )
+    return response
+
+
+_profile_routes = tuple(prefix.strip() for prefix in settings.PROFILE_ROUTES.split(",") if prefix.strip())
+_last_profile_flush = time.monotonic()
+
+
+def _should_profile(request: Request) -> bool:
+    return (
+        settings.PROFILE_HEADER in request.headers
+        or request.url.path.startswith(_profile_routes)
+        or random.random() < settings.PROFILE_SAMPLE_RATE
+    )
+
+
+async def profiling_middleware(request: Request, call_next):
+    """Sample the stacks of selected requests and aggregate them per route template.
+
+    Async endpoints are sampled on the event loop thread; `def` endpoints on
+    routers using SampledRoute are sampled in the threadpool worker running them.
+    """
+    global _last_profile_flush
+    if not settings.PROFILE_ENABLED or not _should_profile(request):
+        return await call_next(request)
+
+    with sampler.profile() as finish:
+        try:
+            response = await call_next(request)
+        finally:
+            finish(f"{request.method} {route_template(request, default='<unmatched>')}")
+
+    if settings.PROFILE_DIR and time.monotonic() - _last_profile_flush > settings.PROFILE_FLUSH_SECONDS:
+        _last_profile_flush = time.monotonic()
+        sampler.write(settings.PROFILE_DIR)
+    return response
+
+
+async def allocation_middleware(request: Request, call_next):
+    """Record the peak traced memory of each request while tracemalloc is running.
+
+    tracemalloc keeps one process-wide peak, so concurrent requests on a worker
+    are attributed each other's allocations; enable this on a lightly loaded
+    worker or read the numbers as an upper bound.
+    """
+    if not settings.MEMORY_ROUTE_PEAKS or not tracemalloc.is_tracing():
+        return await call_next(request)
+
+    start, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    try:
+        return await call_next(request)
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        HTTP_REQUEST_PEAK_ALLOCATION.observe(
+            max(peak - start, 0), method=request.method, route=route_template(request, default="<unmatched>")
+        )
+
+
+async def tracing_middleware(request: Request, call_next):
+    """Open the server span of a request, continuing an incoming W3C trace context"""
+    if not tracer.enabled:
+        return await call_next(request)
+
+    with tracer.span(
+        f"{request.method} {request.url.path}",
+        kind="server",
+        attributes={"http.method": request.method, "http.target": request.url.path},
+        traceparent=request.headers.get("traceparent"),
+    ) as span:
+        response = await call_next(request)
+        if span is not None:
+            route = route_template(request, default="<unmatched>")
+            span.name = f"{request.method} {route}"
+            span.set_attribute("http.route", route)
+            span.set_attribute("http.status_code", response.status_code)
+            if response.status_code >= 500:
+                span.status = "error"
+    return response
+
+
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+async def request_id_middleware(request: Request, call_next):
+    """Take the request id from X-Request-ID (or generate one) for logs and the response"""
+    request_id = request.headers.get("X-Request-ID", "")
+    if not _REQUEST_ID.match(request_id):
+        request_id = uuid.uuid4().hex
+
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+
+_idempotency_excluded = tuple(prefix.strip() for prefix in settings.IDEMPOTENCY_EXCLUDED_PATHS.split(",") if prefix.strip())
+_last_idempotency_purge = time.monotonic()
+
+
+def _idempotency_call(method: str, *args):
+    db = SessionLocal()
+    try:
+        return getattr(IdempotencyService(db), method)(*args)
+    finally:
+        db.close()
+
+
+async def idempotency_middleware(request: Request, call_next):
+    """Replay the stored response when a POST is retried with the same Idempotency-Key.
+
+    Keys are scoped to the authenticated user. Only successful (2xx) responses
+    of a known, bounded size are stored; for any other response the key is
+    released, so a retry runs the request again, and the response is passed
+    on unbuffered.
+    """
+    global _last_idempotency_purge
+    key = request.headers.get("idempotency-key")
+    if key is None or request.method != "POST" or request.url.path.startswith(_idempotency_excluded):
+        return await call_next(request)
+    if not 0 < len(key) <= 255:
+        return JSONResponse({"detail": "Idempotency-Key must be 1 to 255 characters"}, status_code=400)
+
+    _, _, token = request.headers.get("authorization", "").partition(" ")
+    try:
+        user_id = get_user_id_from_token(token)
+    except HTTPException:
+        # Let the endpoint answer 401 as usual
+        return await call_next(request)
+
+    body = await request.body()
+    request_hash = hashlib.sha256(
+        b"\n".join((request.method.encode(), request.url.path.encode(), request.url.query.encode(), body))
+    ).hexdigest()
+    try:
+        record = await run_in_threadpool(_idempotency_call, "claim", user_id, key, request_hash)
+    except HTTPException as exc:
+        return JSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers=exc.headers)
+    if record is not None:
+        return Response(
+            record.response_body, status_code=record.status_code, media_type=record.content_type,
+            headers={"Idempotent-Replayed": "true"}
+        )
+
+    try:
+        response = await call_next(request)
+    except BaseException:
+        await run_in_threadpool(_idempotency_call, "release", user_id, key)
+        raise
+    # Streamed responses (exports) have no Content-Length and are never buffered
+    content_length = response.headers.get("content-length")
+    if (
+        not 200 <= response.status_code < 300
+        or content_length is None
+        or int(content_length) > settings.IDEMPOTENCY_MAX_BODY_BYTES
+    ):
+        await run_in_threadpool(_idempotency_call, "release", user_id, key)
+        return response
+
+    response_body = b"".join([chunk async for chunk in response.body_iterator])
+    await run_in_threadpool(
+        _idempotency_call, "complete", user_id, key, response.status_code, response.headers.get("content-type"), response_body
+    )
+    if time.monotonic() - _last_idempotency_purge > settings.IDEMPOTENCY_PURGE_SECONDS:
+        _last_idempotency_purge = time.monotonic()
+        await run_in_threadpool(_idempotency_call, "purge_expired")
+    buffered = Response(response_body, status_code=response.status_code)
+    # raw_headers keeps repeated headers such as Set-Cookie
+    buffered.raw_headers = response.raw_headers
+    return buffered
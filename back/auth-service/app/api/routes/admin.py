@@ -0,0 +1,149 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.db import get_current_admin
+from app.core.memory import memory_tracer, GROUP_BY
+from app.core.profiling import SampledRoute, sampler
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(get_current_admin)], route_class=SampledRoute)
+
+
+@router.get("/profiles")
+async def list_profiles():
+    """Routes with collected CPU samples and their sample counts"""
+    return {
+        "enabled": settings.PROFILE_ENABLED,
+        "interval_ms": settings.PROFILE_INTERVAL_MS,
+        "routes": sampler.summary(),
+    }
+
+
+@router.get("/profiles/stacks")
+async def get_profile(
+    route: str = Query(..., description="Profiled route as listed, e.g. GET /tasks/workspace/{workspace_id}"),
+    format: str = Query("speedscope", description="speedscope (JSON) or collapsed (flamegraph.pl / speedscope text)")
+):
+    """Aggregated stacks of one route"""
+    if route not in sampler.summary():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No samples for this route"
+        )
+    if format == "collapsed":
+        return Response(sampler.collapsed(route), media_type="text/plain")
+    if format == "speedscope":
+        return Response(sampler.speedscope(route), media_type="application/json")
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Format must be speedscope or collapsed"
+    )
+
+
+@router.post("/profiles/flush")
+async def flush_profiles():
+    """Write the collected profiles to PROFILE_DIR"""
+    if not settings.PROFILE_DIR:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="PROFILE_DIR is not configured"
+        )
+    return {"files": sampler.write(settings.PROFILE_DIR)}
+
+
+@router.delete("/profiles", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_profiles():
+    """Discard all collected samples"""
+    sampler.reset()
+
+
+def _require_tracing():
+    if not memory_tracer.tracing:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Memory tracing is not running on this worker"
+        )
+
+
+def _snapshot_or_404(snapshot_id: int):
+    snapshot = memory_tracer.get_snapshot(snapshot_id)
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Snapshot {snapshot_id} not found"
+        )
+    return snapshot
+
+
+def _check_group_by(group_by: str):
+    if group_by not in GROUP_BY:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"group_by must be one of {', '.join(GROUP_BY)}"
+        )
+
+
+@router.get("/memory")
+async def memory_status():
+    """tracemalloc state and the snapshots kept on this worker"""
+    return memory_tracer.status()
+
+
+@router.post("/memory/start")
+async def start_memory_tracing(
+    frames: int = Query(settings.MEMORY_TRACE_FRAMES, ge=1, le=100, description="Frames stored per allocation")
+):
+    """Start tracing allocations on this worker; adds CPU and memory overhead until stopped"""
+    memory_tracer.start(frames)
+    return memory_tracer.status()
+
+
+@router.post("/memory/stop")
+async def stop_memory_tracing():
+    """Stop tracing and drop all snapshots"""
+    memory_tracer.stop()
+    return memory_tracer.status()
+
+
+@router.post("/memory/snapshots")
+async def take_memory_snapshot(
+    group_by: str = Query("lineno"),
+    limit: int = Query(25, ge=1, le=500)
+):
+    """Take a snapshot and report its top allocation sites"""
+    _require_tracing()
+    _check_group_by(group_by)
+    # Snapshotting walks every traced block; keep it off the event loop
+    snapshot_id = await run_in_threadpool(memory_tracer.take_snapshot)
+    snapshot = _snapshot_or_404(snapshot_id)
+    top = await run_in_threadpool(memory_tracer.top, snapshot, group_by, limit)
+    return {"id": snapshot_id, "top": top}
+
+
+@router.get("/memory/snapshots/{snapshot_id}")
+async def get_memory_snapshot(
+    snapshot_id: int,
+    group_by: str = Query("lineno"),
+    limit: int = Query(25, ge=1, le=500)
+):
+    """Top allocation sites of a kept snapshot"""
+    _check_group_by(group_by)
+    snapshot = _snapshot_or_404(snapshot_id)
+    return {"id": snapshot_id, "top": await run_in_threadpool(memory_tracer.top, snapshot, group_by, limit)}
+
+
+@router.get("/memory/diff")
+async def diff_memory_snapshots(
+    base: int = Query(..., description="Earlier snapshot id"),
+    target: int = Query(..., description="Later snapshot id"),
+    group_by: str = Query("lineno"),
+    limit: int = Query(25, ge=1, le=500)
+):
+    """Allocation sites that grew the most between two snapshots"""
+    _check_group_by(group_by)
+    base_snapshot = _snapshot_or_404(base)
+    target_snapshot = _snapshot_or_404(target)
+    return {
+        "base": base,
+        "target": target,
+        "diff": await run_in_threadpool(memory_tracer.diff, base_snapshot, target_snapshot, group_by, limit),
+    }
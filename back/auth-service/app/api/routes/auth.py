@@ -2,16 +2,18 @@ from fastapi import APIRouter, Depends, Response, Request
 from sqlalchemy.orm import Session # Changed from AsyncSession
 from app.schemas.auth import Token, UserCreate, UserLogin, UserUpdate
 from app.core.db import get_db, get_current_user
+from app.core.admission import admission
+from app.core.profiling import SampledRoute
 from app.services.auth_service import AuthService
 
-router = APIRouter()
+router = APIRouter(route_class=SampledRoute)
 
-@router.post("/register", response_model=Token)
+@router.post("/register", response_model=Token, dependencies=[admission("auth")])
 def register(user_data: UserCreate, db: Session = Depends(get_db)):
     auth_service = AuthService(db)
     return auth_service.register_user(user_data)
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=[admission("auth")])
 def login(user_data: UserLogin, db: Session = Depends(get_db)):
     auth_service = AuthService(db)
     return auth_service.login_user(user_data)
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+from typing import Any, Optional
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from app.core.admission import admission
+from app.core.config import settings
+from app.core.db import SessionLocal, engine, shared_session
+from app.core.responses import ORJSONResponse
+from app.core.security import oauth2_scheme, get_user_id_from_token, verified_tokens_var
+from app.core.profiling import SampledRoute
+from app.schemas.batch import BatchOperation, BatchRequest, BatchResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/batch", tags=["batch"], route_class=SampledRoute)
+
+# Status reported for operations not run because an earlier one failed the transaction
+SKIPPED_STATUS = status.HTTP_424_FAILED_DEPENDENCY
+
+
+async def _dispatch(app, parent: Request, operation: BatchOperation) -> dict:
+    """Run one sub-request in-process and capture its response.
+
+    The sub-request goes through the whole app, middlewares included, so it is
+    traced, timed, measured and admitted like the same call made on its own.
+    """
+    path, _, query = operation.path.partition("?")
+    body = orjson.dumps(operation.body) if operation.body is not None else b""
+    headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    if "authorization" in parent.headers:
+        headers.append((b"authorization", parent.headers["authorization"].encode()))
+    scope = {
+        "type": "http",
+        "asgi": parent.scope.get("asgi", {"version": "3.0"}),
+        "http_version": parent.scope.get("http_version", "1.1"),
+        "method": operation.method,
+        "scheme": parent.url.scheme,
+        "server": parent.scope.get("server"),
+        "client": parent.scope.get("client"),
+        "root_path": parent.scope.get("root_path", ""),
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": headers,
+        "state": dict(parent.scope.get("state") or {}),
+    }
+
+    finished = asyncio.Event()
+    body_sent = False
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # Only a finished sub-request "disconnects"; earlier would cancel its queries
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    response: dict[str, Any] = {"status": 500, "headers": {}, "body": b""}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {key.decode().lower(): value.decode() for key, value in message.get("headers", [])}
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        # The app already answered 500; the batch reports it and goes on
+        logger.exception("Batch operation %s %s failed", operation.method, path)
+    finally:
+        finished.set()
+
+    content: Optional[Any] = None
+    if response["body"]:
+        if response["headers"].get("content-type", "").startswith("application/json"):
+            content = orjson.loads(response["body"])
+        else:
+            content = response["body"].decode(errors="replace")
+    return {"status": response["status"], "body": content}
+
+
+def _open_session(transactional: bool) -> Session:
+    """Session shared by the operations; blocking, so it runs in the threadpool"""
+    if transactional:
+        # Service commits become savepoint releases inside the batch transaction
+        connection = engine.connect()
+        db = SessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+        db.info["batch_transaction"] = connection.begin()
+    else:
+        db = SessionLocal()
+    # Operations read what earlier ones wrote, which a replica may not have yet
+    db.info["primary_only"] = True
+    return db
+
+
+def _close_session(db: Session, commit: Optional[bool]):
+    """End the batch transaction, if any (committing it when `commit`), and release the session"""
+    transaction = db.info.get("batch_transaction")
+    try:
+        if transaction is not None:
+            if commit:
+                transaction.commit()
+            else:
+                transaction.rollback()
+    finally:
+        db.close()
+        if transaction is not None:
+            transaction.connection.close()
+
+
+@router.post("", response_model=BatchResponse, dependencies=[admission("batch")])
+async def run_batch(batch: BatchRequest, request: Request, token: str = Depends(oauth2_scheme)):
+    """Run several API calls in order over one session and one authentication.
+
+    Each operation gets the status and JSON body it would have had as its own
+    request. With `transactional`, the batch commits only when every operation
+    succeeds; otherwise each operation is committed as soon as it succeeds, so
+    a later failure cannot roll it back.
+    """
+    if not 0 < len(batch.operations) <= settings.BATCH_MAX_OPERATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch must contain between 1 and {settings.BATCH_MAX_OPERATIONS} operations"
+        )
+    if any(not op.path.startswith("/") or op.path.startswith(router.prefix) for op in batch.operations):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Operation paths must be absolute and must not call {router.prefix}"
+        )
+
+    # Verified once here; the sub-requests reuse the result
+    verified_tokens_var.set({})
+    get_user_id_from_token(token)
+
+    db = await run_in_threadpool(_open_session, batch.transactional)
+    results = []
+    committed = None
+    try:
+        with shared_session(db):
+            for operation in batch.operations:
+                if batch.transactional and results and results[-1]["status"] >= 400:
+                    results.append({"status": SKIPPED_STATUS, "body": {"detail": "Skipped after an earlier operation failed"}})
+                    continue
+                result = await _dispatch(request.app, request, operation)
+                if result["status"] >= 400:
+                    # Drop whatever the failed operation left in the session
+                    await run_in_threadpool(db.rollback)
+                elif not batch.transactional:
+                    await run_in_threadpool(db.commit)
+                results.append(result)
+
+        if batch.transactional:
+            committed = all(result["status"] < 400 for result in results)
+    finally:
+        await run_in_threadpool(_close_session, db, committed)
+
+    return ORJSONResponse({"committed": committed, "responses": results})
+
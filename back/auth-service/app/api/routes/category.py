@@ -1,22 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
-from app.core.database import get_db
+from app.core.db import get_db, query_budget, statement_timeout, cancel_on_disconnect
+from app.core.admission import admission
 from app.services.category_service import CategoryService
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
 from app.core.security import oauth2_scheme, get_user_id_from_token
+from app.core.responses import ORJSONResponse
+from app.core.profiling import SampledRoute
 
-router = APIRouter(prefix="/categories", tags=["categories"])
+router = APIRouter(prefix="/categories", tags=["categories"], route_class=SampledRoute)
 
-@router.get("/workspace/{workspace_id}", response_model=List[CategoryResponse])
-async def get_workspace_categories(
+@router.get(
+    "/workspace/{workspace_id}", response_model=List[CategoryResponse],
+    dependencies=[admission("board_reads"), query_budget(2), statement_timeout(2000), cancel_on_disconnect()]
+)
+def get_workspace_categories(
     workspace_id: int, 
     db: Session = Depends(get_db), 
     token: str = Depends(oauth2_scheme)
 ):
     """Get all categories for a workspace"""
     user_id = get_user_id_from_token(token)
-    return CategoryService(db).get_workspace_categories(workspace_id, user_id)
+    return ORJSONResponse(CategoryService(db).get_workspace_categories(workspace_id, user_id))
 
 @router.post("/workspace/{workspace_id}", response_model=CategoryResponse)
 async def create_category(
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from typing import Optional
+from app.core.db import get_db, query_budget, statement_timeout, cancel_on_disconnect
+from app.core.admission import admission
 from app.services.comment_service import CommentService
-from app.schemas.comment import CommentCreate, CommentUpdate, CommentResponse, CommentReplyCreate, CommentReplyUpdate, CommentReplyResponse
+from app.schemas.comment import CommentCreate, CommentUpdate, CommentResponse, CommentReplyCreate, CommentReplyUpdate, CommentReplyResponse, COMMENT_FIELD_PRESETS
 from app.core.security import oauth2_scheme, get_user_id_from_token
+from app.core.responses import ORJSONResponse
+from app.core.fieldsets import resolve_fields
+from app.core.profiling import SampledRoute
 
-router = APIRouter(prefix="/comments", tags=["comments"])
+router = APIRouter(prefix="/comments", tags=["comments"], route_class=SampledRoute)
 
 @router.post("/", response_model=CommentResponse)
 async def create_comment(comment: CommentCreate, db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
@@ -16,10 +21,19 @@ async def create_comment(comment: CommentCreate, db: Session = Depends(get_db),
 async def get_comment(comment_id: int, db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
     return CommentService(db).get_comment(comment_id)
 
-@router.get("/task/{task_id}", response_model=list[CommentResponse])
-async def get_task_comments(task_id: int, db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
+@router.get(
+    "/task/{task_id}", response_model=list[CommentResponse],
+    dependencies=[admission("board_reads"), query_budget(3), statement_timeout(2000), cancel_on_disconnect()]
+)
+def get_task_comments(
+    task_id: int,
+    fields: Optional[str] = Query(None, description="Comma separated fields or presets (card, full)"),
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+):
     user_id = get_user_id_from_token(token)
-    return CommentService(db).get_task_comments(task_id, user_id)
+    comment_fields = resolve_fields(fields, COMMENT_FIELD_PRESETS)
+    return ORJSONResponse(CommentService(db).get_task_comments(task_id, user_id, comment_fields))
 
 @router.put("/{comment_id}", response_model=CommentResponse)
 async def update_comment(comment_id: int, comment: CommentUpdate, db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
-from app.core.database import get_db
+from app.core.db import get_db
 from app.services.task_dependency_service import TaskDependencyService
 from app.schemas.dependency import (
     DependencyCreate, 
@@ -11,8 +11,9 @@ from app.schemas.dependency import (
     TaskDependencySummary
 )
 from app.core.security import oauth2_scheme, get_user_id_from_token
+from app.core.profiling import SampledRoute
 
-router = APIRouter(prefix="/tasks", tags=["task-dependencies"])
+router = APIRouter(prefix="/tasks", tags=["task-dependencies"], route_class=SampledRoute)
 
 @router.get("/{task_id}/dependencies", response_model=TaskDependencySummary)
 async def get_task_dependencies(
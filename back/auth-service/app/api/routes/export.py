@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.core.db import get_db, SessionLocal
+from app.core.admission import admission
+from app.services.export_service import ExportService, parse_export_cursor
+from app.services.analytics_export_service import AnalyticsExportService, ANALYTICS_TABLES, ANALYTICS_FORMATS
+from app.core.security import oauth2_scheme, get_user_id_from_token
+from app.core.profiling import SampledRoute
+
+router = APIRouter(prefix="/exports", tags=["exports"], route_class=SampledRoute)
+
+
+def _stream_workspace_export(workspace_id: int, cursor: Optional[str]):
+    # The stream outlives the request-scoped session, so it owns its own
+    db = SessionLocal()
+    try:
+        yield from ExportService(db).iter_workspace_ndjson(workspace_id, cursor)
+    finally:
+        db.close()
+
+
+def _stream_analytics_table(table: str, workspace_id: Optional[int], export_format: str):
+    db = SessionLocal()
+    try:
+        yield from AnalyticsExportService(db).iter_table(table, workspace_id, export_format)
+    finally:
+        db.close()
+
+
+@router.get("/workspace/{workspace_id}", dependencies=[admission("exports")])
+async def export_workspace(
+    workspace_id: int,
+    cursor: Optional[str] = Query(None, description="Resume after this record cursor, e.g. task:1234"),
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+):
+    """Stream categories, tasks, dependencies, comments and replies of a workspace as NDJSON"""
+    user_id = get_user_id_from_token(token)
+    ExportService(db).verify_workspace_access(workspace_id, user_id)
+    parse_export_cursor(cursor)
+    return StreamingResponse(
+        _stream_workspace_export(workspace_id, cursor),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.get("/analytics/{table}", dependencies=[admission("exports")])
+async def export_analytics_table(
+    table: str,
+    workspace_id: Optional[int] = Query(None, description="Workspace to export; omit to export all workspaces (admin only)"),
+    format: str = Query("parquet", description="parquet or arrow (IPC stream)"),
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+):
+    """Export tasks, dependencies, comments or replies as columnar Parquet/Arrow data"""
+    if table not in ANALYTICS_TABLES or format not in ANALYTICS_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Table must be one of {', '.join(ANALYTICS_TABLES)} and format one of {', '.join(ANALYTICS_FORMATS)}"
+        )
+
+    user_id = get_user_id_from_token(token)
+    workspace_scope = AnalyticsExportService(db).resolve_workspace_scope(user_id, workspace_id)
+    extension = "parquet" if format == "parquet" else "arrows"
+    return StreamingResponse(
+        _stream_analytics_table(table, workspace_scope, format),
+        media_type=ANALYTICS_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{table}.{extension}"'}
+    )
@@ -0,0 +1,25 @@
+from fastapi import Depends
+from sqlalchemy.orm import Session
+from strawberry.fastapi import GraphQLRouter
+from app.core.db import get_db, replica_engines, recently_wrote, statement_timeout, cancel_on_disconnect
+from app.core.admission import admission
+from app.core.security import oauth2_scheme, get_user_id_from_token
+from app.graphql.loaders import BoardLoaders
+from app.graphql.schema import BoardContext, schema
+
+
+async def get_context(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> BoardContext:
+    """Per-request context: fresh DataLoaders bound to the request's session and user"""
+    user_id = get_user_id_from_token(token)
+    # The schema has no mutations, so the whole query may read from a replica
+    if replica_engines and not recently_wrote(user_id):
+        db.info["replica_reads"] = True
+    return BoardContext(BoardLoaders(db, user_id))
+
+
+router = GraphQLRouter(
+    schema,
+    context_getter=get_context,
+    tags=["graphql"],
+    dependencies=[admission("board_reads"), statement_timeout(2000), cancel_on_disconnect()],
+)
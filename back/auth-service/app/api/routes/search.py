@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.core.db import get_db, query_budget, statement_timeout, cancel_on_disconnect
+from app.core.admission import admission
+from app.services.search_service import SearchService, SEARCH_ENTITY_TYPES
+from app.schemas.search import SearchResponse
+from app.core.security import oauth2_scheme, get_user_id_from_token
+from app.core.responses import ORJSONResponse
+from app.core.profiling import SampledRoute
+
+router = APIRouter(prefix="/search", tags=["search"], route_class=SampledRoute)
+
+@router.get(
+    "", response_model=SearchResponse,
+    dependencies=[admission("board_reads"), query_budget(1), statement_timeout(2000), cancel_on_disconnect()]
+)
+def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find"),
+    types: Optional[str] = Query(None, description=f"Comma separated entity types ({', '.join(SEARCH_ENTITY_TYPES)}); all by default"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+):
+    """Search tasks, categories, comments and replies in every workspace of the user"""
+    user_id = get_user_id_from_token(token)
+    requested = [part.strip() for part in (types or "").split(",") if part.strip()] or SEARCH_ENTITY_TYPES
+    unknown = [name for name in requested if name not in SEARCH_ENTITY_TYPES]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown search type: {', '.join(unknown)}. Types: {', '.join(SEARCH_ENTITY_TYPES)}"
+        )
+    entity_types = tuple(name for name in SEARCH_ENTITY_TYPES if name in requested)
+    return ORJSONResponse(SearchService(db).search(user_id, q, entity_types, limit, offset))
@@ -1,11 +1,19 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, File, Query, UploadFile
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from typing import Optional
+from app.core.db import get_db, query_budget, statement_timeout, cancel_on_disconnect
+from app.core.admission import admission
 from app.services.task_service import TaskService
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskStatusUpdate, TaskWorkspaceMove
+from app.services.task_import_service import TaskImportService
+from app.services.search_service import SearchService
+from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskStatusUpdate, TaskWorkspaceMove, TASK_FIELD_PRESETS, TaskImportResult, LabelCount
+from app.schemas.search import TaskSearchResponse
 from app.core.security import oauth2_scheme, get_user_id_from_token
+from app.core.responses import ORJSONResponse
+from app.core.fieldsets import resolve_fields
+from app.core.profiling import SampledRoute
 
-router = APIRouter(prefix="/tasks", tags=["tasks"])
+router = APIRouter(prefix="/tasks", tags=["tasks"], route_class=SampledRoute)
 
 @router.post("/", response_model=TaskResponse)
 async def create_task(task: TaskCreate, db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
@@ -16,10 +24,64 @@ async def create_task(task: TaskCreate, db: Session = Depends(get_db), token: st
 async def get_task(task_id: int, db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
     return TaskService(db).get_task(task_id)
 
-@router.get("/workspace/{workspace_id}", response_model=list[TaskResponse])
-async def get_workspace_tasks(workspace_id: int, db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
+@router.get(
+    "/workspace/{workspace_id}", response_model=list[TaskResponse],
+    dependencies=[admission("board_reads"), query_budget(3), statement_timeout(5000), cancel_on_disconnect()]
+)
+def get_workspace_tasks(
+    workspace_id: int,
+    fields: Optional[str] = Query(None, description="Comma separated fields or presets (card, full)"),
+    label: Optional[str] = Query(None, min_length=1, max_length=50, description="Only tasks with this label"),
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+):
+    """Get tasks of a workspace, optionally restricted to a sparse fieldset or one label"""
+    user_id = get_user_id_from_token(token)
+    task_fields = resolve_fields(fields, TASK_FIELD_PRESETS)
+    return ORJSONResponse(TaskService(db).get_workspace_tasks(workspace_id, user_id, task_fields, label))
+
+@router.get(
+    "/workspace/{workspace_id}/labels", response_model=list[LabelCount],
+    dependencies=[admission("board_reads"), query_budget(2), statement_timeout(2000), cancel_on_disconnect()]
+)
+def get_workspace_label_counts(
+    workspace_id: int,
+    category_id: Optional[int] = Query(None, gt=0, description="Only count tasks of this category"),
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+):
+    """Number of tasks per label in a workspace or one of its categories"""
+    user_id = get_user_id_from_token(token)
+    return ORJSONResponse(TaskService(db).get_label_counts(workspace_id, user_id, category_id))
+
+@router.get(
+    "/workspace/{workspace_id}/search", response_model=TaskSearchResponse,
+    dependencies=[admission("board_reads"), query_budget(2), statement_timeout(2000), cancel_on_disconnect()]
+)
+def search_workspace_tasks(
+    workspace_id: int,
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in title, description and labels"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+):
+    """Full-text search over the tasks of a workspace, best matches first"""
+    user_id = get_user_id_from_token(token)
+    return ORJSONResponse(SearchService(db).search_workspace_tasks(workspace_id, user_id, q, limit, offset))
+
+@router.post("/workspace/{workspace_id}/import", response_model=TaskImportResult, dependencies=[admission("bulk_writes")])
+def import_workspace_tasks(
+    workspace_id: int,
+    file: UploadFile = File(..., description="CSV with a header row, or NDJSON"),
+    format: Optional[str] = Query(None, description="csv or ndjson; inferred from the file name when omitted"),
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+):
+    """Bulk import tasks, reporting row-level errors"""
     user_id = get_user_id_from_token(token)
-    return TaskService(db).get_workspace_tasks(workspace_id, user_id)
+    file_format = format or ("ndjson" if (file.filename or "").endswith((".ndjson", ".jsonl")) else "csv")
+    return TaskImportService(db).import_tasks(workspace_id, file.file, file_format, user_id)
 
 @router.put("/{task_id}", response_model=TaskResponse)
 async def update_task(task_id: int, task: TaskUpdate, db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
@@ -31,7 +93,7 @@ async def delete_task(task_id: int, db: Session = Depends(get_db), token: str =
     user_id = get_user_id_from_token(token)
     return TaskService(db).delete_task(task_id, user_id)
 
-@router.put("/{task_id}/status", response_model=TaskResponse)
+@router.put("/{task_id}/status", response_model=TaskResponse, dependencies=[query_budget(6)])
 async def update_task_status(
     task_id: int, 
     status_update: TaskStatusUpdate, 
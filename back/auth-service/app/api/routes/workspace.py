@@ -1,19 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List
-from app.core.database import get_db
-from app.services.workspace_service import WorkspaceService
+from app.core.db import get_db, query_budget, statement_timeout
+from app.core.admission import admission
+from app.core.responses import ORJSONResponse
+from app.services.workspace_service import WorkspaceService, MIN_CANDIDATE_PREFIX
 from app.schemas.workspace import (
     WorkspaceCreate, 
     WorkspaceUpdate, 
     WorkspaceResponse, 
     WorkspaceUserAdd, 
     WorkspaceUserUpdate, 
-    WorkspaceUserResponse
+    WorkspaceUserResponse,
+    UserCandidate
 )
 from app.core.security import oauth2_scheme, get_user_id_from_token
+from app.core.profiling import SampledRoute
 
-router = APIRouter(prefix="/workspaces", tags=["workspaces"])
+router = APIRouter(prefix="/workspaces", tags=["workspaces"], route_class=SampledRoute)
 
 @router.post("/", response_model=WorkspaceResponse)
 async def create_workspace(workspace: WorkspaceCreate, db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
@@ -51,6 +55,24 @@ async def get_workspace_users(
     user_id = get_user_id_from_token(token)
     return WorkspaceService(db).get_workspace_users(workspace_id, user_id)
 
+@router.get(
+    "/{workspace_id}/users/candidates", response_model=List[UserCandidate],
+    dependencies=[admission("board_reads"), query_budget(2), statement_timeout(500)]
+)
+def find_user_candidates(
+    workspace_id: int,
+    q: str = Query(
+        ..., min_length=MIN_CANDIDATE_PREFIX, max_length=255,
+        description="Start of a username, or a full email address when it contains @"
+    ),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+):
+    """Autocomplete users to invite into a workspace"""
+    requesting_user_id = get_user_id_from_token(token)
+    return ORJSONResponse(WorkspaceService(db).find_user_candidates(workspace_id, q, limit, requesting_user_id))
+
 @router.post("/{workspace_id}/users", response_model=WorkspaceUserResponse)
 async def add_user_to_workspace(
     workspace_id: int,
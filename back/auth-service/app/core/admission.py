@@ -0,0 +1,149 @@
+# Admission control. Each route class (login/bcrypt, board reads, bulk writes,
+# exports, batches) has a concurrency limit with a small bounded queue, and every caller
+# a cap on concurrent requests across the classed routes. Requests that would
+# wait too long are rejected at once with Retry-After instead of piling up on
+# the DB pool and the threadpool.
+import asyncio
+import time
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
+
+from .config import settings
+from .metrics import registry, ADMISSION_REJECTED, ADMISSION_QUEUE_WAIT
+from .security import get_user_id_from_token
+
+
+class RouteClassLimiter:
+    """Concurrency limit with a bounded FIFO queue for one route class"""
+
+    def __init__(self, name: str, limit: int, queue_size: int):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.active = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def acquire(self, timeout: float) -> bool:
+        """Take a slot, waiting in the queue for at most `timeout` seconds"""
+        if not self._semaphore.locked():
+            # A free slot is taken without suspending, so concurrent callers cannot overshoot
+            await self._semaphore.acquire()
+            self.active += 1
+            ADMISSION_QUEUE_WAIT.observe(0.0, route_class=self.name)
+            return True
+        if self.waiting >= self.queue_size:
+            return False
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.waiting -= 1
+            ADMISSION_QUEUE_WAIT.observe(time.perf_counter() - start, route_class=self.name)
+        self.active += 1
+        return True
+
+    def release(self):
+        self.active -= 1
+        self._semaphore.release()
+
+
+class CallerLimiter:
+    """Cap on concurrent admitted requests per user (or client address)"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._active: dict[str, int] = {}
+
+    def acquire(self, caller: str) -> bool:
+        count = self._active.get(caller, 0)
+        if self.limit and count >= self.limit:
+            return False
+        self._active[caller] = count + 1
+        return True
+
+    def release(self, caller: str):
+        count = self._active.get(caller, 0) - 1
+        if count > 0:
+            self._active[caller] = count
+        else:
+            self._active.pop(caller, None)
+
+
+def parse_limits(spec: str) -> dict[str, RouteClassLimiter]:
+    """Limiters from a spec like `auth=4:16,exports=2:2` (concurrency:queue size)"""
+    limiters = {}
+    for item in spec.split(","):
+        name, _, limits = item.partition("=")
+        if not name.strip() or not limits.strip():
+            continue
+        limit, _, queue_size = limits.partition(":")
+        limiters[name.strip()] = RouteClassLimiter(name.strip(), int(limit), int(queue_size or 0))
+    return limiters
+
+
+route_limiters = parse_limits(settings.ADMISSION_LIMITS)
+caller_limiter = CallerLimiter(settings.ADMISSION_PER_CALLER)
+
+registry.gauge(
+    "admission_queue_depth", "Requests waiting for a slot by route class", ("route_class",),
+    callback=lambda: {(name,): limiter.waiting for name, limiter in route_limiters.items()}
+)
+registry.gauge(
+    "admission_in_flight", "Admitted requests running by route class", ("route_class",),
+    callback=lambda: {(name,): limiter.active for name, limiter in route_limiters.items()}
+)
+
+
+def _caller(request: Request) -> str:
+    """The authenticated user, or the client address for anonymous routes like login.
+
+    Anonymous clients behind one NAT or proxy share an address, and so a cap.
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            return f"user:{get_user_id_from_token(token)}"
+        except HTTPException:
+            pass
+    return f"client:{request.client.host if request.client else 'unknown'}"
+
+
+def _rejected(route_class: str, reason: str, status_code: int, detail: str) -> HTTPException:
+    ADMISSION_REJECTED.inc(route_class=route_class, reason=reason)
+    return HTTPException(
+        status_code=status_code,
+        detail=detail,
+        headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+    )
+
+
+def admission(route_class: str):
+    """Route dependency admitting the request into `route_class` or rejecting it.
+
+    A caller over its concurrency cap gets 429; a full queue, or a wait longer
+    than ADMISSION_QUEUE_TIMEOUT_MS, gets 503. Both carry Retry-After.
+    """
+    async def admit(request: Request):
+        limiter: Optional[RouteClassLimiter] = route_limiters.get(route_class)
+        if not settings.ADMISSION_ENABLED or limiter is None:
+            yield
+            return
+
+        caller = _caller(request)
+        if not caller_limiter.acquire(caller):
+            raise _rejected(route_class, "caller", status.HTTP_429_TOO_MANY_REQUESTS, "Too many concurrent requests")
+        try:
+            if not await limiter.acquire(settings.ADMISSION_QUEUE_TIMEOUT_MS / 1000):
+                raise _rejected(route_class, "saturated", status.HTTP_503_SERVICE_UNAVAILABLE, "Server busy, retry shortly")
+            try:
+                yield
+            finally:
+                limiter.release()
+        finally:
+            caller_limiter.release(caller)
+    return Depends(admit)
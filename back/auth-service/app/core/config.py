@@ -14,9 +14,91 @@ class Settings(BaseSettings):
     ALGORITHM: str = "RS256"  # Changed to RS256 for asymmetric keys
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Connection pool per engine; connections are recycled after DB_POOL_RECYCLE
+    # seconds and a checkout waits at most DB_POOL_TIMEOUT seconds
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_TIMEOUT: int = 30
+    # Read replicas (comma separated URLs) for reads marked with replica_read;
+    # a user's reads stay on the primary for READ_YOUR_WRITES_SECONDS after they write
+    DATABASE_REPLICA_URLS: str = ""
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Default Postgres statement_timeout for every request (0 = none); routes can
+    # set their own with statement_timeout()
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+
+    # Admission control: concurrency:queue size per route class, a cap on
+    # concurrent requests per user (or client address), and how long a request
+    # may wait for a slot before it is rejected with Retry-After
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_LIMITS: str = "auth=4:16,board_reads=32:64,bulk_writes=2:4,exports=4:4,batch=4:8"
+    # Anonymous requests (login, register) are counted per client address, so
+    # every client behind one NAT or proxy shares a single per-caller cap
+    ADMISSION_PER_CALLER: int = 8
+    ADMISSION_QUEUE_TIMEOUT_MS: int = 2000
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+
+    # Idempotency-Key replay for POST requests: stored responses are kept for
+    # IDEMPOTENCY_TTL_SECONDS, a request in progress holds its key for at most
+    # IDEMPOTENCY_LOCK_SECONDS, and paths under the excluded prefixes are never stored.
+    # Only 2xx responses with a Content-Length up to IDEMPOTENCY_MAX_BODY_BYTES are
+    # stored; streamed responses pass through untouched
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_LOCK_SECONDS: int = 60
+    IDEMPOTENCY_EXCLUDED_PATHS: str = "/auth,/admin"
+    IDEMPOTENCY_MAX_BODY_BYTES: int = 1_000_000
+    IDEMPOTENCY_PURGE_SECONDS: int = 300
+
+    # Most sub-requests accepted by POST /batch
+    BATCH_MAX_OPERATIONS: int = 50
+
+    # Pool connections opened during startup, before the worker accepts requests
+    DB_POOL_WARMUP_CONNECTIONS: int = 2
+
     PRIVATE_KEY: str = ""
     PUBLIC_KEY: str = ""
 
+    # Fail requests that exceed their declared query budget or lazy load relationships
+    SQL_STRICT_MODE: bool = False
+
+    # Sampled CPU profiling; a request is profiled when it is picked at random,
+    # its path starts with one of PROFILE_ROUTES (comma separated) or it sends PROFILE_HEADER
+    PROFILE_ENABLED: bool = False
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_ROUTES: str = ""
+    PROFILE_HEADER: str = "X-Profile"
+    PROFILE_INTERVAL_MS: int = 5
+    # Directory for collapsed/speedscope files, written every PROFILE_FLUSH_SECONDS
+    PROFILE_DIR: str = ""
+    PROFILE_FLUSH_SECONDS: int = 60
+
+    # tracemalloc: frames kept per allocation, snapshots kept for diffing, and
+    # whether to record per-route peak allocation while tracing is running
+    MEMORY_TRACE_FRAMES: int = 10
+    MEMORY_MAX_SNAPSHOTS: int = 5
+    MEMORY_ROUTE_PEAKS: bool = False
+
+    # Slow-query log (0 disables); EXPLAIN plans are captured once per statement fingerprint
+    SLOW_QUERY_THRESHOLD_MS: int = 0
+    SLOW_QUERY_LOG_PATH: str = "logs/slow_queries.log"
+    SLOW_QUERY_LOG_MAX_BYTES: int = 10_000_000
+    SLOW_QUERY_LOG_BACKUPS: int = 5
+    SLOW_QUERY_EXPLAIN: bool = True
+
+    # Tracing exporter: empty (off), stdout, file or module.path:factory for a custom exporter
+    TRACING_EXPORTER: str = ""
+    TRACING_FILE_PATH: str = "logs/traces.jsonl"
+    # Share of new traces recorded; traces continued from a traceparent header follow its sampled flag
+    TRACING_SAMPLE_RATE: float = 1.0
+
+    # Logging: json or text lines on stdout; LOG_SAMPLING keeps a share of
+    # INFO/DEBUG records per logger, e.g. "sqlalchemy.engine=0.01,app.requests=0.1"
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+    LOG_SAMPLING: str = ""
+
     model_config = SettingsConfigDict(
         env_file=".env",
         extra="ignore"
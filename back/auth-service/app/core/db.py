@@ -1,61 +1,501 @@
-from typing import Generator, Annotated
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
-from sqlalchemy import create_engine
+import asyncio
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Generator, Annotated, Optional
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine, event, Insert, Update, Delete
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.pool import Pool, QueuePool, AsyncAdaptedQueuePool
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy import select
 
 from .config import settings
-from ..models.user import User
-from ..schemas.auth import TokenPayload
+from .metrics import registry, CACHE_REQUESTS, DB_POOL_CHECKOUT_WAIT, DB_QUERIES_CANCELLED
+from .slow_query import slow_query_log
+from .tracing import tracer, get_current_span
+from .security import oauth2_scheme, get_user_id_from_token, current_user_id_var
+from ..models.user import User, Role, user_roles
+
+
+_database_url = make_url(str(settings.DATABASE_URL))
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool if _database_url.get_dialect().is_async else QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+def _create_engine(url):
+    new_engine = create_engine(
+        url,
+        poolclass=TimedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=True,
+        echo=False
+    )
+    if new_engine.dialect.name == "sqlite":
+        _begin_sqlite_transactions(new_engine)
+    return new_engine
+
+
+def _begin_sqlite_transactions(sqlite_engine: Engine):
+    """Have SQLite transactions start with SQLAlchemy's BEGIN instead of pysqlite's.
+
+    pysqlite only begins a transaction before DML, so a SAVEPOINT issued first
+    (a batch in one transaction) runs outside of one and its RELEASE commits.
+    Reads now run in transactions too, so the WAL journal keeps an open read
+    from blocking writers on other connections.
+    """
+    @event.listens_for(sqlite_engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+    @event.listens_for(sqlite_engine, "begin")
+    def _begin(conn):
+        # On the DBAPI connection, so BEGIN is not counted as a query of the request
+        conn.connection.dbapi_connection.execute("BEGIN")
+
 
 # Database engine and session setup (sync)
-engine = create_engine(
-    str(settings.DATABASE_URL),
-    pool_pre_ping=True,
-    echo=False
+engine = _create_engine(_database_url)
+replica_engines = [
+    _create_engine(make_url(url.strip()))
+    for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()
+]
+_replica_cycle = itertools.cycle(replica_engines)
+
+registry.gauge(
+    "db_pool_connections", "Pooled DB connections by state", ("state",),
+    callback=lambda: {
+        ("size",): engine.pool.size(),
+        ("checked_out",): engine.pool.checkedout(),
+        ("overflow",): max(engine.pool.overflow(), 0),
+    }
 )
 
+# Monotonic time of each user's latest committed write, for read-your-writes
+_last_write: dict[int, float] = {}
+_last_write_lock = threading.Lock()
+
+
+def recently_wrote(user_id: Optional[int]) -> bool:
+    """Whether the user committed a write within READ_YOUR_WRITES_SECONDS"""
+    if user_id is None:
+        return False
+    wrote_at = _last_write.get(user_id)
+    return wrote_at is not None and time.monotonic() - wrote_at < settings.READ_YOUR_WRITES_SECONDS
+
+
+class RoutingSession(Session):
+    """Session that sends reads marked with replica_read to a replica.
+
+    Everything else, flushes, any session that already wrote in its
+    transaction and sessions with info["primary_only"] (a batch) use the
+    primary. A session keeps the replica it picked first.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            self.info.get("replica_reads")
+            and not self.info.get("primary_only")
+            and replica_engines
+            and not self._flushing
+            and not self.info.get("has_writes")
+            and not isinstance(clause, (Insert, Update, Delete))
+        ):
+            if "replica" not in self.info:
+                self.info["replica"] = next(_replica_cycle)
+            return self.info["replica"]
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_writes(session, flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_statement_writes(orm_execute_state):
+    # Core insert/update/delete through session.execute() never flush
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _record_write(session):
+    if session.info.pop("has_writes", False):
+        user_id = current_user_id_var.get()
+        if user_id is not None:
+            with _last_write_lock:
+                now = time.monotonic()
+                _last_write[user_id] = now
+                # Forget users whose window has passed so the map stays small
+                if len(_last_write) > 10_000:
+                    for stale in [uid for uid, at in _last_write.items() if now - at >= settings.READ_YOUR_WRITES_SECONDS]:
+                        del _last_write[stale]
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _discard_writes(session):
+    session.info.pop("has_writes", None)
+
+
+def replica_read(method):
+    """Mark a read-only service method as safe to serve from a read replica.
+
+    The request's user reads from the primary while recently_wrote() holds,
+    so their own changes are visible right after they make them.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not replica_engines or recently_wrote(current_user_id_var.get()):
+            return method(self, *args, **kwargs)
+        previous = self.db.info.get("replica_reads", False)
+        self.db.info["replica_reads"] = True
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.db.info["replica_reads"] = previous
+    return wrapper
+
+
 SessionLocal = sessionmaker(
     bind=engine,
+    class_=RoutingSession,
     autocommit=False,
     autoflush=False,
     expire_on_commit=False,
 )
 
-# OAuth2 scheme setup
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+
+class QueryBudgetExceeded(Exception):
+    """Raised in strict mode when a request issues more queries than its budget"""
+
+
+class LazyLoadError(Exception):
+    """Raised in strict mode when a relationship is lazy loaded (a likely N+1)"""
+
+
+class QueryStats:
+    """SQL statistics collected for the current request"""
+    __slots__ = ("strict", "budget", "statement_timeout_ms", "scope", "count", "total_time", "slowest_time", "slowest_statement")
+
+    def __init__(self, strict: bool = False, budget: Optional[int] = None, scope: Optional[dict] = None):
+        self.strict = strict
+        self.budget = budget
+        self.statement_timeout_ms: Optional[int] = None
+        self.scope = scope
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement = None
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.total_time += elapsed
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+
+        if self.strict and self.budget is not None and self.count > self.budget:
+            raise QueryBudgetExceeded(
+                f"Query budget of {self.budget} exceeded by: {statement[:200]}"
+            )
+
+    @property
+    def route(self) -> Optional[str]:
+        """Route template of the request, once the router has matched it"""
+        if self.scope is None:
+            return None
+        return getattr(self.scope.get("route"), "path", self.scope.get("path"))
+
+    def server_timing(self) -> str:
+        """Format the stats as a Server-Timing header value"""
+        return (
+            f'db;dur={self.total_time * 1000:.1f};desc="{self.count} queries", '
+            f'db-slowest;dur={self.slowest_time * 1000:.1f}'
+        )
+
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def get_query_stats() -> Optional[QueryStats]:
+    return _query_stats.get()
+
+
+@contextmanager
+def collect_query_stats(strict: bool = False, budget: Optional[int] = None, scope: Optional[dict] = None):
+    """Collect SQL statistics for the enclosed block, e.g. one request.
+
+    With strict=True the block fails on a lazy relationship load or when more
+    than `budget` queries are issued. Tests can use it around service calls:
+
+        with collect_query_stats(strict=True, budget=3):
+            TaskService(db).get_workspace_tasks(workspace_id, user_id)
+    """
+    stats = QueryStats(strict=strict, budget=budget, scope=scope)
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def query_budget(max_queries: int):
+    """Route dependency declaring the maximum number of queries for an endpoint"""
+    def set_budget():
+        stats = _query_stats.get()
+        if stats is not None:
+            stats.budget = max_queries
+    return Depends(set_budget)
+
+
+def statement_timeout(milliseconds: int):
+    """Route dependency capping how long each statement of an endpoint may run (Postgres)"""
+    def set_timeout():
+        stats = _query_stats.get()
+        if stats is not None:
+            stats.statement_timeout_ms = milliseconds
+    return Depends(set_timeout)
+
+
+# Listeners are registered on the Engine and Session classes so that engines
+# and sessions created by tests are instrumented as well
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+    if get_current_span() is not None:
+        conn.info.setdefault("query_spans", []).append(tracer.start_span(
+            statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL",
+            kind="client",
+            attributes={"db.system": conn.dialect.name, "db.statement": statement[:2000]},
+        ))
+
+
+def _end_query_span(conn, error: Optional[BaseException] = None):
+    spans = conn.info.get("query_spans")
+    if spans:
+        span = spans.pop()
+        if span is not None:
+            if error is not None:
+                span.record_error(error)
+            span.end()
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # Only DBAPI errors come from the cursor before after_cursor_execute ran
+    conn = exception_context.connection
+    if conn is not None and exception_context.sqlalchemy_exception is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+        _end_query_span(conn, exception_context.original_exception)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    _end_query_span(conn)
+    if context is not None and context.cache_hit in (CacheStats.CACHE_HIT, CacheStats.CACHE_MISS):
+        CACHE_REQUESTS.inc(cache="sql_compiled", result="hit" if context.cache_hit is CacheStats.CACHE_HIT else "miss")
+    stats = _query_stats.get()
+    if slow_query_log.enabled and elapsed >= slow_query_log.threshold:
+        route = stats.route if stats is not None else None
+        slow_query_log.record(conn, statement, parameters, elapsed, executemany, route)
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _guard_lazy_loads(orm_execute_state):
+    stats = _query_stats.get()
+    # Only SELECTs carry load options; inserts, updates and deletes never lazy load
+    if (
+        stats is not None
+        and stats.strict
+        and orm_execute_state.is_select
+        and orm_execute_state.lazy_loaded_from is not None
+    ):
+        raise LazyLoadError(
+            f"Lazy load of {orm_execute_state.loader_strategy_path} in strict mode; "
+            "load it eagerly or query the rows directly"
+        )
+
+# Guards the sessions' connection lists: a connection leaves its list before it
+# goes back to the pool, so a cancel never reaches another request's statement
+_cancellable_lock = threading.Lock()
+
+
+@event.listens_for(Session, "after_begin")
+def _after_begin(session, transaction, connection):
+    # Remember the DBAPI connections so cancel_session_queries can reach them
+    fairy = connection.connection
+    with _cancellable_lock:
+        connections = session.info.setdefault("dbapi_connections", [])
+        connections.append(fairy.dbapi_connection)
+        fairy.info["cancellable_in"] = connections
+
+    stats = _query_stats.get()
+    timeout_ms = (stats.statement_timeout_ms if stats is not None else None) or settings.DB_STATEMENT_TIMEOUT_MS
+    if timeout_ms and connection.dialect.name == "postgresql":
+        # Straight on the DBAPI cursor so it does not count against the query budget
+        cursor = connection.connection.cursor()
+        try:
+            cursor.execute(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+        finally:
+            cursor.close()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _after_transaction_end(session, transaction):
+    if transaction.parent is None:
+        with _cancellable_lock:
+            session.info.pop("dbapi_connections", None)
+
+
+@event.listens_for(Pool, "checkin")
+def _forget_cancellable(dbapi_connection, connection_record):
+    # Runs before the pool can hand the connection to anyone else
+    if connection_record is None:
+        return
+    with _cancellable_lock:
+        connections = connection_record.info.pop("cancellable_in", None)
+        if connections is not None and dbapi_connection in connections:
+            connections.remove(dbapi_connection)
+
+
+def cancel_session_queries(db: Session) -> int:
+    """Cancel statements running on the session's connections, from any thread.
+
+    The connections are cancelled under the lock that their return to the
+    pool takes, so only the session's own statements can be hit.
+    """
+    cancelled = 0
+    with _cancellable_lock:
+        for dbapi_connection in db.info.get("dbapi_connections", ()):
+            # psycopg cancel() sends a cancel request to the server; sqlite3 has interrupt()
+            cancel = getattr(dbapi_connection, "cancel", None) or getattr(dbapi_connection, "interrupt", None)
+            if cancel is not None:
+                cancel()
+                cancelled += 1
+    return cancelled
+
+
+def is_query_cancellation(exc: DBAPIError) -> bool:
+    """Whether the error is a statement timeout or a cancelled/interrupted statement"""
+    sqlstate = getattr(exc.orig, "pgcode", None) or getattr(exc.orig, "sqlstate", None)
+    return sqlstate == "57014" or "interrupted" in str(exc.orig)
+
+
+async def query_cancelled_handler(request: Request, exc: DBAPIError):
+    """Answer cancelled statements with 503 (timeout) or 499 (client went away)"""
+    if not is_query_cancellation(exc):
+        raise exc
+    if "statement timeout" in str(exc.orig):
+        DB_QUERIES_CANCELLED.inc(reason="timeout")
+        return JSONResponse({"detail": "Query timed out"}, status_code=503)
+    DB_QUERIES_CANCELLED.inc(reason="disconnect")
+    return JSONResponse({"detail": "Client disconnected"}, status_code=499)
+
+
+# Session shared by every get_db() in this context, e.g. the sub-requests of a batch
+_shared_session: ContextVar[Optional[Session]] = ContextVar("shared_session", default=None)
+
+
+@contextmanager
+def shared_session(db: Session):
+    """Make get_db() hand out `db` (without closing it) inside the block"""
+    token = _shared_session.set(db)
+    try:
+        yield db
+    finally:
+        _shared_session.reset(token)
+
 
 # Database dependency (sync)
 def get_db() -> Generator[Session, None, None]:
+    shared = _shared_session.get()
+    if shared is not None:
+        yield shared
+        return
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
+async def _watch_disconnect(request: Request, db: Session = Depends(get_db)):
+    async def watch():
+        # is_disconnected() never sees the message through the http middlewares,
+        # so wait on receive(); the body has already been read at this point
+        while (await request.receive())["type"] != "http.disconnect":
+            pass
+        await run_in_threadpool(cancel_session_queries, db)
+
+    watcher = asyncio.ensure_future(watch())
+    try:
+        yield
+    finally:
+        watcher.cancel()
+
+
+def cancel_on_disconnect():
+    """Route dependency that cancels the request's running query when the client disconnects.
+
+    Only useful on sync (`def`) endpoints: their queries run in the threadpool
+    while the watcher waits for the disconnect on the event loop. The watcher
+    stops when the endpoint returns ("function" scope), before the response
+    is sent and the server reports the end of the request as a disconnect.
+    """
+    return Depends(_watch_disconnect, scope="function")
+
 # User authentication dependency (sync)
 def get_current_user(
     db: Session = Depends(get_db),
     token: str = Depends(oauth2_scheme)
 ) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(
-            token, settings.PUBLIC_KEY, algorithms=[settings.ALGORITHM]
-        )
-        token_data = TokenPayload(**payload)
-        if token_data.sub is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    
-    user = db.execute(select(User).where(User.id == int(token_data.sub))).scalar_one_or_none()
+    user_id = get_user_id_from_token(token)
+    user = db.execute(select(User).where(User.id == user_id)).scalar_one_or_none()
     if user is None:
-        raise credentials_exception
-    return user
\ No newline at end of file
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+# Admin-only dependency for operational endpoints
+def get_current_admin(
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user)
+) -> User:
+    is_admin = db.execute(
+        select(Role.id)
+        .join(user_roles, Role.id == user_roles.c.role_id)
+        .where(user_roles.c.user_id == user.id, Role.name == "admin")
+    ).first()
+    if not is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin role required"
+        )
+    return user
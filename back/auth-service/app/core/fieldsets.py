@@ -0,0 +1,28 @@
+from typing import Optional
+from fastapi import HTTPException, status
+
+
+def resolve_fields(fields: Optional[str], presets: dict[str, tuple[str, ...]], default: str = "full") -> tuple[str, ...]:
+    """Resolve a `fields=` query value into an ordered tuple of field names.
+
+    The value is a comma separated list of field names and/or preset names, e.g.
+    `card` or `card,description`. The `full` preset defines the allowed fields.
+    `id` is always included so clients can key the returned rows.
+    """
+    allowed = presets["full"]
+    requested = [part.strip() for part in (fields or default).split(",") if part.strip()]
+
+    resolved = {"id": None}
+    for name in requested:
+        if name in presets:
+            resolved.update(dict.fromkeys(presets[name]))
+        elif name in allowed:
+            resolved[name] = None
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown field or preset: {name}. Presets: {', '.join(presets)}; fields: {', '.join(allowed)}"
+            )
+
+    # Keep the declaration order of the full preset for stable payloads
+    return tuple(name for name in allowed if name in resolved)
@@ -0,0 +1,96 @@
+# tracemalloc integration for admin endpoints. Tracing is off until started
+# explicitly, so it can be enabled on a single worker and stopped again; only a
+# bounded number of snapshots is kept in memory.
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from typing import Optional
+
+from .config import settings
+
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+GROUP_BY = ("lineno", "filename", "traceback")
+
+
+class MemoryTracer:
+    """Owns tracemalloc state and the snapshots taken through the admin API"""
+
+    def __init__(self, max_snapshots: int = 5):
+        self.max_snapshots = max_snapshots
+        self._lock = threading.Lock()
+        self._snapshots: "OrderedDict[int, tuple[float, tracemalloc.Snapshot]]" = OrderedDict()
+        self._next_id = 1
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop(self):
+        tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+
+    def status(self) -> dict:
+        current, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            snapshots = [(snapshot_id, taken_at) for snapshot_id, (taken_at, _) in self._snapshots.items()]
+        return {
+            "tracing": self.tracing,
+            "frames": tracemalloc.get_traceback_limit(),
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "tracemalloc_overhead_bytes": tracemalloc.get_tracemalloc_memory(),
+            "snapshots": [{"id": snapshot_id, "taken_at": taken_at} for snapshot_id, taken_at in snapshots],
+        }
+
+    def take_snapshot(self) -> int:
+        """Take a snapshot and keep it, evicting the oldest one beyond max_snapshots"""
+        snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        with self._lock:
+            snapshot_id = self._next_id
+            self._next_id += 1
+            self._snapshots[snapshot_id] = (time.time(), snapshot)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return snapshot_id
+
+    def get_snapshot(self, snapshot_id: int) -> Optional[tracemalloc.Snapshot]:
+        entry = self._snapshots.get(snapshot_id)
+        return entry[1] if entry else None
+
+    def top(self, snapshot: tracemalloc.Snapshot, group_by: str = "lineno", limit: int = 25) -> list[dict]:
+        """Largest allocation sites of a snapshot"""
+        return [
+            {
+                "size_bytes": stat.size,
+                "count": stat.count,
+                "traceback": stat.traceback.format(),
+            }
+            for stat in snapshot.statistics(group_by)[:limit]
+        ]
+
+    def diff(self, base: tracemalloc.Snapshot, target: tracemalloc.Snapshot, group_by: str = "lineno", limit: int = 25) -> list[dict]:
+        """Allocation sites that grew the most between two snapshots"""
+        return [
+            {
+                "size_bytes": stat.size,
+                "size_diff_bytes": stat.size_diff,
+                "count": stat.count,
+                "count_diff": stat.count_diff,
+                "traceback": stat.traceback.format(),
+            }
+            for stat in target.compare_to(base, group_by)[:limit]
+        ]
+
+
+memory_tracer = MemoryTracer(settings.MEMORY_MAX_SNAPSHOTS)
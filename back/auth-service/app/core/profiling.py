@@ -0,0 +1,196 @@
+import inspect
+import functools
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+import orjson
+from fastapi.routing import APIRoute
+
+from .config import settings
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _collapse(frame) -> str:
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class _ProfiledRequest:
+    __slots__ = ("samples", "threads")
+
+    def __init__(self, thread_id: int):
+        self.samples = Counter()
+        # Threads running the request, innermost last: the event loop thread,
+        # then the threadpool worker while a `def` endpoint runs
+        self.threads = [thread_id]
+
+
+_current_request: ContextVar[Optional[_ProfiledRequest]] = ContextVar("profiled_request", default=None)
+
+
+class StackSampler:
+    """Sampling profiler for the threads that are serving profiled requests.
+
+    A daemon thread wakes up every `interval` seconds and records, for each
+    profiled request, the stack of the thread currently running it. Samples are
+    merged under the route template when the request finishes. Async endpoints
+    run on the event loop thread, so concurrent requests on that thread share
+    samples; `def` endpoints are sampled in their threadpool worker when they
+    are routed through SampledRoute.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._active: list[_ProfiledRequest] = []
+        self._routes: dict[str, Counter] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_started(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                active = [(request, request.threads[-1]) for request in self._active]
+            if not active:
+                continue
+            frames = sys._current_frames()
+            for request, thread_id in active:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    request.samples[_collapse(frame)] += 1
+
+    @contextmanager
+    def profile(self):
+        """Profile the request running in this context; yields a finish(route) callback"""
+        self._ensure_started()
+        request = _ProfiledRequest(threading.get_ident())
+        token = _current_request.set(request)
+        with self._lock:
+            self._active.append(request)
+
+        finished = []
+        try:
+            yield finished.append
+        finally:
+            _current_request.reset(token)
+            with self._lock:
+                self._active.remove(request)
+                if finished:
+                    self._routes.setdefault(finished[-1], Counter()).update(request.samples)
+
+    @contextmanager
+    def worker_thread(self):
+        """Sample the current thread instead of the event loop for the profiled request, if any"""
+        request = _current_request.get()
+        if request is None:
+            yield
+            return
+
+        thread_id = threading.get_ident()
+        with self._lock:
+            request.threads.append(thread_id)
+        try:
+            yield
+        finally:
+            with self._lock:
+                request.threads.remove(thread_id)
+
+    def summary(self) -> dict[str, int]:
+        with self._lock:
+            return {route: sum(samples.values()) for route, samples in self._routes.items()}
+
+    def collapsed(self, route: str) -> str:
+        """Stacks of a route in collapsed format, one `frame;frame;frame count` per line"""
+        with self._lock:
+            samples = dict(self._routes.get(route, {}))
+        return "".join(f"{stack} {count}\n" for stack, count in samples.items())
+
+    def speedscope(self, route: str) -> bytes:
+        """Stacks of a route as a speedscope sampled profile"""
+        with self._lock:
+            samples = dict(self._routes.get(route, {}))
+
+        frames: dict[str, int] = {}
+        stacks, weights = [], []
+        for stack, count in samples.items():
+            stacks.append([frames.setdefault(name, len(frames)) for name in stack.split(";")])
+            weights.append(count * self.interval)
+
+        return orjson.dumps({
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": route,
+            "exporter": "open-crm stack sampler",
+            "shared": {"frames": [{"name": name} for name in frames]},
+            "profiles": [{
+                "type": "sampled",
+                "name": route,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": stacks,
+                "weights": weights,
+            }],
+        })
+
+    def write(self, directory: str) -> list[str]:
+        """Write collapsed and speedscope files for every route; returns the paths"""
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for route in self.summary():
+            base = os.path.join(directory, re.sub(r"[^A-Za-z0-9_.-]+", "_", route).strip("_") or "root")
+            with open(f"{base}.collapsed", "w") as f:
+                f.write(self.collapsed(route))
+            with open(f"{base}.speedscope.json", "wb") as f:
+                f.write(self.speedscope(route))
+            paths.extend([f"{base}.collapsed", f"{base}.speedscope.json"])
+        return paths
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+sampler = StackSampler(settings.PROFILE_INTERVAL_MS / 1000)
+
+
+class SampledRoute(APIRoute):
+    """APIRoute whose `def` endpoint is sampled in the threadpool worker that runs it.
+
+    The profiled request travels in a context variable, which run_in_threadpool
+    copies into the worker; the wrapper moves the sampler onto that thread for
+    the duration of the call.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if not inspect.iscoroutinefunction(endpoint) and not hasattr(endpoint, "__sampled__"):
+            endpoint = _sampled_in_worker(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _sampled_in_worker(endpoint):
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        with sampler.worker_thread():
+            return endpoint(*args, **kwargs)
+
+    wrapper.__sampled__ = True
+    return wrapper
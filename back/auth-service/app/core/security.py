@@ -1,21 +1,67 @@
+from contextvars import ContextVar
 from datetime import datetime, timedelta
-from typing import Any, Union
-from jose import jwt
+from functools import lru_cache
+from typing import Any, Optional, Union
+from fastapi import HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from jose import jwk, jwt, JWTError
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.metrics import BCRYPT_IN_PROGRESS
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+
+# User of the current request, once its token has been verified
+current_user_id_var: ContextVar[Optional[int]] = ContextVar("current_user_id", default=None)
+# Tokens already verified in this context (e.g. the sub-requests of a batch) and their user ids
+verified_tokens_var: ContextVar[Optional[dict]] = ContextVar("verified_tokens", default=None)
+
+@lru_cache(maxsize=1)
+def get_signing_key():
+    """Private key parsed once instead of on every token issued"""
+    return jwk.construct(settings.private_key, settings.ALGORITHM)
+
+@lru_cache(maxsize=1)
+def get_verification_key():
+    """Public key parsed once instead of on every request"""
+    return jwk.construct(settings.public_key, settings.ALGORITHM)
+
 def create_access_token(subject: Union[str, Any]) -> str:
     expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     expire = datetime.now() + expires_delta
     
     to_encode = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(to_encode, settings.PRIVATE_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, get_signing_key(), algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def get_user_id_from_token(token: str) -> int:
+    """Verify an access token and return the user id in its subject"""
+    verified = verified_tokens_var.get()
+    if verified is not None and token in verified:
+        current_user_id_var.set(verified[token])
+        return verified[token]
+
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        payload = jwt.decode(token, get_verification_key(), algorithms=[settings.ALGORITHM])
+        user_id = int(payload["sub"])
+    except (JWTError, KeyError, TypeError, ValueError):
+        raise credentials_exception
+    current_user_id_var.set(user_id)
+    if verified is not None:
+        verified[token] = user_id
+    return user_id
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    with BCRYPT_IN_PROGRESS.track_inprogress():
+        return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
\ No newline at end of file
+    with BCRYPT_IN_PROGRESS.track_inprogress():
+        return pwd_context.hash(password)
\ No newline at end of file
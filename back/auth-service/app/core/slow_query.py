@@ -0,0 +1,161 @@
+# Slow-query log. Statements slower than SLOW_QUERY_THRESHOLD_MS are written as
+# JSON lines to a rotating file together with redacted parameters and the route;
+# on Postgres the first occurrence of each statement fingerprint also gets its
+# EXPLAIN plan, captured on a background thread with a separate connection.
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+from logging.handlers import RotatingFileHandler
+from typing import Optional
+
+import orjson
+
+from .config import settings
+
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|:\w+|\?")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+
+def fingerprint(statement: str) -> str:
+    """Hash of a statement with literals, placeholders and IN-list lengths normalized"""
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _LITERAL.sub("?", _PLACEHOLDER.sub("?", normalized))
+    normalized = _PLACEHOLDER_LIST.sub("(?...)", normalized)
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+def _redact_value(value):
+    if value is None or isinstance(value, (bool, int, float, Decimal, date, datetime)):
+        return value if not isinstance(value, Decimal) else str(value)
+    if isinstance(value, (str, bytes)):
+        return f"<redacted {type(value).__name__} len={len(value)}>"
+    if isinstance(value, (list, tuple)):
+        return [_redact_value(item) for item in value[:20]]
+    return f"<redacted {type(value).__name__}>"
+
+
+def redact_parameters(parameters):
+    """Keep ids, numbers, flags and timestamps; replace strings and other values"""
+    if isinstance(parameters, dict):
+        return {key: _redact_value(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact_value(value) for value in parameters]
+    return _redact_value(parameters)
+
+
+class SlowQueryLog:
+    def __init__(self, threshold_ms: int, path: str, max_bytes: int, backups: int, explain: bool = True, max_fingerprints: int = 10_000):
+        self.threshold = threshold_ms / 1000
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.explain = explain
+        self.max_fingerprints = max_fingerprints
+        self._explained: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._logger: Optional[logging.Logger] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def _setup(self):
+        with self._lock:
+            if self._executor is not None:
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            handler = RotatingFileHandler(self.path, maxBytes=self.max_bytes, backupCount=self.backups)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger = logging.getLogger("app.slow_queries")
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            self._logger = logger
+            # One worker keeps file writes ordered and EXPLAINs from piling up
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-log")
+
+    def _first_seen(self, statement_fingerprint: str) -> bool:
+        with self._lock:
+            if statement_fingerprint in self._explained:
+                self._explained.move_to_end(statement_fingerprint)
+                return False
+            self._explained[statement_fingerprint] = None
+            if len(self._explained) > self.max_fingerprints:
+                self._explained.popitem(last=False)
+            return True
+
+    def record(self, conn, statement: str, parameters, elapsed: float, executemany: bool, route: Optional[str] = None):
+        """Log a slow statement; called from the engine's after_cursor_execute hook"""
+        if statement.lstrip()[:7].upper() == "EXPLAIN":
+            return
+        self._setup()
+
+        statement_fingerprint = fingerprint(statement)
+        entry = {
+            "type": "slow_query",
+            "timestamp": time.time(),
+            "fingerprint": statement_fingerprint,
+            "duration_ms": round(elapsed * 1000, 2),
+            "route": route,
+            "statement": statement,
+            "parameters": "<executemany>" if executemany else redact_parameters(parameters),
+        }
+
+        explain = (
+            self.explain
+            and not executemany
+            and conn.dialect.name == "postgresql"
+            and statement.lstrip()[:6].upper().startswith(_EXPLAINABLE)
+            and self._first_seen(statement_fingerprint)
+        )
+        self._executor.submit(self._write, entry, conn.engine if explain else None, parameters)
+
+    def _write(self, entry: dict, engine, parameters):
+        self._logger.info(orjson.dumps(entry, default=str).decode())
+        if engine is None:
+            return
+
+        try:
+            # ANALYZE off: the statement is planned, never executed
+            with engine.connect() as explain_conn:
+                plan = explain_conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE off, FORMAT JSON) {entry['statement']}", parameters
+                ).scalar()
+                explain_conn.rollback()
+        except Exception as e:
+            plan = None
+            error = str(e)[:500]
+        else:
+            error = None
+
+        self._logger.info(orjson.dumps({
+            "type": "plan",
+            "timestamp": time.time(),
+            "fingerprint": entry["fingerprint"],
+            "route": entry["route"],
+            "statement": entry["statement"],
+            "plan": plan,
+            "error": error,
+        }, default=str).decode())
+
+
+slow_query_log = SlowQueryLog(
+    settings.SLOW_QUERY_THRESHOLD_MS,
+    settings.SLOW_QUERY_LOG_PATH,
+    settings.SLOW_QUERY_LOG_MAX_BYTES,
+    settings.SLOW_QUERY_LOG_BACKUPS,
+    settings.SLOW_QUERY_EXPLAIN,
+)
@@ -0,0 +1,257 @@
+# Lightweight tracing with OpenTelemetry-compatible span data. Spans follow the
+# OTLP JSON field names and the W3C trace context is read from and written to
+# `traceparent` headers, so exported files can be loaded into OTel tooling. The
+# current span lives in a ContextVar, which follows requests into services and
+# threadpool calls.
+import abc
+import functools
+import importlib
+import inspect
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+import orjson
+
+from .config import settings
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "start_time", "end_time", "attributes", "status", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None, kind: str = "internal", attributes: Optional[dict] = None):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_time = time.time_ns()
+        self.end_time: Optional[int] = None
+        self.attributes = attributes or {}
+        self.status = "unset"
+        self.error: Optional[str] = None
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException):
+        self.status = "error"
+        self.error = f"{type(error).__name__}: {error}"[:500]
+
+    def end(self):
+        if self.end_time is None:
+            self.end_time = time.time_ns()
+            tracer.processor.on_end(self)
+
+    def to_dict(self) -> dict:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": self.start_time,
+            "endTimeUnixNano": self.end_time,
+            "attributes": self.attributes,
+            "status": {"code": self.status, "message": self.error or ""},
+        }
+
+
+class SpanExporter(abc.ABC):
+    """Receives finished spans in batches; subclass and point TRACING_EXPORTER at it"""
+
+    @abc.abstractmethod
+    def export(self, spans: list[Span]):
+        ...
+
+    def shutdown(self):
+        pass
+
+
+class StreamSpanExporter(SpanExporter):
+    """Writes one JSON span per line to stdout or an append-only file"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        if path and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def export(self, spans: list[Span]):
+        data = b"".join(orjson.dumps(span.to_dict(), default=str) + b"\n" for span in spans)
+        if self.path is None:
+            sys.stdout.buffer.write(data)
+            sys.stdout.flush()
+        else:
+            with open(self.path, "ab") as f:
+                f.write(data)
+
+
+class BatchSpanProcessor:
+    """Queues finished spans and exports them in batches from a daemon thread"""
+
+    def __init__(self, exporter: Optional[SpanExporter], max_queue_size: int = 10_000, batch_size: int = 512, interval: float = 1.0):
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue: "queue.Queue[Span]" = queue.Queue(max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        # The exporter thread and shutdown() may flush at the same time
+        self._flush_lock = threading.Lock()
+        self.dropped = 0
+
+    def on_end(self, span: Span):
+        if self.exporter is None:
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+            self._thread.start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            # Never block a request on tracing
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+    def flush(self):
+        with self._flush_lock:
+            while not self._queue.empty():
+                batch = []
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if batch:
+                    try:
+                        self.exporter.export(batch)
+                    except Exception:
+                        self.dropped += len(batch)
+
+    def shutdown(self):
+        """Export the spans still queued, then shut the exporter down; called when the app stops"""
+        if self.exporter is None:
+            return
+        self.flush()
+        self.exporter.shutdown()
+
+
+def load_exporter(spec: str) -> Optional[SpanExporter]:
+    """Build the exporter named by TRACING_EXPORTER: stdout, file or module.path:factory"""
+    if not spec:
+        return None
+    if spec == "stdout":
+        return StreamSpanExporter()
+    if spec == "file":
+        return StreamSpanExporter(settings.TRACING_FILE_PATH)
+    module_name, _, attribute = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)()
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[tuple[str, str, bool]]:
+    """Return (trace id, parent span id, sampled) of a W3C traceparent header"""
+    match = _TRACEPARENT.match((header or "").strip().lower())
+    if match is None or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+        return None
+    return match.group(1), match.group(2), bool(int(match.group(3), 16) & 1)
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def get_current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+class Tracer:
+    def __init__(self, exporter: Optional[SpanExporter], sample_rate: float = 1.0):
+        self.processor = BatchSpanProcessor(exporter)
+        self.sample_rate = sample_rate
+
+    @property
+    def enabled(self) -> bool:
+        return self.processor.exporter is not None
+
+    def start_span(self, name: str, kind: str = "internal", attributes: Optional[dict] = None, traceparent: Optional[str] = None) -> Optional[Span]:
+        """Start a child of the current span, or a root span for a new or remote trace.
+
+        Returns None when tracing is off or the trace is not sampled. The span
+        is not made current; use `span()` for that.
+        """
+        if not self.enabled:
+            return None
+
+        parent = _current_span.get()
+        if parent is not None:
+            return Span(name, parent.trace_id, parent.span_id, kind, attributes)
+
+        remote = parse_traceparent(traceparent)
+        if remote is not None:
+            trace_id, parent_id, sampled = remote
+            if not sampled:
+                return None
+            return Span(name, trace_id, parent_id, kind, attributes)
+
+        if random.random() >= self.sample_rate:
+            return None
+        return Span(name, os.urandom(16).hex(), None, kind, attributes)
+
+    @contextmanager
+    def span(self, name: str, kind: str = "internal", attributes: Optional[dict] = None, traceparent: Optional[str] = None):
+        """Run the block in a new current span; yields None when not traced"""
+        span = self.start_span(name, kind, attributes, traceparent)
+        if span is None:
+            yield None
+            return
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+
+tracer = Tracer(load_exporter(settings.TRACING_EXPORTER), settings.TRACING_SAMPLE_RATE)
+
+
+def traced(cls):
+    """Class decorator giving each public method of a service its own span.
+
+    Spans are named `Class.method` and only created inside a traced request,
+    so untraced calls (scripts, disabled tracing) cost one ContextVar lookup.
+    """
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(method) or inspect.isgeneratorfunction(method):
+            continue
+        setattr(cls, name, _traced_method(f"{cls.__name__}.{name}", method))
+    return cls
+
+
+def _traced_method(span_name: str, method):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        if _current_span.get() is None:
+            return method(*args, **kwargs)
+        with tracer.span(span_name):
+            return method(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,164 @@
+import asyncio
+from collections import defaultdict
+from typing import Callable, Optional
+from sqlalchemy import select, and_
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from strawberry.dataloader import DataLoader
+from app.models.category import Category
+from app.models.comment import Comment
+from app.models.task import Task, TaskDependency
+from app.models.user import User
+from app.models.workspace import Workspace, GroupRoleType, workspace_users
+from app.services.category_service import CATEGORY_LIST_COLUMNS
+from app.services.comment_service import COMMENT_COLUMNS_BY_FIELD
+from app.services.task_service import TASK_LIST_COLUMNS
+
+WORKSPACE_COLUMNS = (Workspace.id, Workspace.name, Workspace.description, Workspace.created_at, Workspace.updated_at)
+# The email is exposed under a private name; the GraphQL types decide who may read it
+USER_COLUMNS = (User.id, User.username, User.email.label("email_address"), User.is_active, User.created_at)
+DEPENDENCY_COLUMNS = (
+    TaskDependency.id,
+    TaskDependency.blocking_task_id,
+    TaskDependency.blocked_task_id,
+    TaskDependency.dependency_type,
+    TaskDependency.created_at,
+    TaskDependency.created_by_id,
+)
+
+
+def _by_key(rows, key: str) -> dict:
+    return {row[key]: dict(row) for row in rows}
+
+
+def _grouped(rows, key: str) -> dict[int, list[dict]]:
+    groups = defaultdict(list)
+    for row in rows:
+        groups[row[key]].append(dict(row))
+    return groups
+
+
+class BoardLoaders:
+    """DataLoaders for one GraphQL request.
+
+    Every loader collects the keys requested by all parents at one level of the
+    query and resolves them with a single `IN (...)` query, so the number of
+    queries grows with the query depth, not with the number of rows. Loads are
+    serialized by a lock stored on the session, shared by everything that
+    runs on that session from the event loop.
+    """
+
+    def __init__(self, db: Session, user_id: int):
+        self.db = db
+        self.user_id = user_id
+        # Loaders due in the same tick would otherwise use the session from two
+        # threads; the lock belongs to the session, not to this set of loaders
+        self._lock = db.info.setdefault("graphql_lock", asyncio.Lock())
+        self._roles: Optional[dict[int, GroupRoleType]] = None
+
+        self.workspaces = DataLoader(self._batch(self._load_workspaces))
+        self.users = DataLoader(self._batch(self._load_users))
+        self.tasks = DataLoader(self._batch(self._load_tasks))
+        self.categories = DataLoader(self._batch(self._load_categories))
+        self.workspace_categories = DataLoader(self._batch(self._load_workspace_categories))
+        self.workspace_tasks = DataLoader(self._batch(self._load_workspace_tasks))
+        self.category_tasks = DataLoader(self._batch(self._load_category_tasks))
+        self.workspace_members = DataLoader(self._batch(self._load_workspace_members))
+        self.task_comments = DataLoader(self._batch(self._load_task_comments))
+        self.blocking_dependencies = DataLoader(self._batch(self._load_blocking_dependencies))
+        self.blocked_by_dependencies = DataLoader(self._batch(self._load_blocked_by_dependencies))
+
+    def _batch(self, load: Callable[[list[int]], list]):
+        async def load_fn(keys: list[int]) -> list:
+            async with self._lock:
+                return await run_in_threadpool(load, list(keys))
+        return load_fn
+
+    async def workspace_roles(self) -> dict[int, GroupRoleType]:
+        """The requesting user's role in each of their workspaces, read once per request"""
+        async with self._lock:
+            if self._roles is None:
+                rows = await run_in_threadpool(
+                    lambda: self.db.execute(
+                        select(workspace_users.c.workspace_id, workspace_users.c.role)
+                        .where(workspace_users.c.user_id == self.user_id)
+                    ).all()
+                )
+                self._roles = {row.workspace_id: row.role for row in rows}
+        return self._roles
+
+    def _load_workspaces(self, keys: list[int]) -> list[Optional[dict]]:
+        rows = self.db.execute(select(*WORKSPACE_COLUMNS).where(Workspace.id.in_(keys))).mappings().all()
+        found = _by_key(rows, "id")
+        return [found.get(key) for key in keys]
+
+    def _load_users(self, keys: list[int]) -> list[Optional[dict]]:
+        rows = self.db.execute(select(*USER_COLUMNS).where(User.id.in_(keys))).mappings().all()
+        found = _by_key(rows, "id")
+        return [found.get(key) for key in keys]
+
+    def _load_tasks(self, keys: list[int]) -> list[Optional[dict]]:
+        rows = self.db.execute(select(*TASK_LIST_COLUMNS).where(Task.id.in_(keys))).mappings().all()
+        found = _by_key(rows, "id")
+        return [found.get(key) for key in keys]
+
+    def _load_categories(self, keys: list[int]) -> list[Optional[dict]]:
+        rows = self.db.execute(select(*CATEGORY_LIST_COLUMNS).where(Category.id.in_(keys))).mappings().all()
+        found = _by_key(rows, "id")
+        return [found.get(key) for key in keys]
+
+    def _load_workspace_categories(self, keys: list[int]) -> list[list[dict]]:
+        rows = self.db.execute(
+            select(*CATEGORY_LIST_COLUMNS)
+            .where(and_(Category.workspace_id.in_(keys), Category.is_archived == False))
+            .order_by(Category.position)
+        ).mappings().all()
+        groups = _grouped(rows, "workspace_id")
+        return [groups.get(key, []) for key in keys]
+
+    def _load_workspace_tasks(self, keys: list[int]) -> list[list[dict]]:
+        rows = self.db.execute(
+            select(*TASK_LIST_COLUMNS).where(Task.workspace_id.in_(keys)).order_by(Task.id)
+        ).mappings().all()
+        groups = _grouped(rows, "workspace_id")
+        return [groups.get(key, []) for key in keys]
+
+    def _load_category_tasks(self, keys: list[int]) -> list[list[dict]]:
+        rows = self.db.execute(
+            select(*TASK_LIST_COLUMNS).where(Task.category_id.in_(keys)).order_by(Task.id)
+        ).mappings().all()
+        groups = _grouped(rows, "category_id")
+        return [groups.get(key, []) for key in keys]
+
+    def _load_workspace_members(self, keys: list[int]) -> list[list[dict]]:
+        rows = self.db.execute(
+            select(*USER_COLUMNS, workspace_users.c.workspace_id, workspace_users.c.role)
+            .join(workspace_users, User.id == workspace_users.c.user_id)
+            .where(workspace_users.c.workspace_id.in_(keys))
+            .order_by(User.id)
+        ).mappings().all()
+        groups = _grouped(rows, "workspace_id")
+        return [groups.get(key, []) for key in keys]
+
+    def _load_task_comments(self, keys: list[int]) -> list[list[dict]]:
+        rows = self.db.execute(
+            select(*COMMENT_COLUMNS_BY_FIELD.values())
+            .where(Comment.task_id.in_(keys))
+            .order_by(Comment.created_at)
+        ).mappings().all()
+        groups = _grouped(rows, "task_id")
+        return [groups.get(key, []) for key in keys]
+
+    def _load_blocking_dependencies(self, keys: list[int]) -> list[list[dict]]:
+        rows = self.db.execute(
+            select(*DEPENDENCY_COLUMNS).where(TaskDependency.blocking_task_id.in_(keys))
+        ).mappings().all()
+        groups = _grouped(rows, "blocking_task_id")
+        return [groups.get(key, []) for key in keys]
+
+    def _load_blocked_by_dependencies(self, keys: list[int]) -> list[list[dict]]:
+        rows = self.db.execute(
+            select(*DEPENDENCY_COLUMNS).where(TaskDependency.blocked_task_id.in_(keys))
+        ).mappings().all()
+        groups = _grouped(rows, "blocked_task_id")
+        return [groups.get(key, []) for key in keys]
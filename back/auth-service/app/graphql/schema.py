@@ -0,0 +1,234 @@
+import dataclasses
+from datetime import datetime
+from typing import Optional
+import strawberry
+from strawberry.fastapi import BaseContext
+from strawberry.types import Info
+from app.graphql.loaders import BoardLoaders
+from app.models.task import PriorityType, TaskStatus
+from app.models.workspace import GroupRoleType
+
+TaskStatusType = strawberry.enum(TaskStatus, name="TaskStatus")
+PriorityTypeType = strawberry.enum(PriorityType, name="Priority")
+RoleType = strawberry.enum(GroupRoleType, name="WorkspaceRole")
+
+
+class BoardContext(BaseContext):
+    def __init__(self, loaders: BoardLoaders):
+        super().__init__()
+        self.loaders = loaders
+
+
+def _build(cls, row: Optional[dict]):
+    """Instantiate a GraphQL type from a loader row, ignoring columns it does not expose"""
+    if row is None:
+        return None
+    return cls(**{field.name: row[field.name] for field in dataclasses.fields(cls) if field.init})
+
+
+async def _visible(info: Info, row: Optional[dict]) -> bool:
+    """Whether the requesting user is a member of the workspace the row belongs to"""
+    return row is not None and row["workspace_id"] in await info.context.loaders.workspace_roles()
+
+
+@strawberry.type
+class User:
+    id: int
+    username: str
+    is_active: Optional[bool]
+    created_at: Optional[datetime]
+    email_address: strawberry.Private[str]
+
+    @strawberry.field
+    def email(self, info: Info) -> Optional[str]:
+        """Only returned to the user themselves"""
+        return self.email_address if self.id == info.context.loaders.user_id else None
+
+
+@strawberry.type
+class Member:
+    id: int
+    username: str
+    role: RoleType
+    workspace_id: strawberry.Private[int]
+    email_address: strawberry.Private[str]
+
+    @strawberry.field
+    async def email(self, info: Info) -> Optional[str]:
+        """Only returned to admins of the workspace and to the member themselves"""
+        loaders = info.context.loaders
+        if self.id == loaders.user_id or (await loaders.workspace_roles()).get(self.workspace_id) == GroupRoleType.admin:
+            return self.email_address
+        return None
+
+
+@strawberry.type
+class Comment:
+    id: int
+    task_id: int
+    user_id: Optional[int]
+    content: str
+    created_at: Optional[datetime]
+    edited_at: Optional[datetime]
+
+    @strawberry.field
+    async def author(self, info: Info) -> Optional[User]:
+        if self.user_id is None:
+            return None
+        return _build(User, await info.context.loaders.users.load(self.user_id))
+
+
+@strawberry.type
+class Dependency:
+    id: int
+    blocking_task_id: int
+    blocked_task_id: int
+    dependency_type: str
+    created_at: Optional[datetime]
+    created_by_id: int
+
+    @strawberry.field
+    async def blocking_task(self, info: Info) -> Optional["Task"]:
+        row = await info.context.loaders.tasks.load(self.blocking_task_id)
+        return _build(Task, row) if await _visible(info, row) else None
+
+    @strawberry.field
+    async def blocked_task(self, info: Info) -> Optional["Task"]:
+        row = await info.context.loaders.tasks.load(self.blocked_task_id)
+        return _build(Task, row) if await _visible(info, row) else None
+
+    @strawberry.field
+    async def created_by(self, info: Info) -> Optional[User]:
+        return _build(User, await info.context.loaders.users.load(self.created_by_id))
+
+
+@strawberry.type
+class Task:
+    id: int
+    title: str
+    description: str
+    status: TaskStatusType
+    priority: PriorityTypeType
+    workspace_id: int
+    category_id: Optional[int]
+    assignee_id: Optional[int]
+    reporter_id: Optional[int]
+    story_points: Optional[int]
+    labels: Optional[list[str]]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    @strawberry.field
+    async def workspace(self, info: Info) -> Optional["Workspace"]:
+        return _build(Workspace, await info.context.loaders.workspaces.load(self.workspace_id))
+
+    @strawberry.field
+    async def category(self, info: Info) -> Optional["Category"]:
+        if self.category_id is None:
+            return None
+        return _build(Category, await info.context.loaders.categories.load(self.category_id))
+
+    @strawberry.field
+    async def assignee(self, info: Info) -> Optional[User]:
+        if self.assignee_id is None:
+            return None
+        return _build(User, await info.context.loaders.users.load(self.assignee_id))
+
+    @strawberry.field
+    async def reporter(self, info: Info) -> Optional[User]:
+        if self.reporter_id is None:
+            return None
+        return _build(User, await info.context.loaders.users.load(self.reporter_id))
+
+    @strawberry.field
+    async def comments(self, info: Info) -> list[Comment]:
+        return [_build(Comment, row) for row in await info.context.loaders.task_comments.load(self.id)]
+
+    @strawberry.field(description="Dependencies in which this task blocks another task")
+    async def blocking(self, info: Info) -> list[Dependency]:
+        return [_build(Dependency, row) for row in await info.context.loaders.blocking_dependencies.load(self.id)]
+
+    @strawberry.field(description="Dependencies in which another task blocks this task")
+    async def blocked_by(self, info: Info) -> list[Dependency]:
+        return [_build(Dependency, row) for row in await info.context.loaders.blocked_by_dependencies.load(self.id)]
+
+
+@strawberry.type
+class Category:
+    id: int
+    workspace_id: int
+    name: str
+    description: Optional[str]
+    color: str
+    position: int
+    is_archived: bool
+    default_status: TaskStatusType
+    allowed_statuses: list[str]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    @strawberry.field
+    async def tasks(self, info: Info, status: Optional[TaskStatusType] = None) -> list[Task]:
+        rows = await info.context.loaders.category_tasks.load(self.id)
+        return [_build(Task, row) for row in rows if status is None or row["status"] == status]
+
+
+@strawberry.type
+class Workspace:
+    id: int
+    name: str
+    description: Optional[str]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    @strawberry.field
+    async def role(self, info: Info) -> Optional[RoleType]:
+        """The requesting user's role in this workspace"""
+        return (await info.context.loaders.workspace_roles()).get(self.id)
+
+    @strawberry.field
+    async def categories(self, info: Info) -> list[Category]:
+        return [_build(Category, row) for row in await info.context.loaders.workspace_categories.load(self.id)]
+
+    @strawberry.field
+    async def tasks(self, info: Info, status: Optional[TaskStatusType] = None) -> list[Task]:
+        rows = await info.context.loaders.workspace_tasks.load(self.id)
+        return [_build(Task, row) for row in rows if status is None or row["status"] == status]
+
+    @strawberry.field
+    async def members(self, info: Info) -> list[Member]:
+        return [_build(Member, row) for row in await info.context.loaders.workspace_members.load(self.id)]
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    async def me(self, info: Info) -> Optional[User]:
+        loaders = info.context.loaders
+        return _build(User, await loaders.users.load(loaders.user_id))
+
+    @strawberry.field
+    async def workspaces(self, info: Info) -> list[Workspace]:
+        """Workspaces the requesting user is a member of"""
+        loaders = info.context.loaders
+        ids = sorted(await loaders.workspace_roles())
+        return [_build(Workspace, row) for row in await loaders.workspaces.load_many(ids) if row is not None]
+
+    @strawberry.field
+    async def workspace(self, info: Info, id: int) -> Optional[Workspace]:
+        loaders = info.context.loaders
+        if id not in await loaders.workspace_roles():
+            raise PermissionError("Access denied to workspace")
+        return _build(Workspace, await loaders.workspaces.load(id))
+
+    @strawberry.field
+    async def task(self, info: Info, id: int) -> Optional[Task]:
+        row = await info.context.loaders.tasks.load(id)
+        if row is None:
+            return None
+        if not await _visible(info, row):
+            raise PermissionError("User does not have access to this workspace")
+        return _build(Task, row)
+
+
+schema = strawberry.Schema(query=Query)
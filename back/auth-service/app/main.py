@@ -1,36 +1,126 @@
+from contextlib import asynccontextmanager
+from importlib import import_module
 from fastapi import FastAPI
-from fastapi.security import OAuth2PasswordBearer
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 from app.core.config import settings
-from app.api.routes import auth, workspace_router, task_router, comment_router
+from app.core.logging_config import setup_logging
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title=settings.PROJECT_NAME)
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:5173"],  # Your frontend URL
-    allow_credentials=True,
-    allow_methods=["*"],  # Allows all methods
-    allow_headers=["*"],  # Allows all headers
+# Router modules with the keyword arguments for include_router; they are only
+# imported when an app is built, so importing app.main stays cheap
+ROUTERS = (
+    ("app.api.routes.auth", {"prefix": "/auth", "tags": ["auth"]}),
+    ("app.api.routes.workspace", {}),
+    ("app.api.routes.task", {}),
+    ("app.api.routes.dependency", {}),
+    ("app.api.routes.category", {}),
+    ("app.api.routes.comment", {}),
+    ("app.api.routes.export", {}),
+    ("app.api.routes.admin", {}),
+    ("app.api.routes.search", {}),
+    ("app.api.routes.batch", {}),
+    ("app.api.routes.graphql", {"prefix": "/graphql"}),
 )
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-# Include routers
-app.include_router(auth.router, prefix="/auth", tags=["auth"])
-app.include_router(workspace_router.router, prefix="/workspaces", tags=["workspaces"])
-app.include_router(task_router.router, prefix="/tasks", tags=["tasks"])
-app.include_router(comment_router.router, prefix="/comments", tags=["comments"])
+def warm_up():
+    """Open pool connections, parse the JWT keys and prime bcrypt before serving"""
+    from app.core.db import engine, replica_engines
+    from app.core.security import get_signing_key, get_verification_key, pwd_context
+
+    # Hold the connections at the same time so each pool really opens that many
+    connections = []
+    try:
+        for pool_engine in (engine, *replica_engines):
+            for _ in range(settings.DB_POOL_WARMUP_CONNECTIONS):
+                connection = pool_engine.connect()
+                connections.append(connection)
+                connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            connection.close()
+
+    if settings.PRIVATE_KEY:
+        get_signing_key()
+    if settings.PUBLIC_KEY:
+        get_verification_key()
+    # The first hash loads the bcrypt backend and runs its self-test
+    pwd_context.dummy_verify()
+    logger.info("Warm-up finished", extra={"pool_connections": len(connections)})
+
 
-@app.on_event("startup")
-async def startup_event():
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from app.core.db import engine, replica_engines
+    from app.core.tracing import tracer
+
+    try:
+        await run_in_threadpool(warm_up)
+    except Exception:
+        # A cold pool or hasher only slows the first requests down; don't refuse to start
+        logger.exception("Warm-up failed, serving without it")
     logger.info("Auth Service started successfully")
+    try:
+        yield
+    finally:
+        # Spans still queued would be lost with the daemon exporter thread
+        await run_in_threadpool(tracer.processor.shutdown)
+        for pool_engine in (engine, *replica_engines):
+            pool_engine.dispose()
+
+
+def create_app() -> FastAPI:
+    """Build the application; also usable as `uvicorn --factory app.main:create_app`"""
+    from app.api.middleware import idempotency_middleware, sql_timing_middleware, metrics_middleware, profiling_middleware, allocation_middleware, tracing_middleware, request_id_middleware
+    from app.core.db import query_cancelled_handler
+    from app.core.metrics import registry
+
+    setup_logging()
+    app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
+
+    # Add CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:5173"],  # Your frontend URL
+        allow_credentials=True,
+        allow_methods=["*"],  # Allows all methods
+        allow_headers=["*"],  # Allows all headers
+    )
+
+    app.middleware("http")(idempotency_middleware)
+    app.middleware("http")(sql_timing_middleware)
+    app.middleware("http")(metrics_middleware)
+    app.middleware("http")(profiling_middleware)
+    app.middleware("http")(allocation_middleware)
+    app.middleware("http")(tracing_middleware)
+    app.middleware("http")(request_id_middleware)
+
+    app.add_exception_handler(DBAPIError, query_cancelled_handler)
+
+    # Include routers
+    for module_name, options in ROUTERS:
+        app.include_router(import_module(module_name).router, **options)
+
+    @app.get("/")
+    async def root():
+        return {"message": "Auth Service is running!"}
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+    return app
+
 
-@app.get("/")
-async def root():
-    return {"message": "Auth Service is running!"}
\ No newline at end of file
+def __getattr__(name: str):
+    # Keeps `uvicorn app.main:app` working while building the app on first access
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
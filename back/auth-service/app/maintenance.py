@@ -0,0 +1,27 @@
+"""One-off data maintenance tasks, run from the command line.
+
+    python -m app.maintenance backfill-task-labels [--batch-size N]
+"""
+import argparse
+from app.core.db import SessionLocal
+from app.services.task_service import TaskService
+
+
+def backfill_task_labels(batch_size: int) -> int:
+    with SessionLocal() as db:
+        return TaskService(db).backfill_task_labels(batch_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    backfill = commands.add_parser("backfill-task-labels", help="Index the labels of tasks missing from task_labels")
+    backfill.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.command == "backfill-task-labels":
+        print(f"Indexed the labels of {backfill_task_labels(args.batch_size)} tasks")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
 from .base import Base
 from .user import User, UserSession, Role, Permission, GroupRoleType
 from .workspace import Workspace
-from .task import Task, TaskDependency, PriorityType, TaskStatus
+from .task import Task, TaskDependency, TaskLabel, PriorityType, TaskStatus
 from .category import Category
 from .comment import Comment
+from .idempotency import IdempotencyKey
 
 __all__ = [
     "Base",
@@ -15,8 +16,10 @@ __all__ = [
     "Workspace",
     "Task",
     "TaskDependency",
+    "TaskLabel",
     "PriorityType",
     "TaskStatus",
     "Category",
-    "Comment"
+    "Comment",
+    "IdempotencyKey"
 ]
\ No newline at end of file
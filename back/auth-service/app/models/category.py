@@ -3,6 +3,7 @@ from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, DateT
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 from app.models.task import TaskStatus
+from app.models.search import search_vector_column, search_vector_index
 
 
 class Category(Base):
@@ -23,12 +24,14 @@ class Category(Base):
     # Timestamps
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
     updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+    search_vector = search_vector_column(name, description)
     
     # Relationships
     workspace = relationship("Workspace", back_populates="categories")
     tasks = relationship("Task", back_populates="category")
 
     __table_args__ = (
+        search_vector_index("categories"),
         # Ensure unique category names within a workspace
         {'schema': None}  # This will be handled by a unique constraint in migration
     )
\ No newline at end of file
@@ -2,6 +2,7 @@ from datetime import datetime
 from sqlalchemy import Column, Integer, ForeignKey, Text, DateTime
 from sqlalchemy.orm import relationship
 from app.models.base import Base
+from app.models.search import search_vector_column, search_vector_index
 
 class Comment(Base):
     __tablename__ = "comments"
@@ -12,11 +13,14 @@ class Comment(Base):
     content = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
     edited_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+    search_vector = search_vector_column(content)
 
     task = relationship("Task", back_populates="comments")
     user = relationship("User")
     replies = relationship("CommentReply", back_populates="comment", cascade="all, delete-orphan")
 
+    __table_args__ = (search_vector_index("comments"),)
+
 class CommentReply(Base):
     __tablename__ = "comment_replies"
 
@@ -26,6 +30,9 @@ class CommentReply(Base):
     content = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
     edited_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+    search_vector = search_vector_column(content)
 
     comment = relationship("Comment", back_populates="replies")
-    user = relationship("User")
\ No newline at end of file
+    user = relationship("User")
+
+    __table_args__ = (search_vector_index("comment_replies"),)
\ No newline at end of file
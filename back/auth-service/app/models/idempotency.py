@@ -0,0 +1,23 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, ForeignKey, String, SmallInteger, LargeBinary, DateTime, UniqueConstraint
+from app.models.base import Base
+
+class IdempotencyKey(Base):
+    """Response of a POST stored under the client's Idempotency-Key for replay.
+
+    While the first request runs, status_code is NULL and expires_at is a short
+    lock; once it finishes the response is stored and kept until expires_at.
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (UniqueConstraint("user_id", "key", name="uq_idempotency_keys_user_key"),)
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    key = Column(String(255), nullable=False)
+    # sha256 of method, path, query and body, so a key reused for another request is refused
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(SmallInteger)
+    content_type = Column(String(100))
+    response_body = Column(LargeBinary)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,53 @@
+from sqlalchemy import Column, Computed, Index, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import deferred
+from sqlalchemy.sql.functions import FunctionElement
+
+# Text search configuration used for the search vectors and for queries
+SEARCH_CONFIG = "english"
+
+# tsvector weights given to the columns of a search document, in order
+SEARCH_WEIGHTS = ("A", "B", "C", "D")
+
+
+class search_document(FunctionElement):
+    """Generation expression of a search_vector column, compiled per dialect.
+
+    Postgres gets a tsvector weighting the columns A, B, C... in order; other
+    databases get the lowercased text, which the in-process search fallback scans.
+    """
+    inherit_cache = True
+    name = "search_document"
+
+
+@compiles(search_document, "postgresql")
+def _compile_search_document_postgresql(element, compiler, **kw):
+    columns = (compiler.process(clause, **kw) for clause in element.clauses)
+    return " || ".join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({column}, '')), '{weight}')"
+        for column, weight in zip(columns, SEARCH_WEIGHTS)
+    )
+
+
+@compiles(search_document)
+def _compile_search_document(element, compiler, **kw):
+    columns = " || ' ' || ".join(f"coalesce({compiler.process(clause, **kw)}, '')" for clause in element.clauses)
+    return f"lower({columns})"
+
+
+def search_vector_column(*columns):
+    """Deferred search_vector column generated from `columns`, most important first.
+
+    The database maintains it on every insert and update, and it is deferred so
+    that loading an entity never reads it.
+    """
+    return deferred(Column(
+        TSVECTOR().with_variant(Text(), "sqlite"),
+        Computed(search_document(*columns), persisted=True),
+    ))
+
+
+def search_vector_index(table_name: str) -> Index:
+    """GIN index over the search_vector column of `table_name` (Postgres only)"""
+    return Index(f"ix_{table_name}_search_vector", "search_vector", postgresql_using="gin").ddl_if(dialect="postgresql")
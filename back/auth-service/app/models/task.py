@@ -1,7 +1,8 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, ForeignKey, Enum, Text, DateTime, String, JSON, UniqueConstraint, CheckConstraint
+from sqlalchemy import Column, Integer, ForeignKey, Enum, Text, DateTime, String, JSON, UniqueConstraint, CheckConstraint, Index, cast
 from sqlalchemy.orm import relationship
 from app.models.base import Base
+from app.models.search import search_vector_column, search_vector_index
 import enum
 
 class PriorityType(enum.Enum):
@@ -32,6 +33,7 @@ class Task(Base):
     labels = Column(JSON, nullable=True)  # Store as JSON array of strings
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
     updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+    search_vector = search_vector_column(title, description, cast(labels, Text))
 
     workspace = relationship("Workspace", back_populates="tasks")
     category = relationship("Category", back_populates="tasks")
@@ -41,6 +43,24 @@ class Task(Base):
     blocking_dependencies = relationship("TaskDependency", foreign_keys="TaskDependency.blocking_task_id", back_populates="blocking_task")
     blocked_by_dependencies = relationship("TaskDependency", foreign_keys="TaskDependency.blocked_task_id", back_populates="blocked_task")
 
+    __table_args__ = (
+        search_vector_index("tasks"),
+    )
+
+
+class TaskLabel(Base):
+    """One row per label of a task; TaskService keeps it in sync with Task.labels"""
+    __tablename__ = "task_labels"
+
+    task_id = Column(Integer, ForeignKey('tasks.id', ondelete='CASCADE'), primary_key=True)
+    label = Column(String(50), primary_key=True)
+    # Copy of the task's workspace, so label lookups and counts of a workspace use one index
+    workspace_id = Column(Integer, ForeignKey('workspaces.id', ondelete='CASCADE'), nullable=False)
+
+    __table_args__ = (
+        Index('ix_task_labels_workspace_label', 'workspace_id', 'label', 'task_id'),
+    )
+
 class DependencyType(enum.Enum):
     blocks = "blocks"
     depends_on = "depends_on"
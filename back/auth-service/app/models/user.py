@@ -1,6 +1,6 @@
 from datetime import datetime
 from sqlalchemy import (
-    Boolean, Column, Integer, String, DateTime, ForeignKey, Table, Enum, UniqueConstraint
+    Boolean, Column, Integer, String, DateTime, ForeignKey, Table, Enum, UniqueConstraint, Index, func
 )
 from sqlalchemy.orm import relationship
 from app.models.base import Base
@@ -46,6 +46,13 @@ class User(Base):
     assigned_tasks = relationship("Task", foreign_keys="Task.assignee_id", back_populates="assignee")
     reported_tasks = relationship("Task", foreign_keys="Task.reporter_id", back_populates="reporter")
 
+    __table_args__ = (
+        # Case-insensitive lookups for autocomplete (username prefixes, exact emails). The "C" collation makes
+        # `LIKE 'abc%'` and ORDER BY ... LIMIT one ordered range scan of the index
+        Index('ix_users_username_lower_prefix', func.lower(username).collate("C")).ddl_if(dialect="postgresql"),
+        Index('ix_users_email_lower_prefix', func.lower(email).collate("C")).ddl_if(dialect="postgresql"),
+    )
+
 class UserSession(Base):
     __tablename__ = "user_sessions"
 
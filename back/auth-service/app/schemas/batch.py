@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+from typing import Any, List, Literal, Optional
+
+class BatchOperation(BaseModel):
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"]
+    path: str = Field(..., description="Path with an optional query string, e.g. /tasks/workspace/1?fields=card")
+    body: Optional[Any] = Field(None, description="JSON body of the sub-request")
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation]
+    transactional: bool = Field(
+        False,
+        description="Run all operations in one transaction; the first failure rolls back the batch and skips the rest"
+    )
+
+class BatchOperationResult(BaseModel):
+    status: int
+    body: Optional[Any] = None
+
+class BatchResponse(BaseModel):
+    # None when the batch was not transactional
+    committed: Optional[bool] = None
+    responses: List[BatchOperationResult]
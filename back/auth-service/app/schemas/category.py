@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional, List
 from datetime import datetime
 from app.models.task import TaskStatus
@@ -7,7 +7,7 @@ from app.models.task import TaskStatus
 class CategoryCreate(BaseModel):
     name: str = Field(..., min_length=1, max_length=100, description="Category name")
     description: Optional[str] = Field(None, max_length=500, description="Category description")
-    color: str = Field(default="#6366f1", regex="^#[0-9A-Fa-f]{6}$", description="Hex color code for category")
+    color: str = Field(default="#6366f1", pattern="^#[0-9A-Fa-f]{6}$", description="Hex color code for category")
     position: int = Field(default=0, ge=0, description="Position for ordering categories")
     default_status: TaskStatus = Field(default=TaskStatus.open, description="Default status for tasks in this category")
     allowed_statuses: List[str] = Field(
@@ -15,7 +15,8 @@ class CategoryCreate(BaseModel):
         description="List of allowed task statuses for this category"
     )
 
-    @validator('allowed_statuses')
+    @field_validator('allowed_statuses')
+    @classmethod
     def validate_allowed_statuses(cls, v):
         if not v or len(v) == 0:
             raise ValueError('At least one status must be allowed')
@@ -30,7 +31,8 @@ class CategoryCreate(BaseModel):
         
         return v
 
-    @validator('color')
+    @field_validator('color')
+    @classmethod
     def validate_color_format(cls, v):
         if not v.startswith('#'):
             raise ValueError('Color must start with #')
@@ -42,13 +44,14 @@ class CategoryCreate(BaseModel):
 class CategoryUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100, description="Category name")
     description: Optional[str] = Field(None, max_length=500, description="Category description")
-    color: Optional[str] = Field(None, regex="^#[0-9A-Fa-f]{6}$", description="Hex color code for category")
+    color: Optional[str] = Field(None, pattern="^#[0-9A-Fa-f]{6}$", description="Hex color code for category")
     position: Optional[int] = Field(None, ge=0, description="Position for ordering categories")
     is_archived: Optional[bool] = Field(None, description="Whether the category is archived")
     default_status: Optional[TaskStatus] = Field(None, description="Default status for tasks in this category")
     allowed_statuses: Optional[List[str]] = Field(None, description="List of allowed task statuses for this category")
 
-    @validator('allowed_statuses')
+    @field_validator('allowed_statuses')
+    @classmethod
     def validate_allowed_statuses(cls, v):
         if v is not None:
             if len(v) == 0:
@@ -64,7 +67,8 @@ class CategoryUpdate(BaseModel):
         
         return v
 
-    @validator('color')
+    @field_validator('color')
+    @classmethod
     def validate_color_format(cls, v):
         if v is not None:
             if not v.startswith('#'):
@@ -88,5 +92,4 @@ class CategoryResponse(BaseModel):
     created_at: datetime = Field(..., description="Timestamp when category was created")
     updated_at: datetime = Field(..., description="Timestamp when category was last updated")
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
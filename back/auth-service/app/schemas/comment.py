@@ -18,7 +18,7 @@ class CommentResponse(CommentBase):
     edited_at: str
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class CommentReplyBase(BaseModel):
     comment_id: int
@@ -37,4 +37,10 @@ class CommentReplyResponse(CommentReplyBase):
     edited_at: str
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        from_attributes = True
+
+# Named fieldsets for the `fields=` parameter of comment list endpoints
+COMMENT_FIELD_PRESETS = {
+    "card": ("id", "task_id", "user_id", "created_at", "edited_at"),
+    "full": ("id", "task_id", "user_id", "content", "created_at", "edited_at"),
+}
@@ -0,0 +1,30 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from app.models.task import PriorityType, TaskStatus
+
+class TaskSearchHit(BaseModel):
+    id: int
+    title: str
+    status: TaskStatus
+    priority: PriorityType
+    category_id: Optional[int] = None
+    assignee_id: Optional[int] = None
+    labels: Optional[List[str]] = None
+    rank: float = Field(..., description="Relevance; higher is a better match")
+
+class TaskSearchResponse(BaseModel):
+    results: List[TaskSearchHit]
+    next_offset: Optional[int] = Field(None, description="Offset of the next page, None on the last page")
+
+class SearchHit(BaseModel):
+    type: Literal["task", "category", "comment", "reply"]
+    id: int
+    workspace_id: int
+    task_id: Optional[int] = Field(None, description="Task of a task, comment or reply hit")
+    title: str = Field(..., description="Task title, or the category name")
+    excerpt: Optional[str] = Field(None, description="Start of the description or comment text")
+    rank: float = Field(..., description="Relevance; higher is a better match")
+
+class SearchResponse(BaseModel):
+    results: List[SearchHit]
+    next_offset: Optional[int] = Field(None, description="Offset of the next page, None on the last page")
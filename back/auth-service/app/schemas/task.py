@@ -4,6 +4,7 @@ from datetime import datetime
 from app.models.task import PriorityType, TaskStatus
 
 class TaskCreate(BaseModel):
+    workspace_id: int = Field(..., gt=0, description="ID of the workspace the task is created in")
     title: str = Field(..., min_length=1, max_length=200, description="Task title")
     description: str = Field(..., min_length=1, max_length=2000, description="Task description")
     category_id: Optional[int] = Field(None, gt=0, description="Category ID for task organization")
@@ -93,4 +94,26 @@ class TaskResponse(BaseModel):
     blocked_by_dependencies: List[int] = Field(default=[], description="List of task IDs that block this task")
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Named fieldsets for the `fields=` parameter of task list endpoints
+TASK_FIELD_PRESETS = {
+    "card": ("id", "title", "status", "priority", "category_id", "assignee_id", "labels"),
+    "full": tuple(TaskResponse.model_fields),
+}
+
+
+class LabelCount(BaseModel):
+    label: str
+    count: int = Field(..., description="Number of tasks with the label")
+
+
+class TaskImportRowError(BaseModel):
+    row: int = Field(..., description="1-based data row number in the uploaded file")
+    errors: List[str] = Field(..., description="Validation or resolution errors for the row")
+
+
+class TaskImportResult(BaseModel):
+    created: int = Field(..., description="Number of tasks created")
+    failed: int = Field(..., description="Number of rows rejected")
+    errors: List[TaskImportRowError] = Field(default=[], description="Row-level errors (truncated to the first 1000)")
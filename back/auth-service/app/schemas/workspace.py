@@ -30,6 +30,12 @@ class WorkspaceUserResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class UserCandidate(BaseModel):
+    id: int = Field(..., description="User ID, as expected by the add-user endpoint")
+    username: str = Field(..., description="Username")
+    email: str = Field(..., description="User email")
+    is_member: bool = Field(..., description="Whether the user already belongs to the workspace")
+
 class WorkspaceResponse(WorkspaceBase):
     id: int
     created_at: datetime
@@ -0,0 +1,188 @@
+import enum
+import io
+from typing import Iterator, Optional
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from sqlalchemy import select, and_
+from app.models.comment import Comment, CommentReply
+from app.models.task import Task, TaskDependency
+from app.models.user import Role, user_roles
+from app.services.workspace_access import get_workspace_role
+
+ANALYTICS_TABLES = ("tasks", "dependencies", "comments", "replies")
+ANALYTICS_FORMATS = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+def _analytics_schema(table: str):
+    """Arrow schema for an analytics table; enums are dictionary encoded"""
+    import pyarrow as pa
+
+    timestamp = pa.timestamp("us", tz="UTC")
+    label = pa.dictionary(pa.int8(), pa.string())
+
+    if table == "tasks":
+        return pa.schema([
+            ("id", pa.int64()),
+            ("workspace_id", pa.int64()),
+            ("category_id", pa.int64()),
+            ("assignee_id", pa.int64()),
+            ("reporter_id", pa.int64()),
+            ("status", label),
+            ("priority", label),
+            ("title", pa.string()),
+            ("description", pa.string()),
+            ("story_points", pa.int32()),
+            ("labels", pa.list_(pa.string())),
+            ("created_at", timestamp),
+            ("updated_at", timestamp),
+        ])
+    if table == "dependencies":
+        return pa.schema([
+            ("id", pa.int64()),
+            ("workspace_id", pa.int64()),
+            ("blocking_task_id", pa.int64()),
+            ("blocked_task_id", pa.int64()),
+            ("dependency_type", label),
+            ("created_by_id", pa.int64()),
+            ("created_at", timestamp),
+        ])
+    if table == "comments":
+        return pa.schema([
+            ("id", pa.int64()),
+            ("workspace_id", pa.int64()),
+            ("task_id", pa.int64()),
+            ("user_id", pa.int64()),
+            ("content", pa.string()),
+            ("created_at", timestamp),
+            ("edited_at", timestamp),
+        ])
+    return pa.schema([
+        ("id", pa.int64()),
+        ("workspace_id", pa.int64()),
+        ("comment_id", pa.int64()),
+        ("user_id", pa.int64()),
+        ("content", pa.string()),
+        ("created_at", timestamp),
+        ("edited_at", timestamp),
+    ])
+
+
+class AnalyticsExportService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def resolve_workspace_scope(self, user_id: int, workspace_id: Optional[int]) -> Optional[int]:
+        """Verify export access; None means all workspaces and requires the admin role"""
+        if workspace_id is None:
+            is_admin = self.db.execute(
+                select(Role.id)
+                .join(user_roles, Role.id == user_roles.c.role_id)
+                .where(
+                    and_(
+                        user_roles.c.user_id == user_id,
+                        Role.name == "admin"
+                    )
+                )
+            ).first()
+            if not is_admin:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Admin role required to export all workspaces"
+                )
+            return None
+
+        user_role = get_workspace_role(self.db, workspace_id, user_id)
+        if not user_role:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied to workspace"
+            )
+        return workspace_id
+
+    def iter_table(self, table: str, workspace_id: Optional[int], export_format: str = "parquet", batch_size: int = 50_000) -> Iterator[bytes]:
+        """Stream one analytics table as Parquet or an Arrow IPC stream.
+
+        Each DB cursor chunk becomes one record batch (one Parquet row group)
+        which is written and drained from the sink before the next chunk is
+        fetched, so at most one batch is held in memory.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = _analytics_schema(table)
+        sink = io.BytesIO()
+        if export_format == "parquet":
+            writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        else:
+            writer = pa.ipc.new_stream(sink, schema)
+
+        # The writer and the server-side cursor are released even when the
+        # client disconnects and the generator is closed midway
+        result = None
+        try:
+            result = self.db.execute(
+                self._table_query(table, workspace_id).execution_options(yield_per=batch_size)
+            )
+            for partition in result.partitions():
+                columns = {
+                    name: [value.value if isinstance(value, enum.Enum) else value for value in values]
+                    for name, values in zip(schema.names, zip(*partition))
+                }
+                writer.write_batch(pa.RecordBatch.from_pydict(columns, schema=schema))
+                yield self._drain(sink)
+        finally:
+            if result is not None:
+                result.close()
+            writer.close()
+        yield self._drain(sink)
+
+    def _drain(self, sink: io.BytesIO) -> bytes:
+        data = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return data
+
+    def _table_query(self, table: str, workspace_id: Optional[int]):
+        """Build the query for a table; selected columns follow the Arrow schema order"""
+        if table == "tasks":
+            statement = select(
+                Task.id, Task.workspace_id, Task.category_id, Task.assignee_id, Task.reporter_id,
+                Task.status, Task.priority, Task.title, Task.description, Task.story_points,
+                Task.labels, Task.created_at, Task.updated_at
+            ).order_by(Task.id)
+        elif table == "dependencies":
+            statement = (
+                select(
+                    TaskDependency.id, Task.workspace_id, TaskDependency.blocking_task_id,
+                    TaskDependency.blocked_task_id, TaskDependency.dependency_type,
+                    TaskDependency.created_by_id, TaskDependency.created_at
+                )
+                .join(Task, Task.id == TaskDependency.blocked_task_id)
+                .order_by(TaskDependency.id)
+            )
+        elif table == "comments":
+            statement = (
+                select(
+                    Comment.id, Task.workspace_id, Comment.task_id, Comment.user_id,
+                    Comment.content, Comment.created_at, Comment.edited_at
+                )
+                .join(Task, Task.id == Comment.task_id)
+                .order_by(Comment.id)
+            )
+        else:
+            statement = (
+                select(
+                    CommentReply.id, Task.workspace_id, CommentReply.comment_id, CommentReply.user_id,
+                    CommentReply.content, CommentReply.created_at, CommentReply.edited_at
+                )
+                .join(Comment, Comment.id == CommentReply.comment_id)
+                .join(Task, Task.id == Comment.task_id)
+                .order_by(CommentReply.id)
+            )
+
+        if workspace_id is not None:
+            statement = statement.where(Task.workspace_id == workspace_id)
+        return statement
@@ -4,7 +4,9 @@ from sqlalchemy import select, update, delete
 from app.models.user import User
 from app.schemas.auth import UserCreate, UserLogin, Token, UserUpdate
 from app.core.security import create_access_token, verify_password, get_password_hash
+from app.core.tracing import traced
 
+@traced
 class AuthService:
     def __init__(self, db: Session):
         self.db = db
@@ -2,11 +2,31 @@ from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import select, update, delete, and_, func
 from app.models.category import Category
-from app.models.workspace import workspace_users, GroupRoleType
+from app.models.workspace import GroupRoleType
+from app.services.workspace_access import get_workspace_role
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
+from app.core.db import replica_read
+from app.core.tracing import traced
 from typing import List
 
 
+# Columns returned by list endpoints, matching the fields of CategoryResponse
+CATEGORY_LIST_COLUMNS = (
+    Category.id,
+    Category.workspace_id,
+    Category.name,
+    Category.description,
+    Category.color,
+    Category.position,
+    Category.is_archived,
+    Category.default_status,
+    Category.allowed_statuses,
+    Category.created_at,
+    Category.updated_at,
+)
+
+
+@traced
 class CategoryService:
     def __init__(self, db: Session):
         self.db = db
@@ -75,13 +95,14 @@ class CategoryService:
         
         return CategoryResponse.from_orm(category)
 
-    def get_workspace_categories(self, workspace_id: int, user_id: int) -> List[CategoryResponse]:
-        """Get all categories for a workspace"""
+    @replica_read
+    def get_workspace_categories(self, workspace_id: int, user_id: int) -> List[dict]:
+        """Get all categories for a workspace as plain row dicts shaped like CategoryResponse"""
         # Verify user has access to workspace
         self._verify_workspace_access(workspace_id, user_id)
         
         categories = self.db.execute(
-            select(Category)
+            select(*CATEGORY_LIST_COLUMNS)
             .where(
                 and_(
                     Category.workspace_id == workspace_id,
@@ -89,9 +110,9 @@ class CategoryService:
                 )
             )
             .order_by(Category.position)
-        ).scalars().all()
+        ).mappings().all()
         
-        return [CategoryResponse.from_orm(category) for category in categories]
+        return [dict(category) for category in categories]
 
     def update_category(self, category_id: int, category_data: CategoryUpdate, user_id: int) -> CategoryResponse:
         """Update a category"""
@@ -243,15 +264,7 @@ class CategoryService:
 
     def _verify_workspace_access(self, workspace_id: int, user_id: int):
         """Verify user has access to workspace"""
-        user_role = self.db.execute(
-            select(workspace_users.c.role)
-            .where(
-                and_(
-                    workspace_users.c.workspace_id == workspace_id,
-                    workspace_users.c.user_id == user_id
-                )
-            )
-        ).scalar_one_or_none()
+        user_role = get_workspace_role(self.db, workspace_id, user_id)
         
         if not user_role:
             raise HTTPException(
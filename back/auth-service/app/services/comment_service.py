@@ -2,9 +2,24 @@ from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import select, update, delete
 from app.models.comment import Comment, CommentReply
-from app.models.workspace import workspace_users, GroupRoleType
-from app.schemas.comment import CommentCreate, CommentUpdate, CommentReplyCreate, CommentReplyUpdate
-
+from app.models.task import Task
+from app.models.workspace import GroupRoleType
+from app.services.workspace_access import get_workspace_role
+from app.schemas.comment import CommentCreate, CommentUpdate, CommentReplyCreate, CommentReplyUpdate, COMMENT_FIELD_PRESETS
+from app.core.db import replica_read
+from app.core.tracing import traced
+
+# Columns returned by list endpoints, keyed by response field name
+COMMENT_COLUMNS_BY_FIELD = {
+    "id": Comment.id,
+    "task_id": Comment.task_id,
+    "user_id": Comment.user_id,
+    "content": Comment.content,
+    "created_at": Comment.created_at,
+    "edited_at": Comment.edited_at,
+}
+
+@traced
 class CommentService:
     def __init__(self, db: Session):
         self.db = db
@@ -18,13 +33,7 @@ class CommentService:
                 detail="Task not found"
             )
 
-        user_role = self.db.execute(
-            select(workspace_users.c.role)
-            .where(
-                workspace_users.c.workspace_id == task.workspace_id,
-                workspace_users.c.user_id == user_id
-            )
-        ).scalar_one_or_none()
+        user_role = get_workspace_role(self.db, task.workspace_id, user_id)
         if not user_role or user_role == GroupRoleType.viewer:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -51,7 +60,9 @@ class CommentService:
             )
         return comment
 
-    def get_task_comments(self, task_id: int, user_id: int) -> list[Comment]:
+    @replica_read
+    def get_task_comments(self, task_id: int, user_id: int, fields: tuple[str, ...] = COMMENT_FIELD_PRESETS["full"]) -> list[dict]:
+        """Get comments of a task as plain row dicts restricted to the requested fields"""
         task = self.db.execute(select(Task).where(Task.id == task_id)).scalar_one_or_none()
         if not task:
             raise HTTPException(
@@ -60,22 +71,21 @@ class CommentService:
             )
 
         # Verify user has access to workspace
-        user_role = self.db.execute(
-            select(workspace_users.c.role)
-            .where(
-                workspace_users.c.workspace_id == task.workspace_id,
-                workspace_users.c.user_id == user_id
-            )
-        ).scalar_one_or_none()
+        user_role = get_workspace_role(self.db, task.workspace_id, user_id)
         if not user_role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="User does not have access to this workspace"
             )
 
-        return self.db.execute(
-            select(Comment).where(Comment.task_id == task_id)
-        ).scalars().all()
+        # Only the requested columns are read, so card views never load content
+        columns = [COMMENT_COLUMNS_BY_FIELD[field] for field in fields]
+        rows = self.db.execute(
+            select(*columns)
+            .where(Comment.task_id == task_id)
+            .order_by(Comment.id)
+        ).mappings().all()
+        return [dict(row) for row in rows]
 
     def update_comment(self, comment_id: int, user_id: int, comment_data: CommentUpdate) -> Comment:
         comment = self.get_comment(comment_id)
@@ -104,13 +114,7 @@ class CommentService:
 
         # Verify user is comment owner or workspace admin
         task = self.db.execute(select(Task).where(Task.id == comment.task_id)).scalar_one_or_none()
-        user_role = self.db.execute(
-            select(workspace_users.c.role)
-            .where(
-                workspace_users.c.workspace_id == task.workspace_id,
-                workspace_users.c.user_id == user_id
-            )
-        ).scalar_one_or_none()
+        user_role = get_workspace_role(self.db, task.workspace_id, user_id)
         if comment.user_id != user_id and user_role != GroupRoleType.admin:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -127,13 +131,7 @@ class CommentService:
         task = self.db.execute(select(Task).where(Task.id == comment.task_id)).scalar_one_or_none()
 
         # Verify user has access to workspace and is not a viewer
-        user_role = self.db.execute(
-            select(workspace_users.c.role)
-            .where(
-                workspace_users.c.workspace_id == task.workspace_id,
-                workspace_users.c.user_id == user_id
-            )
-        ).scalar_one_or_none()
+        user_role = get_workspace_role(self.db, task.workspace_id, user_id)
         if not user_role or user_role == GroupRoleType.viewer:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -165,13 +163,7 @@ class CommentService:
         task = self.db.execute(select(Task).where(Task.id == comment.task_id)).scalar_one_or_none()
 
         # Verify user has access to workspace
-        user_role = self.db.execute(
-            select(workspace_users.c.role)
-            .where(
-                workspace_users.c.workspace_id == task.workspace_id,
-                workspace_users.c.user_id == user_id
-            )
-        ).scalar_one_or_none()
+        user_role = get_workspace_role(self.db, task.workspace_id, user_id)
         if not user_role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -210,13 +202,7 @@ class CommentService:
         task = self.db.execute(select(Task).where(Task.id == comment.task_id)).scalar_one_or_none()
 
         # Verify user is reply owner or workspace admin
-        user_role = self.db.execute(
-            select(workspace_users.c.role)
-            .where(
-                workspace_users.c.workspace_id == task.workspace_id,
-                workspace_users.c.user_id == user_id
-            )
-        ).scalar_one_or_none()
+        user_role = get_workspace_role(self.db, task.workspace_id, user_id)
         if reply.user_id != user_id and user_role != GroupRoleType.admin:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
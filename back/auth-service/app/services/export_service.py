@@ -0,0 +1,139 @@
+from typing import Iterator, Optional
+import orjson
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from sqlalchemy import select, and_, or_
+from app.models.category import Category
+from app.models.comment import Comment, CommentReply
+from app.models.task import Task, TaskDependency
+from app.models.workspace import Workspace
+from app.services.workspace_access import get_workspace_role
+from app.services.category_service import CATEGORY_LIST_COLUMNS
+from app.services.comment_service import COMMENT_COLUMNS_BY_FIELD
+from app.services.task_service import TASK_LIST_COLUMNS
+
+# Record types in the order they are written to an export
+EXPORT_SECTIONS = ("category", "task", "dependency", "comment", "reply")
+
+DEPENDENCY_EXPORT_COLUMNS = (
+    TaskDependency.id,
+    TaskDependency.blocking_task_id,
+    TaskDependency.blocked_task_id,
+    TaskDependency.dependency_type,
+    TaskDependency.created_at,
+    TaskDependency.created_by_id,
+)
+
+REPLY_EXPORT_COLUMNS = (
+    CommentReply.id,
+    CommentReply.comment_id,
+    CommentReply.user_id,
+    CommentReply.content,
+    CommentReply.created_at,
+    CommentReply.edited_at,
+)
+
+
+def parse_export_cursor(cursor: Optional[str]) -> tuple[int, int]:
+    """Parse a `section:last_id` cursor into (section index, last exported id)"""
+    if not cursor:
+        return 0, 0
+
+    section, _, last_id = cursor.partition(":")
+    if section not in EXPORT_SECTIONS or not last_id.isdigit():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid export cursor"
+        )
+    return EXPORT_SECTIONS.index(section), int(last_id)
+
+
+class ExportService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def verify_workspace_access(self, workspace_id: int, user_id: int):
+        """Verify the workspace exists and user is a member of it"""
+        workspace = self.db.execute(
+            select(Workspace.id).where(Workspace.id == workspace_id)
+        ).scalar_one_or_none()
+        if workspace is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Workspace not found"
+            )
+
+        user_role = get_workspace_role(self.db, workspace_id, user_id)
+        if not user_role:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied to workspace"
+            )
+        return user_role
+
+    def iter_workspace_ndjson(self, workspace_id: int, cursor: Optional[str] = None, batch_size: int = 1000) -> Iterator[bytes]:
+        """Stream a workspace as NDJSON records, one chunk per fetched batch.
+
+        Every record carries the cursor to resume after it. Rows are fetched
+        with `yield_per`, which uses a server-side cursor on Postgres, so memory
+        stays bounded by batch_size regardless of workspace size.
+        """
+        start_section, last_id = parse_export_cursor(cursor)
+
+        for section_index in range(start_section, len(EXPORT_SECTIONS)):
+            section = EXPORT_SECTIONS[section_index]
+            after_id = last_id if section_index == start_section else 0
+            statement = self._section_query(section, workspace_id, after_id)
+
+            result = self.db.execute(statement.execution_options(yield_per=batch_size))
+            for partition in result.mappings().partitions():
+                yield b"".join(
+                    orjson.dumps({"type": section, "cursor": f"{section}:{row['id']}", "data": dict(row)}) + b"\n"
+                    for row in partition
+                )
+
+        yield orjson.dumps({"type": "end", "cursor": None}) + b"\n"
+
+    def _section_query(self, section: str, workspace_id: int, after_id: int):
+        """Build the ordered keyset query for one export section"""
+        workspace_task_ids = select(Task.id).where(Task.workspace_id == workspace_id)
+
+        if section == "category":
+            return (
+                select(*CATEGORY_LIST_COLUMNS)
+                .where(and_(Category.workspace_id == workspace_id, Category.id > after_id))
+                .order_by(Category.id)
+            )
+        if section == "task":
+            return (
+                select(*TASK_LIST_COLUMNS)
+                .where(and_(Task.workspace_id == workspace_id, Task.id > after_id))
+                .order_by(Task.id)
+            )
+        if section == "dependency":
+            return (
+                select(*DEPENDENCY_EXPORT_COLUMNS)
+                .where(
+                    and_(
+                        or_(
+                            TaskDependency.blocking_task_id.in_(workspace_task_ids),
+                            TaskDependency.blocked_task_id.in_(workspace_task_ids)
+                        ),
+                        TaskDependency.id > after_id
+                    )
+                )
+                .order_by(TaskDependency.id)
+            )
+        if section == "comment":
+            return (
+                select(*COMMENT_COLUMNS_BY_FIELD.values())
+                .where(and_(Comment.task_id.in_(workspace_task_ids), Comment.id > after_id))
+                .order_by(Comment.id)
+            )
+
+        workspace_comment_ids = select(Comment.id).where(Comment.task_id.in_(workspace_task_ids))
+        return (
+            select(*REPLY_EXPORT_COLUMNS)
+            .where(and_(CommentReply.comment_id.in_(workspace_comment_ids), CommentReply.id > after_id))
+            .order_by(CommentReply.id)
+        )
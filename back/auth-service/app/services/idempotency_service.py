@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, update, delete
+from sqlalchemy.exc import IntegrityError
+from app.models.idempotency import IdempotencyKey
+from app.core.config import settings
+from app.core.tracing import traced
+
+@traced
+class IdempotencyService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def claim(self, user_id: int, key: str, request_hash: str) -> Optional[IdempotencyKey]:
+        """Reserve the key for a new request, or return the finished earlier one to replay.
+
+        Returns None when the caller owns the key and should run the request.
+        """
+        now = datetime.utcnow()
+        # An expired response or an abandoned lock no longer holds the key
+        self.db.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key, IdempotencyKey.expires_at <= now)
+        )
+        try:
+            self.db.execute(insert(IdempotencyKey).values(
+                user_id=user_id,
+                key=key,
+                request_hash=request_hash,
+                created_at=now,
+                expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS)
+            ))
+            self.db.commit()
+            return None
+        except IntegrityError:
+            self.db.rollback()
+
+        record = self.db.execute(
+            select(IdempotencyKey).where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+        ).scalar_one_or_none()
+        if record is None:
+            # The other request failed and released the key in the meantime
+            return self.claim(user_id, key, request_hash)
+        if record.request_hash != request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different request"
+            )
+        if record.status_code is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still being processed",
+                headers={"Retry-After": "1"}
+            )
+        return record
+
+    def complete(self, user_id: int, key: str, status_code: int, content_type: Optional[str], body: bytes):
+        """Store the response and keep it for IDEMPOTENCY_TTL_SECONDS"""
+        self.db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+            .values(
+                status_code=status_code,
+                content_type=content_type,
+                response_body=body,
+                expires_at=datetime.utcnow() + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+            )
+        )
+        self.db.commit()
+
+    def release(self, user_id: int, key: str):
+        """Drop the lock of a request that failed, so a retry runs it again"""
+        self.db.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key, IdempotencyKey.status_code.is_(None))
+        )
+        self.db.commit()
+
+    def purge_expired(self) -> int:
+        result = self.db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.utcnow()))
+        self.db.commit()
+        return result.rowcount
@@ -0,0 +1,214 @@
+import re
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func, literal, literal_column, union_all, Integer
+from app.models.category import Category
+from app.models.comment import Comment, CommentReply
+from app.models.search import SEARCH_CONFIG
+from app.models.task import Task
+from app.models.workspace import workspace_users
+from app.services.workspace_access import get_workspace_role
+from app.services.task_service import TASK_COLUMNS_BY_FIELD
+from app.schemas.task import TASK_FIELD_PRESETS
+from app.core.db import replica_read
+from app.core.tracing import traced
+
+# Columns of a search hit: the card fieldset, ranked by relevance
+SEARCH_HIT_COLUMNS = tuple(TASK_COLUMNS_BY_FIELD[field] for field in TASK_FIELD_PRESETS["card"])
+
+# Entity types covered by the cross-workspace search
+SEARCH_ENTITY_TYPES = ("task", "category", "comment", "reply")
+
+# Characters of the matched text returned with each cross-entity hit
+EXCERPT_LENGTH = 200
+
+_TERM = re.compile(r"\w+")
+
+
+def _terms(query: str) -> list[str]:
+    return _TERM.findall(query.lower())
+
+
+def _occurrences(text, term: str):
+    return (func.length(text) - func.length(func.replace(text, term, ""))) / len(term)
+
+
+def _rank_sql(document, lead, terms: list[str]):
+    """Term occurrences in the document, with occurrences in its leading text counting extra"""
+    lead = func.coalesce(func.lower(lead), "")
+    return sum(_occurrences(document, term) + 2 * _occurrences(lead, term) for term in terms)
+
+
+@traced
+class SearchService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _uses_tsvector(self) -> bool:
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    @staticmethod
+    def _tsquery(query: str):
+        # websearch syntax: quoted phrases, `or` and `-excluded` terms
+        return func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), query)
+
+    @replica_read
+    def search_workspace_tasks(self, workspace_id: int, user_id: int, query: str, limit: int, offset: int) -> dict:
+        """Tasks of a workspace matching `query`, best matches first.
+
+        Returns one page of hits and the offset of the next page, or None on the
+        last page. Counting every match is skipped on purpose: one extra row
+        tells whether another page exists.
+        """
+        # Verify user has access to workspace
+        user_role = get_workspace_role(self.db, workspace_id, user_id)
+        if not user_role:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="User does not have access to this workspace"
+            )
+
+        if self._uses_tsvector():
+            hits = self._search_tasks_tsvector(workspace_id, query, limit + 1, offset)
+        else:
+            hits = self._search_tasks_without_tsvector(workspace_id, query, limit + 1, offset)
+
+        return {
+            "results": hits[:limit],
+            "next_offset": offset + limit if len(hits) > limit else None,
+        }
+
+    def _search_tasks_tsvector(self, workspace_id: int, query: str, limit: int, offset: int) -> list[dict]:
+        # The match runs on the GIN index of the generated search_vector column
+        tsquery = self._tsquery(query)
+        rank = func.ts_rank(Task.search_vector, tsquery)
+        rows = self.db.execute(
+            select(*SEARCH_HIT_COLUMNS, rank.label("rank"))
+            .where(Task.workspace_id == workspace_id, Task.search_vector.bool_op("@@")(tsquery))
+            .order_by(rank.desc(), Task.id)
+            .limit(limit)
+            .offset(offset)
+        ).mappings().all()
+        return [dict(row) for row in rows]
+
+    def _search_tasks_without_tsvector(self, workspace_id: int, query: str, limit: int, offset: int) -> list[dict]:
+        """Fallback for databases without tsvector (SQLite in tests and benchmarks).
+
+        Every term must appear in the lowercased search document; hits are ranked
+        by term occurrences, with occurrences in the title counting extra. Matching
+        is a scan of the workspace's tasks, but ranking, ordering and paging run in
+        SQL so only one page of rows is returned.
+        """
+        terms = _terms(query)
+        if not terms:
+            return []
+
+        rank = _rank_sql(Task.search_vector, Task.title, terms)
+        rows = self.db.execute(
+            select(*SEARCH_HIT_COLUMNS, rank.label("rank"))
+            .where(Task.workspace_id == workspace_id, *(func.instr(Task.search_vector, term) > 0 for term in terms))
+            .order_by(rank.desc(), Task.id)
+            .limit(limit)
+            .offset(offset)
+        ).mappings().all()
+        return [dict(row) for row in rows]
+
+    @replica_read
+    def search(self, user_id: int, query: str, types: tuple[str, ...], limit: int, offset: int) -> dict:
+        """Tasks, categories, comments and replies matching `query` in every workspace of the user.
+
+        Membership is part of the SQL: each entity's match is restricted to the
+        user's workspaces by a subquery, so no rows of other workspaces are
+        read, ranked or paginated. Each entity type keeps only its best
+        offset + limit + 1 hits before they are merged, so the page is picked from
+        a bounded number of rows. Paging works like search_workspace_tasks.
+        """
+        terms = None if self._uses_tsvector() else _terms(query)
+        if terms == []:
+            return {"results": [], "next_offset": None}
+
+        member_workspaces = select(workspace_users.c.workspace_id).where(workspace_users.c.user_id == user_id)
+        branches = []
+        for entity_type in types:
+            statement, search_vector, lead = self._search_branch(entity_type)
+            statement = statement.where(self._workspace_column(entity_type).in_(member_workspaces))
+            if terms is None:
+                tsquery = self._tsquery(query)
+                rank = func.ts_rank(search_vector, tsquery)
+                statement = statement.where(search_vector.bool_op("@@")(tsquery))
+            else:
+                rank = _rank_sql(search_vector, lead, terms)
+                statement = statement.where(*(func.instr(search_vector, term) > 0 for term in terms))
+            # SQLite rejects ORDER BY/LIMIT on a compound member, hence the subquery
+            best = (
+                statement.add_columns(rank.label("rank"))
+                .order_by(rank.desc(), statement.selected_columns.id)
+                .limit(offset + limit + 1)
+                .subquery()
+            )
+            branches.append(select(*best.c))
+
+        hits = union_all(*branches).subquery()
+        rows = self.db.execute(
+            select(hits)
+            .order_by(hits.c.rank.desc(), hits.c.type, hits.c.id)
+            .limit(limit + 1)
+            .offset(offset)
+        ).mappings().all()
+        results = [dict(row) for row in rows]
+
+        return {
+            "results": results[:limit],
+            "next_offset": offset + limit if len(results) > limit else None,
+        }
+
+    @staticmethod
+    def _workspace_column(entity_type: str):
+        return Category.workspace_id if entity_type == "category" else Task.workspace_id
+
+    @staticmethod
+    def _search_branch(entity_type: str):
+        """Select of one entity type shaped like a search hit, with its search vector and leading text.
+
+        Comments and replies are located through their task, which also gives
+        them a title and their workspace.
+        """
+        if entity_type == "task":
+            statement = select(
+                literal("task").label("type"),
+                Task.id,
+                Task.workspace_id,
+                Task.id.label("task_id"),
+                Task.title.label("title"),
+                func.substr(Task.description, 1, EXCERPT_LENGTH).label("excerpt"),
+            )
+            return statement, Task.search_vector, Task.title
+        if entity_type == "category":
+            statement = select(
+                literal("category").label("type"),
+                Category.id,
+                Category.workspace_id,
+                literal(None, Integer).label("task_id"),
+                Category.name.label("title"),
+                func.substr(Category.description, 1, EXCERPT_LENGTH).label("excerpt"),
+            ).where(Category.is_archived == False)
+            return statement, Category.search_vector, Category.name
+        if entity_type == "comment":
+            statement = select(
+                literal("comment").label("type"),
+                Comment.id,
+                Task.workspace_id,
+                Task.id.label("task_id"),
+                Task.title.label("title"),
+                func.substr(Comment.content, 1, EXCERPT_LENGTH).label("excerpt"),
+            ).join(Task, Comment.task_id == Task.id)
+            return statement, Comment.search_vector, Comment.content
+        statement = select(
+            literal("reply").label("type"),
+            CommentReply.id,
+            Task.workspace_id,
+            Task.id.label("task_id"),
+            Task.title.label("title"),
+            func.substr(CommentReply.content, 1, EXCERPT_LENGTH).label("excerpt"),
+        ).join(Comment, CommentReply.comment_id == Comment.id).join(Task, Comment.task_id == Task.id)
+        return statement, CommentReply.search_vector, CommentReply.content
@@ -2,7 +2,7 @@ from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import select, delete, and_
 from app.models.task import Task, TaskDependency, TaskStatus
-from app.models.workspace import workspace_users
+from app.services.workspace_access import get_workspace_role
 from app.schemas.dependency import (
     DependencyCreate, 
     DependencyResponse, 
@@ -11,8 +11,10 @@ from app.schemas.dependency import (
     TaskDependencySummary
 )
 from typing import List, Set
+from app.core.tracing import traced
 
 
+@traced
 class TaskDependencyService:
     def __init__(self, db: Session):
         self.db = db
@@ -230,15 +232,7 @@ class TaskDependencyService:
             )
         
         # Verify user has access to workspace
-        user_role = self.db.execute(
-            select(workspace_users.c.role)
-            .where(
-                and_(
-                    workspace_users.c.workspace_id == task.workspace_id,
-                    workspace_users.c.user_id == user_id
-                )
-            )
-        ).scalar_one_or_none()
+        user_role = get_workspace_role(self.db, task.workspace_id, user_id)
         
         if not user_role:
             raise HTTPException(
@@ -0,0 +1,266 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import IO, Iterator, Optional
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, and_
+from app.models.category import Category
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+from app.models.workspace import workspace_users, GroupRoleType
+from app.services.workspace_access import get_workspace_role
+from app.services.task_service import TaskService
+from app.schemas.task import TaskCreate, TaskImportResult, TaskImportRowError
+
+# Columns written for every imported task, in COPY order
+IMPORT_COLUMNS = (
+    "workspace_id", "category_id", "assignee_id", "reporter_id", "priority", "status",
+    "title", "description", "story_points", "labels", "created_at", "updated_at",
+)
+MAX_REPORTED_ERRORS = 1000
+# Per-transaction table a COPY chunk is staged in before it is moved into tasks
+IMPORT_STAGE_TABLE = "task_import_stage"
+
+
+class TaskImportService:
+    def __init__(self, db: Session):
+        self.db = db
+        self._category_ids: dict[str, Optional[int]] = {}
+        self._workspace_category_ids: set[int] = set()
+        self._assignee_ids: dict[str, Optional[int]] = {}
+        self._member_ids: set[int] = set()
+
+    def import_tasks(self, workspace_id: int, source: IO[bytes], file_format: str, user_id: int, chunk_size: int = 5000) -> TaskImportResult:
+        """Import tasks from a CSV or NDJSON file into a workspace.
+
+        Rows are parsed and validated against TaskCreate as they are read, and
+        category/assignee names are resolved with one lookup per chunk. Each
+        valid chunk is loaded with COPY on Postgres (psycopg2) or a multi-row
+        INSERT elsewhere, then committed. Invalid rows are skipped and reported.
+        """
+        user_role = get_workspace_role(self.db, workspace_id, user_id)
+        if not user_role or user_role == GroupRoleType.viewer:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="User does not have permission to create tasks in this workspace"
+            )
+
+        created = 0
+        errors: list[TaskImportRowError] = []
+        failed = 0
+        chunk: list[tuple[int, dict]] = []
+
+        def record_error(row_number: int, messages: list[str]):
+            nonlocal failed
+            failed += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append(TaskImportRowError(row=row_number, errors=messages))
+
+        for row_number, raw in enumerate(self._iter_rows(source, file_format), start=1):
+            parsed = self._validate_row(workspace_id, raw)
+            if isinstance(parsed, list):
+                record_error(row_number, parsed)
+                continue
+            chunk.append((row_number, parsed))
+
+            if len(chunk) >= chunk_size:
+                created += self._load_chunk(workspace_id, user_id, chunk, record_error)
+                chunk = []
+
+        if chunk:
+            created += self._load_chunk(workspace_id, user_id, chunk, record_error)
+
+        errors.sort(key=lambda error: error.row)
+        return TaskImportResult(created=created, failed=failed, errors=errors)
+
+    def _iter_rows(self, source: IO[bytes], file_format: str) -> Iterator[dict]:
+        text = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+        if file_format == "csv":
+            yield from csv.DictReader(text)
+        elif file_format == "ndjson":
+            for line in text:
+                if line.strip():
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        row = None
+                    yield row if isinstance(row, dict) else {"__invalid__": line}
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Import format must be csv or ndjson"
+            )
+
+    def _validate_row(self, workspace_id: int, raw: dict):
+        """Validate one input row; returns the parsed row or a list of error messages"""
+        if "__invalid__" in raw:
+            return ["Row is not a JSON object"]
+
+        row = {key: value for key, value in raw.items() if value not in (None, "")}
+        # Every row goes to the workspace of the import, whatever the file says
+        row["workspace_id"] = workspace_id
+        labels = row.get("labels")
+        if isinstance(labels, str):
+            row["labels"] = [label.strip() for label in labels.split(";") if label.strip()]
+
+        messages = []
+        try:
+            task = TaskCreate(**row)
+        except ValidationError as e:
+            messages.extend(f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors())
+            task = None
+
+        task_status = TaskStatus.open
+        if "status" in row:
+            try:
+                task_status = TaskStatus(row["status"])
+            except ValueError:
+                messages.append(f"status: must be one of {[s.value for s in TaskStatus]}")
+
+        if messages:
+            return messages
+
+        return {
+            "task": task,
+            "status": task_status,
+            "category": row.get("category"),
+            "assignee": row.get("assignee"),
+        }
+
+    def _resolve_names(self, workspace_id: int, chunk: list[tuple[int, dict]]):
+        """Batch-resolve category names and ids, assignee usernames and assignee ids for a chunk"""
+        category_names = {row["category"] for _, row in chunk if row["category"]} - self._category_ids.keys()
+        category_ids = {
+            row["task"].category_id for _, row in chunk if row["task"].category_id and not row["category"]
+        } - self._workspace_category_ids
+        if category_names or category_ids:
+            self._category_ids.update(dict.fromkeys(category_names))
+            categories = self.db.execute(
+                select(Category.name, Category.id, Category.is_archived)
+                .where(
+                    and_(
+                        Category.workspace_id == workspace_id,
+                        Category.name.in_(category_names) | Category.id.in_(category_ids)
+                    )
+                )
+            ).all()
+            for name, category_id, is_archived in categories:
+                # Like update_task_category, an explicit id only has to be in the workspace
+                self._workspace_category_ids.add(category_id)
+                if name in category_names and not is_archived:
+                    self._category_ids[name] = category_id
+
+        usernames = {row["assignee"] for _, row in chunk if row["assignee"]} - self._assignee_ids.keys()
+        assignee_ids = {row["task"].assignee_id for _, row in chunk if row["task"].assignee_id} - self._member_ids
+        if usernames or assignee_ids:
+            self._assignee_ids.update(dict.fromkeys(usernames))
+            members = self.db.execute(
+                select(User.username, User.id)
+                .join(workspace_users, User.id == workspace_users.c.user_id)
+                .where(
+                    and_(
+                        workspace_users.c.workspace_id == workspace_id,
+                        User.username.in_(usernames) | User.id.in_(assignee_ids)
+                    )
+                )
+            ).all()
+            for username, member_id in members:
+                self._member_ids.add(member_id)
+                if username in usernames:
+                    self._assignee_ids[username] = member_id
+
+    def _load_chunk(self, workspace_id: int, user_id: int, chunk: list[tuple[int, dict]], record_error) -> int:
+        self._resolve_names(workspace_id, chunk)
+
+        now = datetime.utcnow()
+        rows = []
+        for row_number, row in chunk:
+            task = row["task"]
+            messages = []
+
+            category_id = task.category_id
+            if row["category"]:
+                category_id = self._category_ids.get(row["category"])
+                if category_id is None:
+                    messages.append(f"category: unknown category '{row['category']}'")
+            elif category_id and category_id not in self._workspace_category_ids:
+                messages.append(f"category_id: category {category_id} does not belong to this workspace")
+
+            assignee_id = task.assignee_id
+            if row["assignee"]:
+                assignee_id = self._assignee_ids.get(row["assignee"])
+                if assignee_id is None:
+                    messages.append(f"assignee: '{row['assignee']}' is not a member of this workspace")
+            elif assignee_id and assignee_id not in self._member_ids:
+                messages.append(f"assignee_id: user {assignee_id} is not a member of this workspace")
+
+            if messages:
+                record_error(row_number, messages)
+                continue
+
+            rows.append({
+                "workspace_id": workspace_id,
+                "category_id": category_id,
+                "assignee_id": assignee_id,
+                "reporter_id": user_id,
+                "priority": task.priority,
+                "status": row["status"],
+                "title": task.title,
+                "description": task.description,
+                "story_points": task.story_points,
+                "labels": task.labels,
+                "created_at": now,
+                "updated_at": now,
+            })
+
+        if not rows:
+            return 0
+
+        connection = self.db.connection()
+        if connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg2":
+            created = self._copy_rows(connection, rows)
+        else:
+            created = self.db.execute(insert(Task).returning(Task.id, Task.labels), rows).all()
+        TaskService(self.db).index_task_labels(
+            (task_id, workspace_id, labels) for task_id, labels in created if labels
+        )
+        self.db.commit()
+        return len(rows)
+
+    def _copy_rows(self, connection, rows: list[dict]) -> list:
+        """Load rows with COPY ... FROM STDIN through the raw psycopg2 connection.
+
+        COPY reports no ids, so the rows are copied into a temporary staging
+        table and moved into tasks with one INSERT ... SELECT ... RETURNING,
+        which gives the (id, labels) of exactly the tasks created.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([
+                "" if row[column] is None
+                else row[column].name if column in ("priority", "status")
+                else json.dumps(row[column]) if column == "labels"
+                else row[column].isoformat() if isinstance(row[column], datetime)
+                else row[column]
+                for column in IMPORT_COLUMNS
+            ])
+        buffer.seek(0)
+
+        columns = ", ".join(IMPORT_COLUMNS)
+        connection.exec_driver_sql(
+            f"CREATE TEMP TABLE {IMPORT_STAGE_TABLE} ON COMMIT DROP AS "
+            f"SELECT {columns} FROM {Task.__tablename__} WITH NO DATA"
+        )
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {IMPORT_STAGE_TABLE} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+        finally:
+            cursor.close()
+        return connection.exec_driver_sql(
+            f"INSERT INTO {Task.__tablename__} ({columns}) SELECT {columns} FROM {IMPORT_STAGE_TABLE} "
+            f"RETURNING id, labels"
+        ).all()
@@ -1,24 +1,42 @@
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import select, update, delete, and_
-from app.models.task import Task, PriorityType, TaskStatus, TaskDependency
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import select, update, delete, insert, and_, or_, func
+from typing import Iterable, Optional
+from app.models.task import Task, PriorityType, TaskStatus, TaskDependency, TaskLabel
 from app.models.category import Category
-from app.models.workspace import workspace_users, GroupRoleType, Workspace
-from app.schemas.task import TaskCreate, TaskUpdate, TaskStatusUpdate, TaskWorkspaceMove
+from app.models.workspace import GroupRoleType, Workspace
+from app.services.workspace_access import get_workspace_role
+from app.schemas.task import TaskCreate, TaskUpdate, TaskStatusUpdate, TaskWorkspaceMove, TASK_FIELD_PRESETS
+from app.core.db import replica_read
+from app.core.tracing import traced
 
+# Columns returned by list endpoints, matching the fields of TaskResponse
+TASK_LIST_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.priority,
+    Task.workspace_id,
+    Task.category_id,
+    Task.assignee_id,
+    Task.reporter_id,
+    Task.story_points,
+    Task.labels,
+    Task.created_at,
+    Task.updated_at,
+)
+TASK_COLUMNS_BY_FIELD = {column.key: column for column in TASK_LIST_COLUMNS}
+
+@traced
 class TaskService:
     def __init__(self, db: Session):
         self.db = db
 
     def create_task(self, task_data: TaskCreate, user_id: int) -> Task:
         # Verify user has access to workspace and is not a viewer
-        user_role = self.db.execute(
-            select(workspace_users.c.role)
-            .where(
-                workspace_users.c.workspace_id == task_data.workspace_id,
-                workspace_users.c.user_id == user_id
-            )
-        ).scalar_one_or_none()
+        user_role = get_workspace_role(self.db, task_data.workspace_id, user_id)
         if not user_role or user_role == GroupRoleType.viewer:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -28,12 +46,24 @@ class TaskService:
         # Create new task
         new_task = Task(
             workspace_id=task_data.workspace_id,
+            category_id=task_data.category_id,
+            assignee_id=task_data.assignee_id,
+            reporter_id=user_id,
+            title=task_data.title,
             priority=task_data.priority,
-            description=task_data.description
+            description=task_data.description,
+            story_points=task_data.story_points,
+            labels=task_data.labels
         )
         self.db.add(new_task)
+        # Flush for the id so the labels are indexed in the same transaction
+        self.db.flush()
+        self.index_task_labels([(new_task.id, new_task.workspace_id, task_data.labels)])
         self.db.commit()
         self.db.refresh(new_task)
+        # A new task has no dependencies; saying so spares the response two lazy loads
+        set_committed_value(new_task, "blocking_dependencies", [])
+        set_committed_value(new_task, "blocked_by_dependencies", [])
         return new_task
 
     def get_task(self, task_id: int) -> Task:
@@ -45,36 +75,46 @@ class TaskService:
             )
         return task
 
-    def get_workspace_tasks(self, workspace_id: int, user_id: int) -> list[Task]:
+    @replica_read
+    def get_workspace_tasks(self, workspace_id: int, user_id: int, fields: tuple[str, ...] = TASK_FIELD_PRESETS["full"], label: Optional[str] = None) -> list[dict]:
+        """Get all tasks of a workspace, or those with `label`, as plain row dicts restricted to the requested fields"""
         # Verify user has access to workspace
-        user_role = self.db.execute(
-            select(workspace_users.c.role)
-            .where(
-                workspace_users.c.workspace_id == workspace_id,
-                workspace_users.c.user_id == user_id
-            )
-        ).scalar_one_or_none()
+        user_role = get_workspace_role(self.db, workspace_id, user_id)
         if not user_role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="User does not have access to this workspace"
             )
 
-        return self.db.execute(
-            select(Task).where(Task.workspace_id == workspace_id)
-        ).scalars().all()
+        # Select plain columns instead of ORM entities so no identity map or
+        # attribute instrumentation is built for each row. Only the requested
+        # columns are read, so card views never touch description.
+        columns = [TASK_COLUMNS_BY_FIELD[field] for field in fields if field in TASK_COLUMNS_BY_FIELD]
+        statement = select(*columns).where(Task.workspace_id == workspace_id).order_by(Task.id)
+        if label is not None:
+            # Resolved on the (workspace_id, label) index of task_labels
+            statement = statement.where(
+                Task.id.in_(
+                    select(TaskLabel.task_id)
+                    .where(TaskLabel.workspace_id == workspace_id, TaskLabel.label == label.strip())
+                )
+            )
+        rows = self.db.execute(statement).mappings().all()
+
+        tasks = [dict(row) for row in rows]
+        self._attach_dependency_ids(
+            workspace_id,
+            tasks,
+            blocking="blocking_dependencies" in fields,
+            blocked_by="blocked_by_dependencies" in fields
+        )
+        return tasks
 
     def update_task(self, task_id: int, user_id: int, task_data: TaskUpdate) -> Task:
         task = self.get_task(task_id)
 
         # Verify user has access to workspace and is not a viewer
-        user_role = self.db.execute(
-            select(workspace_users.c.role)
-            .where(
-                workspace_users.c.workspace_id == task.workspace_id,
-                workspace_users.c.user_id == user_id
-            )
-        ).scalar_one_or_none()
+        user_role = get_workspace_role(self.db, task.workspace_id, user_id)
         if not user_role or user_role == GroupRoleType.viewer:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -86,12 +126,16 @@ class TaskService:
             update_data["priority"] = task_data.priority
         if task_data.description:
             update_data["description"] = task_data.description
+        if task_data.labels is not None:
+            update_data["labels"] = task_data.labels
 
         self.db.execute(
             update(Task)
             .where(Task.id == task_id)
             .values(**update_data)
         )
+        if task_data.labels is not None:
+            self.replace_task_labels(task_id, task.workspace_id, task_data.labels)
         self.db.commit()
         return self.get_task(task_id)
 
@@ -99,13 +143,7 @@ class TaskService:
         task = self.get_task(task_id)
 
         # Verify user is admin
-        user_role = self.db.execute(
-            select(workspace_users.c.role)
-            .where(
-                workspace_users.c.workspace_id == task.workspace_id,
-                workspace_users.c.user_id == user_id
-            )
-        ).scalar_one_or_none()
+        user_role = get_workspace_role(self.db, task.workspace_id, user_id)
         if user_role != GroupRoleType.admin:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -220,15 +258,7 @@ class TaskService:
         task = self.get_task(task_id)
         
         # Verify user has admin access to source workspace
-        source_user_role = self.db.execute(
-            select(workspace_users.c.role)
-            .where(
-                and_(
-                    workspace_users.c.workspace_id == task.workspace_id,
-                    workspace_users.c.user_id == user_id
-                )
-            )
-        ).scalar_one_or_none()
+        source_user_role = get_workspace_role(self.db, task.workspace_id, user_id)
         
         if source_user_role != GroupRoleType.admin:
             raise HTTPException(
@@ -237,15 +267,7 @@ class TaskService:
             )
         
         # Verify user has access to target workspace
-        target_user_role = self.db.execute(
-            select(workspace_users.c.role)
-            .where(
-                and_(
-                    workspace_users.c.workspace_id == workspace_move.workspace_id,
-                    workspace_users.c.user_id == user_id
-                )
-            )
-        ).scalar_one_or_none()
+        target_user_role = get_workspace_role(self.db, workspace_move.workspace_id, user_id)
         
         if not target_user_role or target_user_role == GroupRoleType.viewer:
             raise HTTPException(
@@ -291,21 +313,115 @@ class TaskService:
                 category_id=None  # Clear category since it belongs to old workspace
             )
         )
+        self.db.execute(
+            update(TaskLabel)
+            .where(TaskLabel.task_id == task_id)
+            .values(workspace_id=workspace_move.workspace_id)
+        )
         self.db.commit()
         
         return self.get_task(task_id)
 
-    def _verify_task_access(self, task: Task, user_id: int, allow_viewer: bool = True):
-        """Verify user has access to task's workspace"""
-        user_role = self.db.execute(
-            select(workspace_users.c.role)
+    @replica_read
+    def get_label_counts(self, workspace_id: int, user_id: int, category_id: Optional[int] = None) -> list[dict]:
+        """Number of tasks per label in a workspace, or in one of its categories, most used first"""
+        # Verify user has access to workspace
+        user_role = get_workspace_role(self.db, workspace_id, user_id)
+        if not user_role:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="User does not have access to this workspace"
+            )
+
+        task_count = func.count(TaskLabel.task_id)
+        statement = (
+            select(TaskLabel.label, task_count.label("count"))
+            .where(TaskLabel.workspace_id == workspace_id)
+            .group_by(TaskLabel.label)
+            .order_by(task_count.desc(), TaskLabel.label)
+        )
+        if category_id is not None:
+            statement = statement.join(Task, TaskLabel.task_id == Task.id).where(Task.category_id == category_id)
+        return [dict(row) for row in self.db.execute(statement).mappings().all()]
+
+    def replace_task_labels(self, task_id: int, workspace_id: int, labels: Iterable[str]):
+        """Make the task_labels rows of a task match `labels`; the caller commits"""
+        self.db.execute(delete(TaskLabel).where(TaskLabel.task_id == task_id))
+        self.index_task_labels([(task_id, workspace_id, labels)])
+
+    def index_task_labels(self, tasks: Iterable[tuple[int, int, Optional[Iterable[str]]]]):
+        """Insert task_labels rows for new (task_id, workspace_id, labels) tuples; the caller commits"""
+        rows = [
+            {"task_id": task_id, "workspace_id": workspace_id, "label": label}
+            for task_id, workspace_id, labels in tasks
+            for label in dict.fromkeys(label.strip() for label in labels or () if label.strip())
+        ]
+        if rows:
+            self.db.execute(insert(TaskLabel), rows)
+
+    def backfill_task_labels(self, batch_size: int = 1000) -> int:
+        """Index the labels of tasks that have labels but no task_labels rows.
+
+        For tasks written before task_labels existed, or by code that did not
+        index them. Runs in batches of `batch_size` tasks, each committed on its
+        own, and returns the number of tasks indexed.
+        """
+        indexed = 0
+        last_id = 0
+        while True:
+            batch = self.db.execute(
+                select(Task.id, Task.workspace_id, Task.labels)
+                .where(
+                    Task.id > last_id,
+                    Task.labels.isnot(None),
+                    ~select(TaskLabel.task_id).where(TaskLabel.task_id == Task.id).exists()
+                )
+                .order_by(Task.id)
+                .limit(batch_size)
+            ).all()
+            if not batch:
+                return indexed
+            self.index_task_labels(batch)
+            self.db.commit()
+            indexed += sum(1 for _, _, labels in batch if labels)
+            last_id = batch[-1].id
+
+    def _attach_dependency_ids(self, workspace_id: int, tasks: list[dict], blocking: bool = True, blocked_by: bool = True):
+        """Fill blocking/blocked-by task id lists for the given task rows with one query"""
+        if not blocking and not blocked_by:
+            return
+
+        tasks_by_id = {}
+        for task in tasks:
+            if blocking:
+                task["blocking_dependencies"] = []
+            if blocked_by:
+                task["blocked_by_dependencies"] = []
+            tasks_by_id[task["id"]] = task
+
+        if not tasks_by_id:
+            return
+
+        workspace_task_ids = select(Task.id).where(Task.workspace_id == workspace_id)
+        dependencies = self.db.execute(
+            select(TaskDependency.blocking_task_id, TaskDependency.blocked_task_id)
             .where(
-                and_(
-                    workspace_users.c.workspace_id == task.workspace_id,
-                    workspace_users.c.user_id == user_id
+                or_(
+                    TaskDependency.blocking_task_id.in_(workspace_task_ids),
+                    TaskDependency.blocked_task_id.in_(workspace_task_ids)
                 )
             )
-        ).scalar_one_or_none()
+        ).all()
+
+        for blocking_task_id, blocked_task_id in dependencies:
+            if blocking and blocking_task_id in tasks_by_id:
+                tasks_by_id[blocking_task_id]["blocking_dependencies"].append(blocked_task_id)
+            if blocked_by and blocked_task_id in tasks_by_id:
+                tasks_by_id[blocked_task_id]["blocked_by_dependencies"].append(blocking_task_id)
+
+    def _verify_task_access(self, task: Task, user_id: int, allow_viewer: bool = True):
+        """Verify user has access to task's workspace"""
+        user_role = get_workspace_role(self.db, task.workspace_id, user_id)
         
         if not user_role:
             raise HTTPException(
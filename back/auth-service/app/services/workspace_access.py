@@ -0,0 +1,52 @@
+from typing import Optional
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from app.models.user import User
+from app.models.workspace import Workspace, workspace_users, GroupRoleType
+
+# Tables whose writes can add, change or remove memberships (deletes cascade)
+_MEMBERSHIP_TABLES = (workspace_users, Workspace.__table__, User.__table__)
+
+
+def get_workspace_role(db: Session, workspace_id: int, user_id: int) -> Optional[GroupRoleType]:
+    """Role of a user in a workspace, or None for non-members.
+
+    Lookups are cached on the session until it commits or rolls back, or until
+    it writes memberships itself, so the sub-requests of a batch sharing one
+    session check each membership once.
+    """
+    roles = db.info.setdefault("workspace_roles", {})
+    key = (workspace_id, user_id)
+    if key not in roles:
+        roles[key] = db.execute(
+            select(workspace_users.c.role)
+            .where(
+                workspace_users.c.workspace_id == workspace_id,
+                workspace_users.c.user_id == user_id
+            )
+        ).scalar_one_or_none()
+    return roles[key]
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _forget_workspace_roles(session):
+    # Memberships may have changed with the writes just committed or discarded
+    session.info.pop("workspace_roles", None)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _forget_workspace_roles_on_write(orm_execute_state):
+    # insert/update/delete statements run through the session, e.g. inviting a member
+    if orm_execute_state.is_select:
+        return
+    if getattr(orm_execute_state.statement, "table", None) in _MEMBERSHIP_TABLES:
+        orm_execute_state.session.info.pop("workspace_roles", None)
+
+
+@event.listens_for(Session, "after_flush")
+def _forget_workspace_roles_on_flush(session, flush_context):
+    # Flushed changes to Workspace.users / User.workspaces or deleted workspaces and users
+    changed = session.new | session.dirty | session.deleted
+    if any(isinstance(obj, (Workspace, User)) for obj in changed):
+        session.info.pop("workspace_roles", None)
@@ -1,11 +1,20 @@
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import select, update, delete, and_
+from sqlalchemy import select, update, delete, and_, func
 from app.models.workspace import Workspace, workspace_users, GroupRoleType
 from app.models.user import User
+from app.services.workspace_access import get_workspace_role
 from app.schemas.workspace import WorkspaceCreate, WorkspaceUpdate, WorkspaceUserAdd, WorkspaceUserUpdate, WorkspaceUserResponse
+from app.core.db import replica_read
+from app.core.tracing import traced
 from typing import List
 
+# Shortest query the invite autocomplete accepts, so a caller cannot page
+# through the user table one or two letters at a time
+MIN_CANDIDATE_PREFIX = 3
+
+
+@traced
 class WorkspaceService:
     def __init__(self, db: Session):
         self.db = db
@@ -57,13 +66,7 @@ class WorkspaceService:
         workspace = self.get_workspace(workspace_id)
 
         # Check if user is admin
-        user_role = self.db.execute(
-            select(workspace_users.c.role)
-            .where(
-                workspace_users.c.workspace_id == workspace_id,
-                workspace_users.c.user_id == user_id
-            )
-        ).scalar_one_or_none()
+        user_role = get_workspace_role(self.db, workspace_id, user_id)
         if user_role != GroupRoleType.admin:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -97,13 +100,7 @@ class WorkspaceService:
         workspace = self.get_workspace(workspace_id)
 
         # Check if user is admin
-        user_role = self.db.execute(
-            select(workspace_users.c.role)
-            .where(
-                workspace_users.c.workspace_id == workspace_id,
-                workspace_users.c.user_id == user_id
-            )
-        ).scalar_one_or_none()
+        user_role = get_workspace_role(self.db, workspace_id, user_id)
         if user_role != GroupRoleType.admin:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -116,13 +113,7 @@ class WorkspaceService:
 
     def _check_workspace_admin_permission(self, workspace_id: int, user_id: int):
         """Helper method to check if user has admin permissions for workspace"""
-        user_role = self.db.execute(
-            select(workspace_users.c.role)
-            .where(
-                workspace_users.c.workspace_id == workspace_id,
-                workspace_users.c.user_id == user_id
-            )
-        ).scalar_one_or_none()
+        user_role = get_workspace_role(self.db, workspace_id, user_id)
         
         if user_role != GroupRoleType.admin:
             raise HTTPException(
@@ -130,19 +121,14 @@ class WorkspaceService:
                 detail="Only workspace admins can perform this action"
             )
 
+    @replica_read
     def get_workspace_users(self, workspace_id: int, requesting_user_id: int) -> List[WorkspaceUserResponse]:
         """Get all users in a workspace with their roles"""
         # Verify workspace exists and user has access
         self.get_workspace(workspace_id)
         
         # Check if requesting user is member of workspace
-        user_role = self.db.execute(
-            select(workspace_users.c.role)
-            .where(
-                workspace_users.c.workspace_id == workspace_id,
-                workspace_users.c.user_id == requesting_user_id
-            )
-        ).scalar_one_or_none()
+        user_role = get_workspace_role(self.db, workspace_id, requesting_user_id)
         
         if user_role is None:
             raise HTTPException(
@@ -174,6 +160,48 @@ class WorkspaceService:
             for row in result
         ]
 
+    @replica_read
+    def find_user_candidates(self, workspace_id: int, query: str, limit: int, requesting_user_id: int) -> List[dict]:
+        """Active users whose username starts with `query`, or whose email is `query` when it contains "@".
+
+        Meant for the invite autocomplete, so only workspace admins may call it.
+        Emails only match in full so the endpoint cannot be used to enumerate
+        addresses; the route requires at least MIN_CANDIDATE_PREFIX characters.
+        Matches come from one ordered scan of a lower() index that stops after
+        `limit` rows; the membership flag is joined in the same query.
+        """
+        self._check_workspace_admin_permission(workspace_id, requesting_user_id)
+
+        # Bytewise collation, the one of the Postgres lower() indexes
+        collation = "C" if self.db.get_bind().dialect.name == "postgresql" else "BINARY"
+        if "@" in query:
+            key = func.lower(User.email).collate(collation)
+            matches = key == query.lower()
+        else:
+            key = func.lower(User.username).collate(collation)
+            pattern = query.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            matches = key.like(pattern, escape="\\")
+
+        rows = self.db.execute(
+            select(
+                User.id,
+                User.username,
+                User.email,
+                workspace_users.c.user_id.is_not(None).label("is_member")
+            )
+            .outerjoin(
+                workspace_users,
+                and_(
+                    workspace_users.c.user_id == User.id,
+                    workspace_users.c.workspace_id == workspace_id
+                )
+            )
+            .where(and_(matches, User.is_active == True))
+            .order_by(key)
+            .limit(limit)
+        ).mappings().all()
+        return [dict(row) for row in rows]
+
     def add_user_to_workspace(self, workspace_id: int, user_data: WorkspaceUserAdd, requesting_user_id: int) -> WorkspaceUserResponse:
         """Add a user to a workspace with specified role"""
         # Verify workspace exists and requesting user is admin
@@ -192,13 +220,7 @@ class WorkspaceService:
             )
 
         # Check if user is already in workspace
-        existing_membership = self.db.execute(
-            select(workspace_users.c.role)
-            .where(
-                workspace_users.c.workspace_id == workspace_id,
-                workspace_users.c.user_id == user_data.user_id
-            )
-        ).scalar_one_or_none()
+        existing_membership = get_workspace_role(self.db, workspace_id, user_data.user_id)
 
         if existing_membership:
             raise HTTPException(
@@ -247,13 +269,7 @@ class WorkspaceService:
         self._check_workspace_admin_permission(workspace_id, requesting_user_id)
 
         # Check if target user is in workspace
-        existing_membership = self.db.execute(
-            select(workspace_users.c.role)
-            .where(
-                workspace_users.c.workspace_id == workspace_id,
-                workspace_users.c.user_id == user_id
-            )
-        ).scalar_one_or_none()
+        existing_membership = get_workspace_role(self.db, workspace_id, user_id)
 
         if not existing_membership:
             raise HTTPException(
@@ -321,13 +337,7 @@ class WorkspaceService:
         self._check_workspace_admin_permission(workspace_id, requesting_user_id)
 
         # Check if target user is in workspace
-        existing_membership = self.db.execute(
-            select(workspace_users.c.role)
-            .where(
-                workspace_users.c.workspace_id == workspace_id,
-                workspace_users.c.user_id == user_id
-            )
-        ).scalar_one_or_none()
+        existing_membership = get_workspace_role(self.db, workspace_id, user_id)
 
         if not existing_membership:
             raise HTTPException(
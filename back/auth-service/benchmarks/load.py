@@ -0,0 +1,272 @@
+"""Load scenarios against the API with latency, throughput and query counts.
+
+Seed a dataset with benchmarks.seed first, then point the app at the same
+database. Without --base-url the app is imported and driven in-process over
+ASGI (set DATABASE_URL and the JWT keys in the environment); with --base-url
+requests go to a running server, e.g. uvicorn with several workers.
+
+Each scenario runs --iterations operations spread over --concurrency virtual
+users. Latencies are reported per scenario as p50/p95/p99, and queries per
+request are read from the Server-Timing header. Results are compared against
+a stored baseline, and the exit code is 1 when a scenario regressed:
+
+    python -m benchmarks.load --iterations 500 --concurrency 32
+    python -m benchmarks.load --write-baseline   # accept the current numbers
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+from typing import Optional
+
+import httpx
+
+from app.models.task import TaskStatus
+
+_SERVER_TIMING_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+class Recorder:
+    """Times requests of one scenario and reads their query counts"""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.latencies: list[float] = []
+        self.queries: list[int] = []
+        self.rejected = 0
+        self.errors = 0
+
+    async def request(self, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors += 1
+            return None
+        self.latencies.append(time.perf_counter() - start)
+
+        match = _SERVER_TIMING_QUERIES.search(response.headers.get("server-timing", ""))
+        if match:
+            self.queries.append(int(match.group(1)))
+        if response.status_code >= 500:
+            self.errors += 1
+        elif response.status_code >= 400:
+            # Expected under random load, e.g. a duplicate dependency or a blocked transition
+            self.rejected += 1
+        return response
+
+
+class VirtualUser:
+    def __init__(self, email: str, token: str, workspaces: list[dict]):
+        self.email = email
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.workspaces = workspaces
+
+
+async def board_load(recorder: Recorder, user: VirtualUser, rng: random.Random, manifest: dict):
+    workspace = rng.choice(user.workspaces)
+    await recorder.request("GET", f"/tasks/workspace/{workspace['id']}", params={"fields": "card"}, headers=user.headers)
+    await recorder.request("GET", f"/categories/workspace/{workspace['id']}", headers=user.headers)
+
+
+async def drag_drop(recorder: Recorder, user: VirtualUser, rng: random.Random, manifest: dict):
+    workspace = rng.choice(user.workspaces)
+    task_id = rng.randint(*workspace["task_ids"])
+    await recorder.request(
+        "PUT", f"/tasks/{task_id}/category",
+        params={"category_id": rng.choice(workspace["category_ids"])}, headers=user.headers
+    )
+
+
+async def status_change(recorder: Recorder, user: VirtualUser, rng: random.Random, manifest: dict):
+    workspace = rng.choice(user.workspaces)
+    task_id = rng.randint(*workspace["task_ids"])
+    await recorder.request(
+        "PUT", f"/tasks/{task_id}/status",
+        json={"status": rng.choice(list(TaskStatus)).value}, headers=user.headers
+    )
+
+
+async def dependency_add(recorder: Recorder, user: VirtualUser, rng: random.Random, manifest: dict):
+    workspace = rng.choice(user.workspaces)
+    first, last = workspace["task_ids"]
+    if first == last:
+        return
+    # Lower ids block higher ones, the same direction as the seeded graph
+    blocking_task_id, blocked_task_id = sorted(rng.sample(range(first, last + 1), 2))
+    await recorder.request(
+        "POST", f"/tasks/{blocking_task_id}/dependencies",
+        json={"blocked_task_id": blocked_task_id, "dependency_type": "blocks"}, headers=user.headers
+    )
+
+
+async def login_burst(recorder: Recorder, user: VirtualUser, rng: random.Random, manifest: dict):
+    account = rng.choice(manifest["users"])
+    await recorder.request("POST", "/auth/login", json={"email": account["email"], "password": manifest["password"]})
+
+
+SCENARIOS = {
+    "board_load": board_load,
+    "drag_drop": drag_drop,
+    "status_change": status_change,
+    "dependency_add": dependency_add,
+    "login_burst": login_burst,
+}
+
+
+async def login_users(client: httpx.AsyncClient, manifest: dict, count: int) -> list[VirtualUser]:
+    """Log in members of the seeded workspaces to act as virtual users"""
+    workspaces_by_user: dict[int, list[dict]] = {}
+    for workspace in manifest["workspaces"]:
+        for user_id in workspace["member_ids"]:
+            workspaces_by_user.setdefault(user_id, []).append(workspace)
+
+    emails = {user["id"]: user["email"] for user in manifest["users"]}
+    users = []
+    for user_id in sorted(workspaces_by_user)[:count]:
+        response = await client.post("/auth/login", json={"email": emails[user_id], "password": manifest["password"]})
+        response.raise_for_status()
+        users.append(VirtualUser(emails[user_id], response.json()["access_token"], workspaces_by_user[user_id]))
+    if not users:
+        sys.exit("No workspace members in the manifest; seed a dataset first")
+    return users
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+async def run_scenario(client: httpx.AsyncClient, name: str, users: list[VirtualUser], manifest: dict, iterations: int, concurrency: int, seed: int) -> dict:
+    scenario = SCENARIOS[name]
+    recorder = Recorder(client)
+    remaining = iter(range(iterations))
+
+    async def worker(index: int):
+        rng = random.Random(f"{seed}:{name}:{index}")
+        user = users[index % len(users)]
+        for _ in remaining:
+            await scenario(recorder, user, rng, manifest)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies = recorder.latencies or [0.0]
+    return {
+        "requests": len(recorder.latencies),
+        "errors": recorder.errors,
+        "rejected": recorder.rejected,
+        "throughput_rps": round(len(recorder.latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "queries_per_request": round(sum(recorder.queries) / len(recorder.queries), 2) if recorder.queries else None,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Describe every metric that is worse than the baseline beyond the tolerance"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            if base[metric] and result[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {base[metric]} -> {result[metric]}")
+        if base["throughput_rps"] and result["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput_rps {base['throughput_rps']} -> {result['throughput_rps']}")
+        # Query counts are deterministic per code path, so any increase counts
+        if base.get("queries_per_request") is not None and result["queries_per_request"] is not None \
+                and result["queries_per_request"] > base["queries_per_request"] + 0.05:
+            regressions.append(f"{name}: queries_per_request {base['queries_per_request']} -> {result['queries_per_request']}")
+    return regressions
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run(args) -> dict:
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+
+    if args.base_url:
+        transport, base_url = None, args.base_url
+    else:
+        from app.main import app
+        transport, base_url = httpx.ASGITransport(app=app), "http://benchmark"
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, limits=limits, timeout=60) as client:
+        users = await login_users(client, manifest, args.users)
+        results = {}
+        for name in args.scenarios:
+            results[name] = await run_scenario(client, name, users, manifest, args.iterations, args.concurrency, manifest["seed"])
+            print(
+                f"{name:15} {results[name]['requests']:6} req  {results[name]['throughput_rps']:8.1f} req/s  "
+                f"p50 {results[name]['p50_ms']:8.2f}  p95 {results[name]['p95_ms']:8.2f}  p99 {results[name]['p99_ms']:8.2f} ms  "
+                f"queries {results[name]['queries_per_request']}  rejected {results[name]['rejected']}  errors {results[name]['errors']}"
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--manifest", default="benchmarks/results/manifest.json")
+    parser.add_argument("--base-url", help="Run against a live server instead of the in-process app")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--iterations", type=int, default=200, help="Operations per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--users", type=int, default=50, help="Virtual users to log in")
+    parser.add_argument("--baseline", default="benchmarks/baseline.json")
+    parser.add_argument("--write-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative slowdown before flagging")
+    parser.add_argument("--output", default="benchmarks/results/load.json")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    report = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "target": args.base_url or "in-process",
+        "iterations": args.iterations,
+        "concurrency": args.concurrency,
+        "scenarios": results,
+    }
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if args.write_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --write-baseline to store one")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    print(f"compared with baseline from {baseline.get('commit')} ({baseline.get('timestamp')})")
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+    print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
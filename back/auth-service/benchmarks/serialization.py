@@ -0,0 +1,121 @@
+"""Serialization benchmark for the workspace task list.
+
+Compares the previous pipeline (ORM entities -> TaskResponse validation ->
+jsonable_encoder -> json.dumps) against the plain-row path used by
+TaskService.get_workspace_tasks (Core rows -> dicts -> orjson). The ORM
+pipeline resolves dependency ids through the Task relationships, one lazy load
+per task, which is what response validation triggered before.
+
+Run from back/auth-service:
+
+    python -m benchmarks.serialization --tasks 10000
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models import Base, Task, Workspace, User
+from app.models.task import PriorityType, TaskStatus
+from app.schemas.task import TaskResponse
+from app.services.task_service import TaskService, TASK_LIST_COLUMNS
+
+
+def seed(session, task_count: int) -> int:
+    session.execute(insert(User).values(id=1, email="bench@example.com", username="bench", hashed_password="x"))
+    session.execute(insert(Workspace).values(id=1, name="bench"))
+    now = datetime.utcnow()
+    statuses = list(TaskStatus)
+    priorities = list(PriorityType)
+    session.execute(
+        insert(Task),
+        [
+            {
+                "workspace_id": 1,
+                "reporter_id": 1,
+                "assignee_id": 1,
+                "title": f"Task {i}",
+                "description": "Lorem ipsum dolor sit amet " * 20,
+                "status": statuses[i % len(statuses)],
+                "priority": priorities[i % len(priorities)],
+                "story_points": i % 13 + 1,
+                "labels": ["backend", "perf"],
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(task_count)
+        ],
+    )
+    session.commit()
+    return 1
+
+
+def orm_pipeline(session, workspace_id: int) -> bytes:
+    tasks = session.execute(select(Task).where(Task.workspace_id == workspace_id)).scalars().all()
+    validated = [
+        TaskResponse(
+            **{name: getattr(task, name) for name in TaskResponse.model_fields if name not in ("blocking_dependencies", "blocked_by_dependencies")},
+            blocking_dependencies=[dep.blocked_task_id for dep in task.blocking_dependencies],
+            blocked_by_dependencies=[dep.blocking_task_id for dep in task.blocked_by_dependencies],
+        )
+        for task in tasks
+    ]
+    return json.dumps(jsonable_encoder(validated)).encode("utf-8")
+
+
+def row_pipeline(session, workspace_id: int) -> bytes:
+    rows = session.execute(
+        select(*TASK_LIST_COLUMNS).where(Task.workspace_id == workspace_id).order_by(Task.id)
+    ).mappings().all()
+    tasks = [dict(row) for row in rows]
+    TaskService(session)._attach_dependency_ids(workspace_id, tasks)
+    return orjson.dumps(tasks, option=orjson.OPT_NON_STR_KEYS)
+
+
+def best_of(fn, session_factory, workspace_id: int, repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        session = session_factory()
+        try:
+            start = time.perf_counter()
+            payload = fn(session, workspace_id)
+            best = min(best, time.perf_counter() - start)
+            size = len(payload)
+        finally:
+            session.close()
+    return best, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default="sqlite://")
+    args = parser.parse_args()
+
+    engine_kwargs = {"poolclass": StaticPool} if args.database_url == "sqlite://" else {}
+    engine = create_engine(args.database_url, **engine_kwargs)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+
+    with session_factory() as session:
+        workspace_id = seed(session, args.tasks)
+
+    before, before_size = best_of(orm_pipeline, session_factory, workspace_id, args.repeat)
+    after, after_size = best_of(row_pipeline, session_factory, workspace_id, args.repeat)
+
+    print(f"tasks:  {args.tasks}")
+    print(f"before: {before * 1000:8.1f} ms  ({before_size} bytes)  ORM + TaskResponse + json")
+    print(f"after:  {after * 1000:8.1f} ms  ({after_size} bytes)  Core rows + orjson")
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Microbenchmarks for the hot service methods at several data sizes.
+
+Each method is called directly, without HTTP, against a workspace seeded with
+benchmarks.seed at every --sizes value. Every call gets a fresh session, so
+identity-map hits do not flatter repeated runs. The best and mean wall time
+and the number of SQL statements per call are reported, and each run is
+appended to a history file keyed by git commit. That way a change to an
+algorithm (e.g. DFS vs a recursive CTE for cycle checks) comes with numbers:
+
+    python -m benchmarks.services --sizes 1000 10000 100000
+    python -m benchmarks.services --compare      # diff against the previous commit
+
+The default database is in-memory SQLite; pass --database-url to measure
+Postgres. Tables there are dropped and recreated for each size.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.core.db import collect_query_stats, get_current_user
+from app.core.security import create_access_token
+from app.models import Base, Category, Task, TaskDependency
+from app.models.task import TaskStatus
+from app.schemas.task import TASK_FIELD_PRESETS, TaskStatusUpdate
+from app.services.category_service import CategoryService
+from app.services.task_dependency_service import TaskDependencyService
+from app.services.task_service import TaskService
+from benchmarks.seed import seed_dataset
+
+WORKSPACE_ID = 1
+# Length of the extra dependency chain; the recursive DFS in
+# TaskDependencyService needs one stack frame per hop (limit ~1000)
+CHAIN_LENGTH = 500
+
+
+def _ensure_jwt_keys():
+    """Generate a throwaway RSA key pair when none is configured"""
+    if settings.PRIVATE_KEY and settings.PUBLIC_KEY:
+        return
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    settings.PRIVATE_KEY = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    settings.PUBLIC_KEY = key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+
+
+def build_fixture(database_url: str, size: int):
+    """Seed one workspace with `size` tasks, `size` categories and a dependency chain.
+
+    Returns a session factory and the ids the benchmark cases use.
+    """
+    if database_url == "sqlite://":
+        engine = create_engine(database_url, poolclass=StaticPool, connect_args={"check_same_thread": False})
+    else:
+        engine = create_engine(database_url)
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    manifest = seed_dataset(engine, users=20, workspaces=1, members_per_workspace=20, tasks_per_workspace=size, comments_per_task=0)
+    workspace = manifest["workspaces"][0]
+    user_id = workspace["member_ids"][0]
+
+    with engine.begin() as conn:
+        first_category_position = len(workspace["category_ids"])
+        conn.execute(insert(Category), [
+            {"workspace_id": WORKSPACE_ID, "name": f"Column {position}", "position": position, "color": "#6366f1",
+             "is_archived": False, "default_status": TaskStatus.open, "allowed_statuses": ["open"]}
+            for position in range(first_category_position, first_category_position + size)
+        ])
+        first_task_id, last_task_id = workspace["task_ids"]
+        chain = list(range(max(first_task_id, last_task_id - CHAIN_LENGTH + 1), last_task_id + 1))
+        existing = set(conn.execute(
+            select(TaskDependency.blocking_task_id, TaskDependency.blocked_task_id)
+            .where(TaskDependency.blocked_task_id >= chain[0])
+        ).all())
+        conn.execute(insert(TaskDependency), [
+            {"blocking_task_id": blocking, "blocked_task_id": blocked, "dependency_type": "blocks", "created_by_id": user_id}
+            for blocking, blocked in zip(chain, chain[1:]) if (blocking, blocked) not in existing
+        ])
+
+        # A task nothing blocks, so status changes always pass the dependency checks
+        unblocked_task_id = conn.execute(
+            select(Task.id)
+            .where(Task.workspace_id == WORKSPACE_ID, Task.id.not_in(select(TaskDependency.blocked_task_id)))
+            .order_by(Task.id.desc())
+            .limit(1)
+        ).scalar_one()
+
+    context = {
+        "user_id": user_id,
+        "first_task_id": first_task_id,
+        "chain_start_id": chain[0],
+        "unblocked_task_id": unblocked_task_id,
+        "category_id": workspace["category_ids"][0],
+        "category_count": first_category_position + size,
+        "token": create_access_token(user_id),
+    }
+    return sessionmaker(bind=engine, expire_on_commit=False), context
+
+
+def benchmark_cases(context: dict) -> dict:
+    """Callables taking a session; stateful ones alternate so each call does real work"""
+    flips = {"status": 0, "position": 0}
+
+    def update_task_status(db):
+        flips["status"] += 1
+        new_status = TaskStatus.in_progress if flips["status"] % 2 else TaskStatus.review
+        TaskService(db).update_task_status(context["unblocked_task_id"], TaskStatusUpdate(status=new_status), context["user_id"])
+
+    def update_category_position(db):
+        # Move the first column to the end and back: each call shifts every other column
+        flips["position"] += 1
+        new_position = context["category_count"] - 1 if flips["position"] % 2 else 0
+        CategoryService(db).update_category_position(context["category_id"], new_position, context["user_id"])
+
+    return {
+        "TaskService.get_workspace_tasks[full]": lambda db: TaskService(db).get_workspace_tasks(
+            WORKSPACE_ID, context["user_id"], TASK_FIELD_PRESETS["full"]
+        ),
+        "TaskService.get_workspace_tasks[card]": lambda db: TaskService(db).get_workspace_tasks(
+            WORKSPACE_ID, context["user_id"], TASK_FIELD_PRESETS["card"]
+        ),
+        "TaskService.update_task_status": update_task_status,
+        # Target id 0 never matches, so these walk everything reachable from the start task
+        "TaskDependencyService._would_create_circular_dependency[seeded]": lambda db: TaskDependencyService(db)._would_create_circular_dependency(
+            0, context["first_task_id"]
+        ),
+        "TaskDependencyService._would_create_circular_dependency[chain]": lambda db: TaskDependencyService(db)._would_create_circular_dependency(
+            0, context["chain_start_id"]
+        ),
+        "CategoryService.update_category_position": update_category_position,
+        "get_current_user": lambda db: get_current_user(db=db, token=context["token"]),
+    }
+
+
+def measure(session_factory, fn, repeat: int) -> dict:
+    timings = []
+    queries = 0
+    for _ in range(repeat):
+        db = session_factory()
+        try:
+            with collect_query_stats() as stats:
+                start = time.perf_counter()
+                fn(db)
+                timings.append(time.perf_counter() - start)
+            queries = stats.count
+        except RecursionError:
+            return {"error": "RecursionError"}
+        finally:
+            db.close()
+    return {
+        "best_ms": round(min(timings) * 1000, 3),
+        "mean_ms": round(sum(timings) / len(timings) * 1000, 3),
+        "queries": queries,
+    }
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.check_output(["git", *args], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def load_history(path: str) -> list[dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def print_comparison(previous: dict, current: dict):
+    print(f"\ncompared with {previous['commit']} ({previous['timestamp']})")
+    for name, sizes in current["results"].items():
+        for size, result in sizes.items():
+            before = previous["results"].get(name, {}).get(size)
+            if not before or "best_ms" not in before or "best_ms" not in result:
+                continue
+            change = (result["best_ms"] - before["best_ms"]) / before["best_ms"] * 100 if before["best_ms"] else 0.0
+            print(
+                f"{name:64} {size:>7}  {before['best_ms']:10.3f} -> {result['best_ms']:10.3f} ms  {change:+7.1f}%"
+                f"  queries {before['queries']} -> {result['queries']}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--only", help="Run only benchmarks whose name contains this text")
+    parser.add_argument("--history", default="benchmarks/history/services.jsonl")
+    parser.add_argument("--no-record", action="store_true", help="Do not append this run to the history")
+    parser.add_argument("--compare", action="store_true", help="Compare with the latest run from another commit")
+    args = parser.parse_args()
+
+    _ensure_jwt_keys()
+    results: dict[str, dict[str, dict]] = {}
+    for size in args.sizes:
+        start = time.perf_counter()
+        session_factory, context = build_fixture(args.database_url, size)
+        print(f"\n{size} rows (fixture built in {time.perf_counter() - start:.1f}s)")
+        for name, fn in benchmark_cases(context).items():
+            if args.only and args.only not in name:
+                continue
+            result = measure(session_factory, fn, args.repeat)
+            results.setdefault(name, {})[str(size)] = result
+            if "error" in result:
+                print(f"  {name:64} {result['error']}")
+            else:
+                print(f"  {name:64} best {result['best_ms']:10.3f} ms  mean {result['mean_ms']:10.3f} ms  queries {result['queries']}")
+
+    run = {
+        "commit": _git("rev-parse", "--short", "HEAD") or "unknown",
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "database": create_engine(args.database_url).dialect.name,
+        "repeat": args.repeat,
+        "results": results,
+    }
+
+    history = load_history(args.history)
+    if args.compare:
+        previous = next((entry for entry in reversed(history) if entry["commit"] != run["commit"]), None)
+        if previous is None:
+            print("\nno earlier commit in the history to compare with")
+        else:
+            print_comparison(previous, run)
+
+    if not args.no_record:
+        os.makedirs(os.path.dirname(args.history) or ".", exist_ok=True)
+        with open(args.history, "a") as f:
+            f.write(json.dumps(run) + "\n")
+        print(f"\nrecorded in {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Import-time and app-build budget check for worker startup.
+
+Runs `import app.main` and `create_app()` in fresh interpreters, so module
+caches from this process do not hide the cost, and fails when either exceeds
+its budget. The slowest modules from `python -X importtime` are listed, which
+shows what to defer when the budget is blown:
+
+    python -m benchmarks.startup --import-budget-ms 800 --create-budget-ms 2000
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Default budgets in ms; tests/test_startup.py holds `import app.main` to the first
+IMPORT_BUDGET_MS = 800
+CREATE_BUDGET_MS = 2000
+
+_TIMED_SNIPPET = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def _run(snippet: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *flags, "-c", snippet], capture_output=True, text=True)
+
+
+def time_statement(statement: str, repeat: int) -> float:
+    """Median wall time in ms of running `statement` in a new interpreter"""
+    timings = []
+    for _ in range(repeat):
+        result = _run(_TIMED_SNIPPET.format(statement=statement))
+        if result.returncode:
+            sys.exit(f"`{statement}` failed:\n{result.stderr}")
+        timings.append(float(result.stdout.strip().splitlines()[-1]) * 1000)
+    return statistics.median(timings)
+
+
+def slowest_imports(limit: int) -> list[tuple[int, str]]:
+    """Modules of `import app.main` with the highest cumulative import time in us"""
+    result = _run("import app.main", "-X", "importtime")
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        entries.append((int(cumulative), name.rstrip()))
+    return sorted(entries, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--create-budget-ms", type=float, default=CREATE_BUDGET_MS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    # Compile once so every timed run reads bytecode like a deployed worker
+    _run("import app.main; app.main.create_app()")
+
+    import_ms = time_statement("import app.main", args.repeat)
+    create_ms = time_statement("import app.main; app.main.create_app()", args.repeat)
+
+    print(f"import app.main       {import_ms:8.1f} ms  (budget {args.import_budget_ms:.0f} ms)")
+    print(f"import + create_app() {create_ms:8.1f} ms  (budget {args.create_budget_ms:.0f} ms)")
+    print("\nslowest imports (cumulative):")
+    for cumulative, name in slowest_imports(args.top):
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    failures = []
+    if import_ms > args.import_budget_ms:
+        failures.append(f"import app.main took {import_ms:.1f} ms")
+    if create_ms > args.create_budget_ms:
+        failures.append(f"create_app() took {create_ms:.1f} ms")
+    for failure in failures:
+        print(f"OVER BUDGET {failure}")
+    if failures:
+        sys.exit(1)
+    print("\nwithin budget")
+
+
+if __name__ == "__main__":
+    main()
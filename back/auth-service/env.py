@@ -21,8 +21,9 @@ from app.models.base import Base
 # Import all models so Alembic can detect them
 from app.models.user import User, UserSession, Role, Permission, user_roles, role_permissions
 from app.models.workspace import Workspace, workspace_users
-from app.models.task import Task
+from app.models.task import Task, TaskLabel
 from app.models.comment import Comment
+from app.models.idempotency import IdempotencyKey
 
 target_metadata = Base.metadata
 
@@ -0,0 +1,90 @@
+"""Fixtures shared by the API tests.
+
+The settings are read when app.core.config is first imported, so the
+database (a SQLite file per test session) and a throwaway JWT key pair are
+put in the environment before any app module is imported.
+"""
+import os
+import tempfile
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+_test_dir = tempfile.mkdtemp(prefix="auth-service-tests-")
+_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+os.environ["DATABASE_URL"] = f"sqlite:///{_test_dir}/test.db?check_same_thread=false"
+os.environ["SLOW_QUERY_LOG_PATH"] = os.path.join(_test_dir, "slow_queries.log")
+os.environ["DB_POOL_WARMUP_CONNECTIONS"] = "1"
+os.environ["LOG_FORMAT"] = "text"
+# Every request runs under its route's query budget and fails on lazy loads
+os.environ["SQL_STRICT_MODE"] = "true"
+os.environ["PRIVATE_KEY"] = _key.private_bytes(
+    serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+).decode()
+os.environ["PUBLIC_KEY"] = _key.public_key().public_bytes(
+    serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+).decode()
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="session")
+def app():
+    from app.main import create_app
+
+    return create_app()
+
+
+@pytest.fixture
+def engine():
+    """The app's engine over freshly created tables"""
+    from app.core.db import engine
+    from app.models.base import Base
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def replica(engine, monkeypatch, tmp_path):
+    """A second SQLite database registered as the only read replica"""
+    import itertools
+    from sqlalchemy import create_engine
+    from app.core import db
+    from app.models.base import Base
+
+    replica_engine = create_engine(f"sqlite:///{tmp_path}/replica.db")
+    Base.metadata.create_all(replica_engine)
+    monkeypatch.setattr(db, "replica_engines", [replica_engine])
+    monkeypatch.setattr(db, "_replica_cycle", itertools.cycle([replica_engine]))
+    yield replica_engine
+    replica_engine.dispose()
+
+
+@pytest.fixture
+def dataset(engine):
+    """A small seeded dataset: its manifest lists each workspace's members, admin first"""
+    from benchmarks.seed import seed_dataset
+
+    return seed_dataset(
+        engine, users=12, workspaces=2, members_per_workspace=5, tasks_per_workspace=30, comments_per_task=1
+    )
+
+
+@pytest.fixture
+def client(app, dataset):
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def auth_headers():
+    from app.core.security import create_access_token
+
+    def headers(user_id: int) -> dict:
+        return {"Authorization": f"Bearer {create_access_token(user_id)}"}
+
+    return headers
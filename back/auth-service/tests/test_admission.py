@@ -0,0 +1,120 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core import admission as admission_module
+from app.core.admission import CallerLimiter, admission, parse_limits
+from app.core.config import settings
+from app.core.metrics import registry
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    """Replace the configured limiters: limits(spec, per_caller) returns the route class limiters"""
+    monkeypatch.setattr(settings, "ADMISSION_ENABLED", True)
+    monkeypatch.setattr(settings, "ADMISSION_QUEUE_TIMEOUT_MS", 50)
+
+    def configure(spec: str, per_caller: int = 0):
+        limiters = parse_limits(spec)
+        monkeypatch.setattr(admission_module, "route_limiters", limiters)
+        monkeypatch.setattr(admission_module, "caller_limiter", CallerLimiter(per_caller))
+        return limiters
+
+    return configure
+
+
+def _app(release: asyncio.Event) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/hold", dependencies=[admission("tiny")])
+    async def hold():
+        await release.wait()
+        return {"ok": True}
+
+    @app.get("/boom", dependencies=[admission("tiny")])
+    async def boom():
+        raise RuntimeError("boom")
+
+    return app
+
+
+def _gauge(name: str) -> str:
+    return next(line for line in registry.render().splitlines() if line.startswith(f'{name}{{route_class="tiny"}}'))
+
+
+async def _while_holding(check, holders: int = 1):
+    """Keep `holders` requests on /hold, run check(client) meanwhile, then let them finish"""
+    release = asyncio.Event()
+    transport = httpx.ASGITransport(app=_app(release), raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        held = [asyncio.create_task(client.get("/hold")) for _ in range(holders)]
+        await asyncio.sleep(0.05)
+        result = await check(client)
+        release.set()
+        responses = await asyncio.gather(*held)
+    return result, [response.status_code for response in responses]
+
+
+def test_caller_over_its_cap_gets_429(limits):
+    limits("tiny=4:0", per_caller=1)
+
+    response, held = asyncio.run(_while_holding(lambda client: client.get("/hold")))
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == str(settings.ADMISSION_RETRY_AFTER_SECONDS)
+    assert held == [200]
+
+
+def test_full_queue_gets_503_at_once(limits):
+    limiters = limits("tiny=1:0")
+
+    async def check(client):
+        assert _gauge("admission_in_flight") == 'admission_in_flight{route_class="tiny"} 1'
+        return await client.get("/hold")
+
+    response, held = asyncio.run(_while_holding(check))
+
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+    assert held == [200]
+    assert limiters["tiny"].active == 0
+
+
+def test_queued_request_gets_503_when_its_wait_times_out(limits):
+    limits("tiny=1:1")
+
+    async def check(client):
+        waiting = asyncio.create_task(client.get("/hold"))
+        await asyncio.sleep(0.01)
+        assert _gauge("admission_queue_depth") == 'admission_queue_depth{route_class="tiny"} 1'
+        return await waiting
+
+    response, held = asyncio.run(_while_holding(check))
+
+    assert response.status_code == 503
+    assert _gauge("admission_queue_depth") == 'admission_queue_depth{route_class="tiny"} 0'
+    assert held == [200]
+
+
+def test_queued_request_runs_once_a_slot_frees_up(limits, monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_QUEUE_TIMEOUT_MS", 5000)
+    limits("tiny=1:1")
+
+    _, held = asyncio.run(_while_holding(lambda client: asyncio.sleep(0), holders=2))
+
+    assert held == [200, 200]
+
+
+def test_slots_are_released_when_the_endpoint_raises(limits):
+    limiters = limits("tiny=1:0", per_caller=1)
+
+    async def run():
+        transport = httpx.ASGITransport(app=_app(asyncio.Event()), raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return [(await client.get("/boom")).status_code for _ in range(3)]
+
+    assert asyncio.run(run()) == [500, 500, 500]
+    assert limiters["tiny"].active == 0
+    assert admission_module.caller_limiter._active == {}
@@ -0,0 +1,31 @@
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.core.db import SessionLocal
+from app.services.analytics_export_service import AnalyticsExportService
+
+
+def test_analytics_export_streams_a_readable_parquet_file(client, dataset, auth_headers):
+    workspace = dataset["workspaces"][0]
+    response = client.get(
+        "/exports/analytics/tasks", params={"workspace_id": workspace["id"]},
+        headers=auth_headers(workspace["member_ids"][0])
+    )
+
+    table = pq.read_table(io.BytesIO(response.content))
+    first, last = workspace["task_ids"]
+    assert table.column("id").to_pylist() == list(range(first, last + 1))
+
+
+def test_abandoned_export_releases_the_cursor(dataset):
+    with SessionLocal() as db:
+        results = []
+        execute = db.execute
+        db.execute = lambda *args, **kwargs: results.append(execute(*args, **kwargs)) or results[-1]
+
+        chunks = AnalyticsExportService(db).iter_table("tasks", None, "arrow", batch_size=10)
+        assert pa.ipc.open_stream(next(chunks)).schema.names[0] == "id"
+        chunks.close()
+        assert results[-1].closed
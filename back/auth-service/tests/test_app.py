@@ -0,0 +1,22 @@
+from fastapi.testclient import TestClient
+from app import main
+from app.main import create_app
+
+
+def test_create_app_mounts_every_router_and_runs_lifespan(engine):
+    with TestClient(create_app()) as client:
+        assert client.get("/").json() == {"message": "Auth Service is running!"}
+
+        paths = client.get("/openapi.json").json()["paths"]
+        for path in ("/auth/login", "/categories/{category_id}", "/tasks/workspace/{workspace_id}", "/search", "/batch"):
+            assert path in paths
+        assert client.post("/graphql", json={"query": "{ me { id } }"}).status_code == 401
+
+
+def test_failed_warm_up_does_not_abort_startup(engine, monkeypatch):
+    def broken_warm_up():
+        raise ValueError("password cannot be longer than 72 bytes")
+
+    monkeypatch.setattr(main, "warm_up", broken_warm_up)
+    with TestClient(create_app()) as client:
+        assert client.get("/").status_code == 200
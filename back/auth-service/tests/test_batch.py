@@ -0,0 +1,99 @@
+from sqlalchemy import select
+from app.core.db import SessionLocal
+from app.models.task import Task
+
+
+def _titles(*titles: str) -> set:
+    with SessionLocal() as db:
+        return set(db.execute(select(Task.title).where(Task.title.in_(titles))).scalars())
+
+
+def _create(workspace_id: int, title: str) -> dict:
+    return {"method": "POST", "path": "/tasks/", "body": {"workspace_id": workspace_id, "title": title, "description": "Batched"}}
+
+
+def test_transactional_batch_rolls_back_on_first_failure(client, dataset, auth_headers):
+    workspace = dataset["workspaces"][0]
+    response = client.post("/batch", headers=auth_headers(workspace["member_ids"][0]), json={
+        "transactional": True,
+        "operations": [
+            _create(workspace["id"], "Batch A"),
+            {"method": "GET", "path": "/tasks/workspace/999999"},
+            _create(workspace["id"], "Batch B"),
+        ],
+    })
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["committed"] is False
+    assert [op["status"] for op in result["responses"]] == [200, 403, 424]
+    assert _titles("Batch A", "Batch B") == set()
+
+
+def test_transactional_batch_commits_when_every_operation_succeeds(client, dataset, auth_headers):
+    workspace = dataset["workspaces"][0]
+    response = client.post("/batch", headers=auth_headers(workspace["member_ids"][0]), json={
+        "transactional": True,
+        "operations": [
+            _create(workspace["id"], "Batch C"),
+            {"method": "GET", "path": f"/tasks/workspace/{workspace['id']}?fields=card"},
+        ],
+    })
+
+    result = response.json()
+    assert result["committed"] is True
+    assert [op["status"] for op in result["responses"]] == [200, 200]
+    assert "Batch C" in {task["title"] for task in result["responses"][1]["body"]}
+    assert _titles("Batch C") == {"Batch C"}
+
+
+def test_batch_rejects_nested_batches(client, dataset, auth_headers):
+    response = client.post("/batch", headers=auth_headers(dataset["workspaces"][0]["member_ids"][0]), json={
+        "operations": [{"method": "POST", "path": "/batch", "body": {"operations": []}}],
+    })
+    assert response.status_code == 400
+
+
+def test_operations_commit_one_by_one_outside_a_transaction(client, dataset, auth_headers):
+    workspace = dataset["workspaces"][0]
+    response = client.post("/batch", headers=auth_headers(workspace["member_ids"][0]), json={
+        "operations": [
+            _create(workspace["id"], "Batch D"),
+            {"method": "GET", "path": "/tasks/workspace/999999"},
+            _create(workspace["id"], "Batch E"),
+        ],
+    })
+
+    result = response.json()
+    assert result["committed"] is None
+    assert [op["status"] for op in result["responses"]] == [200, 403, 200]
+    assert _titles("Batch D", "Batch E") == {"Batch D", "Batch E"}
+
+
+def test_sub_requests_run_through_the_middlewares(client, dataset, auth_headers):
+    workspace = dataset["workspaces"][0]
+    client.post("/batch", headers=auth_headers(workspace["member_ids"][0]), json={
+        "operations": [{"method": "GET", "path": f"/categories/workspace/{workspace['id']}"}],
+    })
+
+    metrics = client.get("/metrics").text
+    assert 'route="/categories/workspace/{workspace_id}"' in metrics
+
+
+def test_transactional_batch_reads_its_own_writes_with_a_replica(client, dataset, auth_headers, replica, monkeypatch):
+    from app.core.config import settings
+
+    # No read-your-writes window: only the batch's own routing keeps the read on the primary
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 0)
+    workspace = dataset["workspaces"][0]
+    response = client.post("/batch", headers=auth_headers(workspace["member_ids"][0]), json={
+        "transactional": True,
+        "operations": [
+            _create(workspace["id"], "Batch replica"),
+            {"method": "GET", "path": f"/tasks/workspace/{workspace['id']}?fields=card"},
+        ],
+    })
+
+    result = response.json()
+    assert [op["status"] for op in result["responses"]] == [200, 200]
+    assert "Batch replica" in {task["title"] for task in result["responses"][1]["body"]}
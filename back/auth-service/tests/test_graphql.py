@@ -0,0 +1,29 @@
+from app.core.db import SessionLocal
+from app.graphql.loaders import BoardLoaders
+
+MEMBERS = "query($id: Int!) { me { id email } workspace(id: $id) { members { id email } } }"
+
+
+def _members(client, headers, workspace_id):
+    response = client.post("/graphql", json={"query": MEMBERS, "variables": {"id": workspace_id}}, headers=headers)
+    data = response.json()["data"]
+    return data["me"], {member["id"]: member["email"] for member in data["workspace"]["members"]}
+
+
+def test_member_emails_are_only_shown_to_workspace_admins(client, dataset, auth_headers):
+    workspace = dataset["workspaces"][0]
+    admin, member = workspace["member_ids"][:2]
+
+    me, emails = _members(client, auth_headers(admin), workspace["id"])
+    assert me == {"id": admin, "email": f"bench{admin}@example.org"}
+    assert emails == {user_id: f"bench{user_id}@example.org" for user_id in workspace["member_ids"]}
+
+    me, emails = _members(client, auth_headers(member), workspace["id"])
+    assert me["email"] == f"bench{member}@example.org"
+    assert emails == {user_id: f"bench{member}@example.org" if user_id == member else None for user_id in workspace["member_ids"]}
+
+
+def test_loaders_on_one_session_share_a_lock():
+    with SessionLocal() as db, SessionLocal() as other:
+        assert BoardLoaders(db, 1)._lock is BoardLoaders(db, 2)._lock
+        assert BoardLoaders(db, 1)._lock is not BoardLoaders(other, 1)._lock
@@ -0,0 +1,95 @@
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import func, insert, select
+from app.api.middleware import idempotency_middleware
+from app.core.db import SessionLocal
+from app.models.task import Task
+from app.models.workspace import GroupRoleType, workspace_users
+
+
+def _task_count(title: str) -> int:
+    with SessionLocal() as db:
+        return db.execute(select(func.count()).where(Task.title == title)).scalar_one()
+
+
+def test_retried_post_replays_the_stored_response(client, dataset, auth_headers):
+    workspace = dataset["workspaces"][0]
+    headers = {**auth_headers(workspace["member_ids"][0]), "Idempotency-Key": "create-once"}
+    body = {"workspace_id": workspace["id"], "title": "Exactly once", "description": "Retried"}
+
+    first = client.post("/tasks/", json=body, headers=headers)
+    retry = client.post("/tasks/", json=body, headers=headers)
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert _task_count("Exactly once") == 1
+
+
+def test_key_reused_for_another_request_is_rejected(client, dataset, auth_headers):
+    workspace = dataset["workspaces"][0]
+    headers = {**auth_headers(workspace["member_ids"][0]), "Idempotency-Key": "reused"}
+    body = {"workspace_id": workspace["id"], "title": "First use", "description": "Original"}
+
+    assert client.post("/tasks/", json=body, headers=headers).status_code == 200
+    response = client.post("/tasks/", json={**body, "title": "Second use"}, headers=headers)
+
+    assert response.status_code == 422
+    assert _task_count("Second use") == 0
+
+
+def test_keys_are_scoped_to_the_user(client, dataset, auth_headers):
+    workspace = dataset["workspaces"][0]
+    body = {"workspace_id": workspace["id"], "title": "Per user", "description": "Same key"}
+    for member_id in workspace["member_ids"][:2]:
+        response = client.post("/tasks/", json=body, headers={**auth_headers(member_id), "Idempotency-Key": "shared"})
+        assert "Idempotent-Replayed" not in response.headers
+
+    assert _task_count("Per user") == 2
+
+
+def test_failed_request_releases_its_key(client, dataset, auth_headers):
+    own, other = dataset["workspaces"]
+    outsider = next(user_id for user_id in other["member_ids"] if user_id not in own["member_ids"])
+    headers = {**auth_headers(outsider), "Idempotency-Key": "after-invite"}
+    body = {"workspace_id": own["id"], "title": "After invite", "description": "Retried once a member"}
+
+    assert client.post("/tasks/", json=body, headers=headers).status_code == 403
+    with SessionLocal() as db:
+        db.execute(insert(workspace_users).values(workspace_id=own["id"], user_id=outsider, role=GroupRoleType.member))
+        db.commit()
+    retry = client.post("/tasks/", json=body, headers=headers)
+
+    assert retry.status_code == 200
+    assert "Idempotent-Replayed" not in retry.headers
+    assert _task_count("After invite") == 1
+
+
+def test_streamed_responses_pass_through_and_headers_are_kept(engine, auth_headers):
+    app = FastAPI()
+    app.middleware("http")(idempotency_middleware)
+    calls = []
+
+    @app.post("/stream")
+    def stream():
+        calls.append("stream")
+        return StreamingResponse(iter([b"a\n", b"b\n"]), media_type="application/x-ndjson")
+
+    @app.post("/cookies")
+    def cookies():
+        calls.append("cookies")
+        response = JSONResponse({"ok": True})
+        response.set_cookie("first", "1")
+        response.set_cookie("second", "2")
+        return response
+
+    headers = {**auth_headers(1), "Idempotency-Key": "stream"}
+    with TestClient(app) as client:
+        for _ in range(2):
+            assert client.post("/stream", headers=headers).text == "a\nb\n"
+        first = client.post("/cookies", headers={**headers, "Idempotency-Key": "cookies"})
+
+    # Streamed: not stored, so the retry ran the endpoint again
+    assert calls == ["stream", "stream", "cookies"]
+    assert first.headers.get_list("set-cookie") == ["first=1; Path=/; SameSite=lax", "second=2; Path=/; SameSite=lax"]
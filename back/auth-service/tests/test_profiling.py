@@ -0,0 +1,38 @@
+import time
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.middleware import profiling_middleware
+from app.core.config import settings
+from app.core.profiling import SampledRoute, sampler
+
+
+def _busy_in_endpoint(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_sync_endpoints_are_sampled_in_their_worker_thread(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_ENABLED", True)
+    monkeypatch.setattr(settings, "PROFILE_DIR", "")
+    router = APIRouter(route_class=SampledRoute)
+
+    @router.get("/busy")
+    def busy():
+        _busy_in_endpoint(0.2)
+        return {"ok": True}
+
+    app = FastAPI()
+    app.include_router(router)
+    app.middleware("http")(profiling_middleware)
+
+    sampler.reset()
+    with TestClient(app) as client:
+        assert client.get("/busy", headers={settings.PROFILE_HEADER: "1"}).json() == {"ok": True}
+
+    stacks = sampler.collapsed("GET /busy").splitlines()
+    busy_samples = sum(int(line.rsplit(" ", 1)[1]) for line in stacks if "_busy_in_endpoint" in line)
+    assert busy_samples > sum(int(line.rsplit(" ", 1)[1]) for line in stacks) / 2
+    sampler.reset()
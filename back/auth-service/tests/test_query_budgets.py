@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import select
+from app.core.db import SessionLocal, collect_query_stats, LazyLoadError, QueryBudgetExceeded
+from app.models.task import Task
+from app.services.task_service import TaskService
+
+# List endpoints with a query_budget; the suite runs with SQL_STRICT_MODE, so
+# exceeding the budget or lazy loading a relationship fails the request
+LIST_ENDPOINTS = (
+    "/tasks/workspace/{workspace_id}",
+    "/tasks/workspace/{workspace_id}?fields=card",
+    "/tasks/workspace/{workspace_id}?label=bug",
+    "/tasks/workspace/{workspace_id}/labels",
+    "/tasks/workspace/{workspace_id}/search?q=cache",
+    "/categories/workspace/{workspace_id}",
+    "/comments/task/{task_id}",
+    "/comments/task/{task_id}?fields=card",
+    "/search?q=cache",
+    "/workspaces/{workspace_id}/users/candidates?q=bench",
+)
+
+
+@pytest.mark.parametrize("path", LIST_ENDPOINTS)
+def test_list_endpoint_stays_within_its_query_budget(client, dataset, auth_headers, path):
+    workspace = dataset["workspaces"][0]
+    url = path.format(workspace_id=workspace["id"], task_id=workspace["task_ids"][0])
+
+    response = client.get(url, headers=auth_headers(workspace["member_ids"][0]))
+
+    assert response.status_code == 200
+    assert "queries" in response.headers["Server-Timing"]
+
+
+def test_strict_stats_reject_queries_over_budget(dataset):
+    workspace = dataset["workspaces"][0]
+    with SessionLocal() as db:
+        with collect_query_stats(strict=True, budget=3) as stats:
+            TaskService(db).get_workspace_tasks(workspace["id"], workspace["member_ids"][0])
+        assert stats.count <= 3
+
+        with pytest.raises(QueryBudgetExceeded):
+            with collect_query_stats(strict=True, budget=1):
+                db.execute(select(Task.id)).all()
+                db.execute(select(Task.title)).all()
+
+
+def test_strict_stats_reject_lazy_loads(dataset):
+    with SessionLocal() as db:
+        task = db.get(Task, dataset["workspaces"][0]["task_ids"][0])
+        with pytest.raises(LazyLoadError):
+            with collect_query_stats(strict=True):
+                task.workspace
@@ -0,0 +1,119 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.orm import Session
+
+from app.core import db as db_module
+from app.core.db import cancel_on_disconnect, get_db, query_cancelled_handler
+from app.core.metrics import DB_QUERIES_CANCELLED
+
+# Runs for minutes unless it is interrupted
+COUNT_FOR_A_WHILE = (
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 1000000000) SELECT count(*) FROM c"
+)
+
+
+class _StatementTimeout(Exception):
+    pgcode = "57014"
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_exception_handler(DBAPIError, query_cancelled_handler)
+    router = APIRouter(dependencies=[cancel_on_disconnect()])
+
+    @router.get("/slow")
+    def slow(db: Session = Depends(get_db)):
+        return {"count": db.execute(text(COUNT_FOR_A_WHILE)).scalar()}
+
+    @router.get("/fast")
+    def fast(db: Session = Depends(get_db)):
+        return {"one": db.execute(text("SELECT 1")).scalar()}
+
+    @router.get("/timeout")
+    def timeout():
+        raise OperationalError("SELECT pg_sleep(10)", {}, _StatementTimeout("canceling statement due to statement timeout"))
+
+    app.include_router(router)
+    return app
+
+
+async def _call(app, path: str, disconnect_after: Optional[float] = None) -> int:
+    """Send a GET and return the status sent back.
+
+    The client is reported gone after `disconnect_after` seconds, or like a
+    server does once the response is written when it is None.
+    """
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": b"", "headers": [], "root_path": "",
+        "server": ("testserver", 80), "client": ("testclient", 1234),
+    }
+    request_sent = False
+    response_done = asyncio.Event()
+    sent = {}
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        if disconnect_after is None:
+            await response_done.wait()
+        else:
+            await asyncio.sleep(disconnect_after)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            sent["status"] = message["status"]
+        elif not message.get("more_body", False):
+            response_done.set()
+            # Writing to the socket gives other tasks a turn
+            await asyncio.sleep(0.05)
+
+    await asyncio.wait_for(app(scope, receive, send), timeout=30)
+    return sent["status"]
+
+
+def test_disconnect_interrupts_the_running_query(engine):
+    before = DB_QUERIES_CANCELLED.value(reason="disconnect")
+
+    assert asyncio.run(_call(_app(), "/slow", disconnect_after=0.2)) == 499
+    assert DB_QUERIES_CANCELLED.value(reason="disconnect") == before + 1
+
+
+def test_statement_timeout_is_answered_with_503():
+    before = DB_QUERIES_CANCELLED.value(reason="timeout")
+
+    with TestClient(_app()) as client:
+        response = client.get("/timeout")
+
+    assert response.status_code == 503
+    assert DB_QUERIES_CANCELLED.value(reason="timeout") == before + 1
+
+
+def test_finished_requests_cancel_nothing(engine, monkeypatch):
+    cancelled = []
+    monkeypatch.setattr(db_module, "cancel_session_queries", cancelled.append)
+
+    for _ in range(3):
+        assert asyncio.run(_call(_app(), "/fast")) == 200
+
+    assert cancelled == []
+
+
+def test_connections_returned_to_the_pool_cannot_be_cancelled(engine):
+    db = db_module.SessionLocal()
+    db.execute(text("SELECT 1"))
+    connections = db.info["dbapi_connections"]
+    assert len(connections) == 1
+
+    # The list the cancel reads is emptied on checkin, before the pool can reuse the connection
+    db.close()
+    assert connections == []
+    assert db_module.cancel_session_queries(db) == 0
@@ -0,0 +1,61 @@
+from sqlalchemy import insert, select, update
+from app.core.db import SessionLocal, recently_wrote, replica_read
+from app.core.security import current_user_id_var
+from app.models.workspace import Workspace
+
+
+class _Reader:
+    def __init__(self, db):
+        self.db = db
+
+    @replica_read
+    def bind(self):
+        return self.db.get_bind(clause=select(Workspace.id))
+
+
+def _as_user(user_id: int):
+    return current_user_id_var.set(user_id)
+
+
+def test_core_dml_is_recorded_as_a_write(engine):
+    token = _as_user(9001)
+    try:
+        with SessionLocal() as db:
+            db.execute(insert(Workspace).values(name="Core insert"))
+            db.commit()
+    finally:
+        current_user_id_var.reset(token)
+
+    assert recently_wrote(9001)
+    assert not recently_wrote(9002)
+
+
+def test_reads_use_the_primary_once_the_transaction_wrote(engine, replica):
+    with SessionLocal() as db:
+        db.info["replica_reads"] = True
+        assert db.get_bind(clause=select(Workspace.id)) is replica
+
+        db.execute(update(Workspace).where(Workspace.id == -1).values(name="nothing"))
+        assert db.get_bind(clause=select(Workspace.id)) is engine
+
+        db.rollback()
+        assert db.get_bind(clause=select(Workspace.id)) is replica
+
+
+def test_replica_reads_stay_on_the_primary_after_the_users_write(engine, replica):
+    token = _as_user(9003)
+    try:
+        with SessionLocal() as db:
+            assert _Reader(db).bind() is replica
+            db.execute(update(Workspace).where(Workspace.id == -1).values(name="nothing"))
+            db.commit()
+            assert _Reader(db).bind() is engine
+    finally:
+        current_user_id_var.reset(token)
+
+    token = _as_user(9004)
+    try:
+        with SessionLocal() as db:
+            assert _Reader(db).bind() is replica
+    finally:
+        current_user_id_var.reset(token)
@@ -0,0 +1,74 @@
+from sqlalchemy import insert
+from app.core.db import SessionLocal
+from app.models.task import Task
+
+
+def _add_tasks(workspace_id: int, *tasks: tuple[str, str]) -> list[int]:
+    with SessionLocal() as db:
+        ids = db.execute(insert(Task).returning(Task.id), [
+            {"workspace_id": workspace_id, "title": title, "description": description} for title, description in tasks
+        ]).scalars().all()
+        db.commit()
+    return ids
+
+
+def test_workspace_search_ranks_title_matches_first_and_pages(client, dataset, auth_headers):
+    workspace = dataset["workspaces"][0]
+    headers = auth_headers(workspace["member_ids"][0])
+    in_title, in_description, twice = _add_tasks(
+        workspace["id"],
+        ("Zeppelin hangar", "Mooring mast"),
+        ("Hangar door", "Paint the zeppelin"),
+        ("Mast", "Zeppelin and another zeppelin"),
+    )
+    url = f"/tasks/workspace/{workspace['id']}/search"
+
+    first = client.get(url, params={"q": "zeppelin", "limit": 2}, headers=headers).json()
+    second = client.get(url, params={"q": "zeppelin", "limit": 2, "offset": 2}, headers=headers).json()
+
+    assert [hit["id"] for hit in first["results"]] == [in_title, twice]
+    assert first["next_offset"] == 2
+    assert [hit["id"] for hit in second["results"]] == [in_description]
+    assert second["next_offset"] is None
+    # Every term has to match
+    both = client.get(url, params={"q": "zeppelin hangar"}, headers=headers).json()
+    assert [hit["id"] for hit in both["results"]] == [in_title, in_description]
+
+
+def test_search_only_returns_entities_of_the_users_workspaces(client, dataset, auth_headers):
+    own, other = dataset["workspaces"]
+    member = next(user_id for user_id in own["member_ids"] if user_id not in other["member_ids"])
+    outsider = next(user_id for user_id in other["member_ids"] if user_id not in own["member_ids"])
+    [own_task] = _add_tasks(own["id"], ("Quokka survey", "Count them"))
+    _add_tasks(other["id"], ("Quokka census", "Count them too"))
+
+    hits = client.get("/search", params={"q": "quokka"}, headers=auth_headers(member)).json()["results"]
+    assert [(hit["type"], hit["id"]) for hit in hits] == [("task", own_task)]
+
+    denied = client.get(f"/tasks/workspace/{own['id']}/search", params={"q": "quokka"}, headers=auth_headers(outsider))
+    assert denied.status_code == 403
+
+
+def test_search_types_filter_covers_categories_comments_and_replies(client, dataset, auth_headers):
+    workspace = dataset["workspaces"][0]
+    headers = auth_headers(workspace["member_ids"][0])
+    category = client.get(f"/categories/workspace/{workspace['id']}", headers=headers).json()[0]
+
+    hits = client.get("/search", params={"q": category["name"], "types": "category"}, headers=headers).json()["results"]
+    assert hits and {hit["type"] for hit in hits} == {"category"}
+    assert category["id"] in {hit["id"] for hit in hits}
+
+
+def test_search_pages_walk_the_merged_ranking(client, dataset, auth_headers):
+    workspace = dataset["workspaces"][0]
+    headers = auth_headers(workspace["member_ids"][0])
+    params = {"q": "cache", "types": "task,comment,reply"}
+
+    top = client.get("/search", params={**params, "limit": 35}, headers=headers).json()["results"]
+    paged = []
+    for offset in range(0, 35, 7):
+        paged.extend(client.get("/search", params={**params, "limit": 7, "offset": offset}, headers=headers).json()["results"])
+
+    assert {hit["type"] for hit in top} == {"task", "comment", "reply"}
+    assert [(hit["type"], hit["id"]) for hit in paged] == [(hit["type"], hit["id"]) for hit in top]
+    assert [hit["rank"] for hit in top] == sorted((hit["rank"] for hit in top), reverse=True)
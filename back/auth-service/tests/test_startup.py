@@ -0,0 +1,12 @@
+import os
+
+from benchmarks.startup import IMPORT_BUDGET_MS, time_statement
+
+
+def test_importing_the_app_stays_within_budget(monkeypatch):
+    # The fresh interpreters must find the app package from any working directory
+    monkeypatch.setenv("PYTHONPATH", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    # Compile once so the timed runs read bytecode like a deployed worker
+    time_statement("import app.main", repeat=1)
+
+    assert time_statement("import app.main", repeat=3) < IMPORT_BUDGET_MS
@@ -0,0 +1,88 @@
+import io
+import pytest
+from sqlalchemy import event, select
+from app.core.db import SessionLocal
+from app.models.task import Task
+from app.services.task_import_service import TaskImportService
+from app.services.task_service import TaskService
+
+
+def _imported_titles(workspace_id: int) -> list[str]:
+    with SessionLocal() as db:
+        return db.execute(
+            select(Task.title).where(Task.workspace_id == workspace_id, Task.title.like("Imported %")).order_by(Task.id)
+        ).scalars().all()
+
+
+def test_import_loads_valid_rows_in_committed_chunks_and_reports_the_rest(dataset):
+    workspace = dataset["workspaces"][0]
+    source = io.BytesIO(b"\n".join((
+        b"title,description,priority,status,category",
+        b"Imported 1,Row one,high,open,",
+        b"Imported 2,Row two,low,closed,",
+        b",Missing title,low,open,",
+        b"Imported 3,Row three,medium,bogus,",
+        b"Imported 4,Row four,medium,open,No such category",
+        b"Imported 5,Row five,medium,review,",
+        b"Imported 6,Row six,medium,open,",
+    )))
+    with SessionLocal() as db:
+        commits = []
+        event.listen(db, "after_commit", commits.append)
+        result = TaskImportService(db).import_tasks(workspace["id"], source, "csv", workspace["member_ids"][0], chunk_size=2)
+
+    assert (result.created, result.failed) == (4, 3)
+    assert [error.row for error in result.errors] == [3, 4, 5]
+    assert _imported_titles(workspace["id"]) == ["Imported 1", "Imported 2", "Imported 5", "Imported 6"]
+    # Three chunks of two parsed rows, each committed on its own
+    assert len(commits) == 3
+
+
+def test_failed_chunk_rolls_back_alone(dataset, monkeypatch):
+    workspace = dataset["workspaces"][0]
+    source = io.BytesIO(b"\n".join(b'{"title": "Imported %d", "description": "Row", "labels": ["x"]}' % n for n in range(1, 6)))
+    calls = []
+    index_task_labels = TaskService.index_task_labels
+
+    def fail_on_second_chunk(self, tasks):
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("connection lost")
+        return index_task_labels(self, tasks)
+
+    monkeypatch.setattr(TaskService, "index_task_labels", fail_on_second_chunk)
+    with SessionLocal() as db:
+        with pytest.raises(RuntimeError):
+            TaskImportService(db).import_tasks(workspace["id"], source, "ndjson", workspace["member_ids"][0], chunk_size=2)
+
+    assert _imported_titles(workspace["id"]) == ["Imported 1", "Imported 2"]
+
+
+def test_import_endpoint_reads_csv_and_ndjson(client, dataset, auth_headers):
+    workspace = dataset["workspaces"][1]
+    headers = auth_headers(workspace["member_ids"][0])
+    url = f"/tasks/workspace/{workspace['id']}/import"
+
+    csv_result = client.post(url, headers=headers, files={"file": ("tasks.csv", b"title,description\nImported csv,From CSV\n")})
+    ndjson_result = client.post(url, headers=headers, files={"file": ("tasks.ndjson", b'{"title": "Imported ndjson", "description": "x"}\nnot json\n')})
+
+    assert csv_result.json() == {"created": 1, "failed": 0, "errors": []}
+    assert ndjson_result.json()["created"] == 1
+    assert ndjson_result.json()["errors"] == [{"row": 2, "errors": ["Row is not a JSON object"]}]
+    assert _imported_titles(workspace["id"]) == ["Imported csv", "Imported ndjson"]
+
+
+def test_category_ids_must_belong_to_the_workspace(dataset):
+    own, other = dataset["workspaces"]
+    source = io.BytesIO(b"\n".join((
+        b"title,description,category_id",
+        b"Imported own,Row,%d" % own["category_ids"][0],
+        b"Imported other,Row,%d" % other["category_ids"][0],
+    )))
+    with SessionLocal() as db:
+        result = TaskImportService(db).import_tasks(own["id"], source, "csv", own["member_ids"][0])
+
+    assert (result.created, result.failed) == (1, 1)
+    assert result.errors[0].row == 2
+    assert result.errors[0].errors == [f"category_id: category {other['category_ids'][0]} does not belong to this workspace"]
+    assert _imported_titles(own["id"]) == ["Imported own"]
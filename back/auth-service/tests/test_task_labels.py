@@ -0,0 +1,70 @@
+import io
+from sqlalchemy import insert, select
+from app.core.db import SessionLocal
+from app.models.task import Task, TaskLabel
+from app.services.task_import_service import TaskImportService
+from app.services.task_service import TaskService
+
+
+def _label_rows(task_ids) -> set:
+    with SessionLocal() as db:
+        return set(db.execute(select(TaskLabel.task_id, TaskLabel.label).where(TaskLabel.task_id.in_(task_ids))).all())
+
+
+def test_created_task_is_found_by_label_filter_and_counts(client, dataset, auth_headers):
+    workspace = dataset["workspaces"][0]
+    headers = auth_headers(workspace["member_ids"][0])
+    created = client.post("/tasks/", headers=headers, json={
+        "workspace_id": workspace["id"], "title": "Launch", "description": "Ship it", "labels": ["launch", "launch", "ops"],
+    })
+    assert created.status_code == 200
+    task_id = created.json()["id"]
+    assert _label_rows([task_id]) == {(task_id, "launch"), (task_id, "ops")}
+
+    tasks = client.get(f"/tasks/workspace/{workspace['id']}", params={"label": "launch"}, headers=headers).json()
+    assert [task["id"] for task in tasks] == [task_id]
+    counts = client.get(f"/tasks/workspace/{workspace['id']}/labels", headers=headers).json()
+    assert {"label": "launch", "count": 1} in counts
+
+
+def test_label_filter_matches_seeded_labels(client, dataset, auth_headers):
+    workspace = dataset["workspaces"][1]
+    headers = auth_headers(workspace["member_ids"][0])
+    every_task = client.get(f"/tasks/workspace/{workspace['id']}", headers=headers).json()
+    expected = [task["id"] for task in every_task if "bug" in (task["labels"] or [])]
+
+    tasks = client.get(f"/tasks/workspace/{workspace['id']}", params={"label": "bug", "fields": "card"}, headers=headers).json()
+    assert [task["id"] for task in tasks] == expected
+
+
+def test_backfill_indexes_only_tasks_missing_from_task_labels(dataset):
+    workspace = dataset["workspaces"][0]
+    with SessionLocal() as db:
+        task_ids = db.execute(insert(Task).returning(Task.id), [
+            {"workspace_id": workspace["id"], "title": f"Legacy {n}", "description": "Before task_labels", "labels": labels}
+            for n, labels in enumerate((["legacy", "infra"], [], None, ["legacy"]))
+        ]).scalars().all()
+        db.commit()
+
+        assert TaskService(db).backfill_task_labels(batch_size=1) == 2
+        assert TaskService(db).backfill_task_labels() == 0
+
+    assert _label_rows(task_ids) == {(task_ids[0], "legacy"), (task_ids[0], "infra"), (task_ids[3], "legacy")}
+
+
+def test_import_indexes_the_labels_of_exactly_the_imported_tasks(dataset):
+    workspace = dataset["workspaces"][0]
+    source = io.BytesIO(
+        b"title,description,labels\n"
+        b"One,First,import;ops\n"
+        b"Two,Second,\n"
+        b"Three,Third,import\n"
+    )
+    with SessionLocal() as db:
+        result = TaskImportService(db).import_tasks(workspace["id"], source, "csv", workspace["member_ids"][0], chunk_size=2)
+        assert result.created == 3
+        imported = dict(db.execute(select(Task.title, Task.id).where(Task.title.in_(("One", "Two", "Three")))).all())
+
+    assert _label_rows(imported.values()) == {
+        (imported["One"], "import"), (imported["One"], "ops"), (imported["Three"], "import"),
+    }
@@ -0,0 +1,90 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import tracing
+from app.core.tracing import BatchSpanProcessor, SpanExporter
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+class _CollectingExporter(SpanExporter):
+    def __init__(self):
+        self.spans = []
+        self.shut_down = False
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+    def shutdown(self):
+        self.shut_down = True
+
+
+@pytest.fixture
+def exported(monkeypatch):
+    """Spans exported while the test runs; the exporter thread never wakes up on its own"""
+    exporter = _CollectingExporter()
+    monkeypatch.setattr(tracing.tracer, "processor", BatchSpanProcessor(exporter, interval=3600))
+    return exporter
+
+
+def _get_tasks(app, dataset, auth_headers, **headers):
+    workspace = dataset["workspaces"][0]
+    # Leaving the client runs the lifespan shutdown, which flushes the queued spans
+    with TestClient(app) as client:
+        response = client.get(
+            f"/tasks/workspace/{workspace['id']}", headers={**auth_headers(workspace["member_ids"][0]), **headers}
+        )
+    assert response.status_code == 200
+
+
+def test_exporters_must_implement_export():
+    class Incomplete(SpanExporter):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_request_service_and_sql_spans_form_one_trace(app, dataset, auth_headers, exported):
+    _get_tasks(app, dataset, auth_headers)
+
+    assert exported.shut_down
+    [server] = [span for span in exported.spans if span.kind == "server"]
+    assert server.name == "GET /tasks/workspace/{workspace_id}"
+    assert len(server.trace_id) == 32 and server.parent_id is None
+    assert {span.trace_id for span in exported.spans} == {server.trace_id}
+
+    [service] = [span for span in exported.spans if span.name == "TaskService.get_workspace_tasks"]
+    assert service.parent_id == server.span_id
+    queries = [span for span in exported.spans if span.kind == "client"]
+    assert queries and all(span.attributes["db.system"] == "sqlite" for span in queries)
+    assert any(span.parent_id == service.span_id for span in queries)
+
+
+def test_incoming_traceparent_is_continued(app, dataset, auth_headers, exported):
+    _get_tasks(app, dataset, auth_headers, traceparent=f"00-{TRACE_ID}-{PARENT_ID}-01")
+
+    [server] = [span for span in exported.spans if span.kind == "server"]
+    assert (server.trace_id, server.parent_id) == (TRACE_ID, PARENT_ID)
+    assert server.traceparent == f"00-{TRACE_ID}-{server.span_id}-01"
+    assert {span.trace_id for span in exported.spans} == {TRACE_ID}
+
+
+def test_unsampled_traceparent_records_nothing(app, dataset, auth_headers, exported):
+    _get_tasks(app, dataset, auth_headers, traceparent=f"00-{TRACE_ID}-{PARENT_ID}-00")
+
+    assert exported.spans == []
+
+
+def test_failing_exports_are_counted_as_dropped():
+    class Failing(SpanExporter):
+        def export(self, spans):
+            raise OSError("collector unreachable")
+
+    processor = BatchSpanProcessor(Failing(), interval=3600)
+    span = tracing.Span("work", TRACE_ID)
+    span.end_time = 1
+    processor.on_end(span)
+    processor.shutdown()
+    assert processor.dropped == 1
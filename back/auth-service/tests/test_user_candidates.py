@@ -0,0 +1,22 @@
+def _candidates(client, workspace, headers, q):
+    return client.get(f"/workspaces/{workspace['id']}/users/candidates", params={"q": q}, headers=headers)
+
+
+def test_emails_only_match_in_full(client, dataset, auth_headers):
+    workspace = dataset["workspaces"][0]
+    headers = auth_headers(workspace["member_ids"][0])
+
+    response = _candidates(client, workspace, headers, "BENCH3@example.org")
+    assert response.status_code == 200
+    assert [user["id"] for user in response.json()] == [3]
+    assert _candidates(client, workspace, headers, "bench3@example").json() == []
+    assert _candidates(client, workspace, headers, "bench@").json() == []
+
+
+def test_usernames_need_a_minimum_prefix(client, dataset, auth_headers):
+    workspace = dataset["workspaces"][0]
+    headers = auth_headers(workspace["member_ids"][0])
+
+    assert _candidates(client, workspace, headers, "be").status_code == 422
+    response = _candidates(client, workspace, headers, "bench1")
+    assert sorted(user["id"] for user in response.json()) == [1, 10, 11, 12]
@@ -0,0 +1,27 @@
+from sqlalchemy import insert, update
+from app.core.db import SessionLocal
+from app.models.user import User
+from app.models.workspace import Workspace, GroupRoleType, workspace_users
+from app.services.workspace_access import get_workspace_role
+
+
+def test_role_cache_follows_membership_writes_in_the_same_transaction(engine):
+    with SessionLocal() as db:
+        user, workspace = User(username="ada", email="ada@example.org", hashed_password="x"), Workspace(name="Docs")
+        db.add_all([user, workspace])
+        db.commit()
+        assert get_workspace_role(db, workspace.id, user.id) is None
+
+        db.execute(insert(workspace_users).values(workspace_id=workspace.id, user_id=user.id, role=GroupRoleType.admin))
+        assert get_workspace_role(db, workspace.id, user.id) == GroupRoleType.admin
+
+        db.execute(update(workspace_users).values(role=GroupRoleType.viewer))
+        assert get_workspace_role(db, workspace.id, user.id) == GroupRoleType.viewer
+
+        other = Workspace(name="Ops")
+        db.add(other)
+        db.flush()
+        assert get_workspace_role(db, other.id, user.id) is None
+        user.workspaces.append(other)
+        db.flush()
+        assert get_workspace_role(db, other.id, user.id) == GroupRoleType.member